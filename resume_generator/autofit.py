@@ -0,0 +1,156 @@
+"""Fit a resume to a maximum page count by scaling its fonts and spacing.
+
+The template's `scale` multiplies every font size, the cell height and the
+spacing between entries. Fitting binary-searches the largest scale at which the
+resume fits, using layout-only passes: the sections are laid out to count the
+pages, but the document is never serialized, so fonts are not subset and no
+PDF is written, and cached fragments that fit on the current page are stepped
+over by their recorded height instead of being replayed. Only the final render, at the chosen scale, produces a PDF.
+Resumes that already fit are never enlarged.
+"""
+
+from typing import NamedTuple
+
+from resume_generator.font_cache import DEFAULT_CACHE_DIR
+from resume_generator.font_cache import FontCache
+from resume_generator.fragments import FragmentCache
+from resume_generator.fragments import MemoryFragmentCache
+from resume_generator.main import add_sections
+from resume_generator.main import get_fallback_fonts
+from resume_generator.main import setup_pdf
+from resume_generator.profiling import traced
+from resume_generator.styles import modern_styles
+
+DEFAULT_MIN_SCALE = 0.7
+SCALE_PRECISION = 0.01
+
+
+class FitResult(NamedTuple):
+    """Scale chosen to fit a resume, and the resulting page count."""
+
+    scale: float
+    pages: int
+    config: dict
+
+
+def scaled_config(config: dict, scale: float) -> dict:
+    """Return a copy of the configuration with the template's scale set.
+
+    Args:
+        config (dict): Configuration dictionary.
+        scale (float): Factor applied to font sizes and spacing.
+
+    Returns:
+        dict: The new configuration; the original one is left unchanged.
+    """
+    template = config["template"]
+    templates = dict(config["templates"])
+    templates[template] = dict(templates[template], scale=scale)
+    return dict(config, templates=templates)
+
+
+@traced
+def count_pages(
+    config: dict,
+    resume_data: tuple,
+    styles: dict = modern_styles,
+    font_cache: FontCache | None = None,
+    fallback_fonts: list | None = None,
+    fragment_cache: FragmentCache | None = None,
+) -> int:
+    """Lay out the resume without serializing it, and count its pages.
+
+    Args:
+        config (dict): Configuration dictionary.
+        resume_data (tuple): Validated resume data sections.
+        styles (dict): Style definitions for the sections.
+        font_cache (FontCache, optional): Font cache to reuse across passes.
+        fallback_fonts (list, optional): Fallback fonts already selected for
+            the resume data.
+        fragment_cache (FragmentCache, optional): Fragment cache to reuse across passes.
+
+    Returns:
+        int: Number of pages of the laid out resume.
+    """
+    pdf, template_config = setup_pdf(
+        config,
+        resume_data,
+        font_cache=font_cache,
+        fallback_fonts=fallback_fonts,
+        fragment_cache=fragment_cache,
+    )
+    pdf.layout_only = True
+    add_sections(pdf, template_config, resume_data, styles, config.get("sections"))
+    return pdf.pages_count
+
+
+@traced
+def fit_to_pages(
+    config: dict,
+    resume_data: tuple,
+    max_pages: int,
+    styles: dict = modern_styles,
+    min_scale: float = DEFAULT_MIN_SCALE,
+    font_cache: FontCache | None = None,
+    fragment_cache: FragmentCache | None = None,
+) -> FitResult:
+    """Find the largest scale, up to the template's own, at which the resume fits.
+
+    Args:
+        config (dict): Configuration dictionary.
+        resume_data (tuple): Validated resume data sections.
+        max_pages (int): Maximum number of pages.
+        styles (dict): Style definitions for the sections.
+        min_scale (float): Smallest scale tried, relative to the template's.
+        font_cache (FontCache, optional): Font cache to reuse across passes.
+        fragment_cache (FragmentCache, optional): Fragment cache to reuse across
+            passes; pass the one of the final render so that it replays the
+            last measurement. Defaults to an in-memory cache.
+
+    Returns:
+        FitResult: The chosen scale, the page count and the configuration to
+            render with. Its scale resolves the page limit, so it has no
+            `max_pages` and rendering with it does not fit the resume again.
+
+    Raises:
+        ValueError: If max_pages is not positive, or the resume does not fit
+            even at the minimum scale.
+    """
+    if max_pages < 1:
+        raise ValueError("The maximum page count must be at least 1")
+    if font_cache is None:
+        font_cache = FontCache(config.get("font_cache_directory", DEFAULT_CACHE_DIR))
+    if fragment_cache is None:
+        fragment_cache = MemoryFragmentCache()
+    template_config = config["templates"][config["template"]]
+    fallback_fonts = get_fallback_fonts(
+        template_config, font_cache, resume_data, sections=config.get("sections")
+    )
+    base_scale = template_config.get("scale", 1)
+
+    def measure(scale):
+        fitted = scaled_config(config, scale)
+        fitted.pop("max_pages", None)
+        pages = count_pages(fitted, resume_data, styles, font_cache, fallback_fonts, fragment_cache)
+        return FitResult(scale, pages, fitted)
+
+    best = measure(base_scale)
+    if best.pages <= max_pages:
+        return best
+    smallest = measure(base_scale * min_scale)
+    if smallest.pages > max_pages:
+        raise ValueError(
+            f"Resume does not fit in {max_pages} page(s) even at scale {smallest.scale:.2f} "
+            f"({smallest.pages} pages)"
+        )
+
+    # Invariant: `best` fits and `low` is its scale, `high` does not fit
+    best, low, high = smallest, smallest.scale, base_scale
+    while high - low > SCALE_PRECISION * base_scale:
+        middle = round((low + high) / 2, 4)
+        result = measure(middle)
+        if result.pages <= max_pages:
+            best, low = result, middle
+        else:
+            high = middle
+    return best
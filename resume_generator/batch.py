@@ -0,0 +1,403 @@
+"""Render tailored copies of one resume for many applications in one process.
+
+Rendering a single resume reloads the configuration, re-validates the resume
+data, selects fallback fonts and registers fonts from scratch. In batch mode
+this shared work is done once, and each target (a company and job pair) only
+lays out and writes its own PDF into the `ensure_output_directory` layout,
+with the plain-text and HTML versions listed in `output_formats`.
+
+The resume data and configuration are loaded from their compiled snapshot
+when it is up to date (see `resume_generator.snapshot`).
+
+Targets are given inline or as a JSONL file with one `ApplicationInfo` object
+per line, e.g. `{"company": "Acme", "job": "Backend Engineer"}`.
+
+With `--workers`, targets are rendered in parallel by a pool of processes,
+each warmed up with the configuration, resume data and fonts before it receives
+any target. Results are reported in target order either way.
+
+Usage:
+    python -m resume_generator.batch --targets-file targets.jsonl [--workers 0]
+    python -m resume_generator.batch --target "Acme" "Backend Engineer" --target ...
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import NamedTuple
+
+from pydantic import ValidationError
+
+from resume_generator.autofit import fit_to_pages
+from resume_generator.font_cache import DEFAULT_CACHE_DIR
+from resume_generator.font_cache import DEFAULT_FONTS_DIR
+from resume_generator.font_cache import FontCache
+from resume_generator.fragments import fragment_cache_from_config
+from resume_generator.main import add_sections
+from resume_generator.main import ensure_output_directory
+from resume_generator.main import get_fallback_fonts
+from resume_generator.main import get_output_path
+from resume_generator.main import load_config
+from resume_generator.main import load_resume_data
+from resume_generator.main import setup_pdf
+from resume_generator.manifest import BuildManifest
+from resume_generator.manifest import InputDigest
+from resume_generator.manifest import manifest_path
+from resume_generator.optimize import OutputSizes
+from resume_generator.renderers import RENDERERS
+from resume_generator.renderers import create_renderers
+from resume_generator.renderers import write_outputs
+from resume_generator.schemas import ApplicationInfo
+from resume_generator.snapshot import load_snapshot
+from resume_generator.styles import modern_styles
+
+
+class TargetResult(NamedTuple):
+    """Outcome of rendering the resume for one target."""
+
+    application_info: ApplicationInfo
+    output_path: str | None
+    seconds: float
+    error: str | None = None
+    skipped: bool = False
+    # Size of the PDF before and after optimization, with `optimize_size`
+    output_sizes: OutputSizes | None = None
+    # Every file written, the PDF first, then its other formats
+    output_paths: tuple = ()
+
+
+def load_targets(path) -> list:
+    """Load batch targets from a JSONL file.
+
+    Args:
+        path: Path to a file with one `ApplicationInfo` JSON object per line.
+
+    Returns:
+        list: Validated ApplicationInfo targets.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If a line is not valid JSON or not a valid target.
+    """
+    targets = []
+    with open(path, "r") as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                targets.append(ApplicationInfo.model_validate(json.loads(line)))
+            except (json.JSONDecodeError, ValidationError) as e:
+                raise ValueError(f"Invalid target on line {line_number} of {path}: {str(e)}")
+    return targets
+
+
+class BatchRenderer:
+    """Renders one resume for many targets, sharing the setup between them."""
+
+    def __init__(
+        self,
+        config: dict,
+        resume_data: tuple,
+        styles: dict = modern_styles,
+        fallback_fonts: list | None = None,
+    ):
+        """Do the work shared by every target.
+
+        Args:
+            config (dict): Configuration dictionary.
+            resume_data (tuple): Validated resume data sections.
+            styles (dict): Style definitions for the sections.
+            fallback_fonts (list, optional): Fallback fonts already selected for
+                the resume data, e.g. by the renderer that started this worker.
+
+        Raises:
+            ValueError: If required configuration is missing, or no bundled font
+                can draw some characters.
+        """
+        self.config = config
+        self.resume_data = resume_data
+        self.styles = styles
+        try:
+            self.template_config = config["templates"][config["template"]]
+        except KeyError as e:
+            raise ValueError(f"Missing required configuration: {str(e)}")
+        # Parsed fonts stay in memory, so only the first document loads them
+        self.font_cache = FontCache(config.get("font_cache_directory", DEFAULT_CACHE_DIR))
+        # Targets share their sections, so the fragment cache lives as long as the batch
+        self.fragment_cache = fragment_cache_from_config(config, default="memory")
+        # Only the application info differs between targets, and it is not
+        # rendered, so the fallback fonts are the same for every document
+        if fallback_fonts is None:
+            fallback_fonts = get_fallback_fonts(
+                self.template_config,
+                self.font_cache,
+                resume_data,
+                sections=config.get("sections"),
+            )
+        self.fallback_fonts = fallback_fonts
+        # Targets render the same content, so they share the scale fitting
+        # `max_pages`; workers get the fitted config, which has no page limit left
+        if config.get("max_pages"):
+            fit = fit_to_pages(
+                config,
+                resume_data,
+                config["max_pages"],
+                styles,
+                font_cache=self.font_cache,
+                fragment_cache=self.fragment_cache,
+            )
+            self.config = fit.config
+            self.template_config = fit.config["templates"][config["template"]]
+
+    def warm(self) -> None:
+        """Load the template and fallback fonts into the in-memory font cache."""
+        families = [*self.template_config["fonts"].values(), *self.fallback_fonts]
+        for family in dict.fromkeys(families):
+            font_path = os.path.join(DEFAULT_FONTS_DIR, f"{family}.ttf")
+            if os.path.exists(font_path):
+                self.font_cache.load(font_path)
+
+    def render(self, application_info: ApplicationInfo) -> tuple:
+        """Render and save the resume for one target.
+
+        Args:
+            application_info (ApplicationInfo): Company and job of the target.
+
+        Returns:
+            tuple: (paths of the files written, the PDF first, and the PDF's
+                OutputSizes or None if it was not optimized).
+        """
+        resume_data = (application_info, *self.resume_data[1:])
+        pdf, template_config = setup_pdf(
+            self.config,
+            font_cache=self.font_cache,
+            fallback_fonts=self.fallback_fonts,
+            fragment_cache=self.fragment_cache,
+        )
+        renderers = create_renderers(self.config.get("output_formats", []))
+        pdf.renderers.extend(renderers.values())
+        add_sections(pdf, template_config, resume_data, self.styles, self.config.get("sections"))
+        output_dir = ensure_output_directory(self.config, application_info)
+        output_path = get_output_path(self.config, output_dir, resume_data[1], application_info)
+        return write_outputs(pdf, renderers, output_path), pdf.output_sizes
+
+    def render_target(self, application_info: ApplicationInfo) -> TargetResult:
+        """Render the resume for one target, timing it and recording any error.
+
+        Args:
+            application_info (ApplicationInfo): Company and job of the target.
+
+        Returns:
+            TargetResult: The outcome of the render.
+        """
+        start = time.perf_counter()
+        output_paths, output_sizes, error = [None], None, None
+        try:
+            output_paths, output_sizes = self.render(application_info)
+        except Exception as e:
+            error = str(e)
+        seconds = time.perf_counter() - start
+        return TargetResult(
+            application_info,
+            output_paths[0],
+            seconds,
+            error,
+            output_sizes=output_sizes,
+            output_paths=tuple(output_paths) if error is None else (),
+        )
+
+    def render_all(
+        self, targets, workers: int = 1, chunk_size: int | None = None, force: bool = False
+    ) -> list:
+        """Render the resume for every target, timing each one.
+
+        A failing target is recorded and does not stop the batch. With
+        `skip_unchanged` in the config, targets whose inputs did not change
+        since the last build are skipped, and the build manifest is updated.
+
+        Args:
+            targets (iterable): ApplicationInfo targets.
+            workers (int): Number of worker processes; 1 renders in this
+                process, and 0 uses one worker per CPU core.
+            chunk_size (int, optional): Targets sent to a worker at a time.
+                Defaults to about four chunks per worker.
+            force (bool): Render every target, even if it is up to date.
+
+        Returns:
+            list: A TargetResult for each target, in order.
+        """
+        targets = list(targets)
+        if not self.config.get("skip_unchanged"):
+            return self._render_targets(targets, workers, chunk_size)
+
+        manifest = BuildManifest.load(manifest_path(self.config))
+        input_digest = InputDigest(self.config, self.resume_data, self.styles)
+        digests = [input_digest.for_target(target) for target in targets]
+        results: list[TargetResult | None] = [None] * len(targets)
+        pending = []
+        for index, (target, digest) in enumerate(zip(targets, digests)):
+            up_to_date = None if force else manifest.lookup(digest)
+            if up_to_date:
+                results[index] = TargetResult(target, up_to_date, 0.0, skipped=True)
+            else:
+                pending.append(index)
+
+        rendered = self._render_targets([targets[index] for index in pending], workers, chunk_size)
+        for index, result in zip(pending, rendered):
+            results[index] = result
+            if result.error is None:
+                manifest.record(digests[index], result.application_info, result.output_paths)
+        if rendered:
+            manifest.save()
+        return results
+
+    def _render_targets(self, targets: list, workers: int, chunk_size: int | None) -> list:
+        """Render targets in this process or in a pool of worker processes."""
+        if not targets:
+            return []
+        workers = min(workers or os.cpu_count() or 1, len(targets))
+        if workers <= 1:
+            return [self.render_target(application_info) for application_info in targets]
+        if chunk_size is None:
+            chunk_size = max(1, len(targets) // (workers * 4))
+
+        results = []
+        initargs = (self.config, self.resume_data, self.styles, self.fallback_fonts)
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=initargs) as executor:
+            try:
+                for result in executor.map(_render_in_worker, targets, chunksize=chunk_size):
+                    results.append(result)
+            except BrokenProcessPool as e:
+                # A worker died; the targets it had not reported are marked as failed
+                error = f"Worker process died: {str(e)}"
+                results += [
+                    TargetResult(target, None, 0.0, error) for target in targets[len(results) :]
+                ]
+        return results
+
+
+# Renderer of the current worker process, set up by `_init_worker`
+_worker_renderer: BatchRenderer | None = None
+
+
+def _init_worker(config: dict, resume_data: tuple, styles: dict, fallback_fonts: list) -> None:
+    """Set up and warm the renderer of a worker process."""
+    global _worker_renderer
+    _worker_renderer = BatchRenderer(config, resume_data, styles, fallback_fonts)
+    _worker_renderer.warm()
+
+
+def _render_in_worker(application_info: ApplicationInfo) -> TargetResult:
+    """Render one target with the renderer of the worker process."""
+    if _worker_renderer is None:
+        raise RuntimeError("The worker process was not set up")
+    return _worker_renderer.render_target(application_info)
+
+
+def main(argv=None) -> int:
+    """Render the resume for several targets from the command line.
+
+    Args:
+        argv (list, optional): Command-line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: Process exit code.
+    """
+    parser = argparse.ArgumentParser(description="Render one resume for many applications.")
+    parser.add_argument(
+        "--target",
+        nargs=2,
+        action="append",
+        default=[],
+        metavar=("COMPANY", "JOB"),
+        help="Company and job of a target (repeatable)",
+    )
+    parser.add_argument("--targets-file", help="JSONL file of ApplicationInfo targets")
+    parser.add_argument(
+        "--workers",
+        "-j",
+        type=int,
+        default=1,
+        help="Worker processes; 1 renders in-process, 0 uses one per CPU core",
+    )
+    parser.add_argument("--chunk-size", type=int, help="Targets sent to a worker at a time")
+    parser.add_argument(
+        "--force", action="store_true", help="Render targets even if their inputs are unchanged"
+    )
+    parser.add_argument(
+        "--optimize-size",
+        action="store_true",
+        help="Make the PDFs as small as possible and report their size before and after",
+    )
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=sorted(RENDERERS),
+        help="Also write these versions of each resume next to its PDF",
+    )
+    args = parser.parse_args(argv)
+    if args.workers < 0:
+        parser.error("--workers must be 0 or more")
+    if args.chunk_size is not None and args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    targets = [ApplicationInfo(company=company, job=job) for company, job in args.target]
+    if args.targets_file:
+        targets += load_targets(args.targets_file)
+    if not targets:
+        parser.error("no targets given; use --target or --targets-file")
+
+    start = time.perf_counter()
+    snapshot = load_snapshot()
+    if snapshot:
+        config, resume_data, styles, fallback_fonts = snapshot
+    else:
+        config = load_config()
+        defer_excluded = config.get("defer_excluded_validation", False)
+        resume_data = load_resume_data(defer_excluded=defer_excluded)
+        styles, fallback_fonts = modern_styles, None
+    if args.optimize_size:
+        config["optimize_size"] = True
+    if args.formats:
+        config["output_formats"] = args.formats
+    renderer = BatchRenderer(config, resume_data, styles, fallback_fonts)
+    setup_seconds = time.perf_counter() - start
+    results = renderer.render_all(targets, args.workers, args.chunk_size, args.force)
+    total_seconds = time.perf_counter() - start
+
+    for result in results:
+        target = f"{result.application_info.company} / {result.application_info.job}"
+        if result.error:
+            print(f"{result.seconds * 1000:8.1f} ms  FAILED {target}: {result.error}")
+        elif result.skipped:
+            print(f"{'up to date':>11}  {result.output_path}")
+        elif result.output_sizes:
+            print(
+                f"{result.seconds * 1000:8.1f} ms  {result.output_path}  "
+                f"{result.output_sizes.describe()}"
+            )
+        else:
+            print(f"{result.seconds * 1000:8.1f} ms  {result.output_path}")
+    skipped = sum(result.skipped for result in results)
+    failed = sum(result.error is not None for result in results)
+    rendered = len(results) - skipped - failed
+    print(
+        f"Rendered {rendered}/{len(results)} resumes in {total_seconds:.2f} s "
+        f"({rendered / total_seconds:.1f} documents/s, shared setup {setup_seconds:.2f} s)"
+        + (f", {skipped} unchanged skipped" if skipped else "")
+    )
+    if renderer.fragment_cache is not None and args.workers == 1:
+        stats = renderer.fragment_cache.stats()
+        print(
+            f"Fragment cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_rate']:.0%} hit rate)"
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
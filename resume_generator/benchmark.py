@@ -0,0 +1,406 @@
+"""Benchmark suite timing each stage of a render on synthetic resumes.
+
+Resumes are generated at several scales (1, 50 and 1,000 jobs, long
+descriptions, text in many scripts, many links) and rendered stage by stage,
+the way `main` does: loading the configuration and the resume data, setting
+up the PDF, creating the section handlers, adding each section and writing
+the PDF in memory. Every section of the registry is enabled and the fragment
+cache is off, so each run lays out every entry.
+
+Results are written as JSON. Given a saved baseline, the median of each stage
+is compared to it and stages slower by more than the threshold are reported
+as regressions.
+
+Usage:
+    python -m resume_generator.benchmark [--scenarios single jobs-50] [--repeat 3]
+        [--output benchmark.json] [--baseline baseline.json] [--threshold 0.1]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import NamedTuple
+
+from resume_generator.font_cache import fpdf_version
+from resume_generator.main import load_config
+from resume_generator.main import load_resume_data
+from resume_generator.main import setup_pdf
+from resume_generator.sections.registry import SECTIONS
+from resume_generator.sections.registry import build_sections
+from resume_generator.styles import modern_styles
+
+RESULTS_FORMAT_VERSION = 1
+DEFAULT_THRESHOLD = 0.1
+# Stages faster than this in both runs are too noisy to report as regressions
+MIN_DELTA_MS = 1.0
+
+# Words of each script used to build descriptions; every script is covered by
+# a font in fonts/
+WORDS = {
+    "latin": (
+        "design deliver scalable services team customers data platform improve latency release "
+        "pipeline ownership metrics reliable build"
+    ).split(),
+    "greek": ["ανάπτυξη", "σύστημα", "ομάδα", "δεδομένα", "έργο", "πελάτες"],
+    "cyrillic": ["разработка", "система", "команда", "данные", "проект", "клиенты"],
+    "thai": ["การพัฒนา", "ระบบ", "ทีมงาน", "ข้อมูล", "โครงการ", "ลูกค้า"],
+    "devanagari": ["विकास", "प्रणाली", "टीम", "डेटा", "परियोजना", "ग्राहक"],
+    "bengali": ["উন্নয়ন", "ব্যবস্থা", "দল", "তথ্য", "প্রকল্প", "গ্রাহক"],
+    "tamil": ["மேம்பாடு", "அமைப்பு", "குழு", "தரவு", "திட்டம்", "வாடிக்கையாளர்"],
+    "korean": ["개발", "시스템", "팀", "데이터", "프로젝트", "고객"],
+}
+
+# Scenario name: arguments of `synthetic_resume`
+SCENARIOS: dict[str, dict] = {
+    "single": {"jobs": 1},
+    "jobs-50": {"jobs": 50},
+    "jobs-1000": {"jobs": 1000},
+    "long-descriptions": {"jobs": 20, "description_words": 400},
+    "multi-script": {"jobs": 50, "scripts": list(WORDS)},
+    "many-links": {"jobs": 5, "links": 200},
+}
+
+# Handler class name: section name, to label the section stages
+_SECTION_NAMES = {class_name: name for name, (_, class_name, _) in SECTIONS.items()}
+
+
+def _text(rng: random.Random, words: int, scripts) -> str:
+    """Return sentences of random words, each sentence in one of the scripts.
+
+    Texts start at a random script, so that short texts still use every script
+    over the resume.
+    """
+    sentences: list[str] = []
+    # A single script draws nothing, keeping the other scenarios' resumes unchanged
+    start = rng.randrange(len(scripts)) if len(scripts) > 1 else 0
+    while words > 0:
+        length = min(words, rng.randint(6, 14))
+        vocabulary = WORDS[scripts[(start + len(sentences)) % len(scripts)]]
+        sentence = " ".join(rng.choice(vocabulary) for _ in range(length))
+        sentences.append(sentence[0].upper() + sentence[1:] + ".")
+        words -= length
+    return " ".join(sentences)
+
+
+def synthetic_resume(
+    jobs: int = 1, description_words: int = 30, scripts=("latin",), links: int = 0, seed: int = 0
+) -> dict:
+    """Generate resume data with the layout of resume.json.
+
+    Args:
+        jobs (int): Number of jobs.
+        description_words (int): Words in each job description.
+        scripts (list): Scripts the descriptions are written in, as keys of WORDS.
+        links (int): Number of projects and of articles, each with a URL.
+        seed (int): Seed of the random word choices.
+
+    Returns:
+        dict: Resume data that passes validation.
+    """
+    rng = random.Random(seed)
+    links = max(links, 2)
+    return {
+        "ApplicationInfo": {"company": "Benchmark Corp", "job": "Staff Engineer"},
+        "General": {
+            "name": "Alex Benchmark",
+            "title": "Staff Software Engineer",
+            "location": "Springfield, United States",
+            "email": "alex@example.com",
+            "cell_number": "+11234567890",
+            "portfolio": "https://example.com",
+            "linkedin": "https://www.linkedin.com/in/example",
+            "github": "https://github.com/example",
+            "description": _text(rng, 40, scripts),
+        },
+        "Jobs": {
+            f"job_{i}": {
+                "title": f"Software Engineer {i}",
+                "company": f"Company {i}",
+                "employment_type": "Full-time",
+                "duration": ["2015-01", "Present" if i == 0 else "2019-12"],
+                "description": _text(rng, description_words, scripts),
+                "skills": rng.sample(WORDS["latin"], 5),
+            }
+            for i in range(jobs)
+        },
+        "Education": {
+            f"school_{i}": {
+                "school": f"University {i}",
+                "degree": "Bachelor's Degree",
+                "field": "Computer Science",
+                "duration": ["2010-09", "2014-06"],
+                "gpa": "3.8",
+                "activities_and_societies": ["Robotics club"],
+                "description": _text(rng, 20, scripts),
+            }
+            for i in range(2)
+        },
+        "LicensesAndCertifications": {
+            f"cert_{i}": {
+                "name": f"Certification {i}",
+                "issuer": "Certification Board",
+                "issued_on": "2018-05",
+                "credential_id": f"C-{i}",
+            }
+            for i in range(2)
+        },
+        "VolunteerExperience": {
+            f"volunteer_{i}": {
+                "organization": f"Organization {i}",
+                "role": "Mentor",
+                "cause": "Education",
+                "duration": ["2021-01", "Present"],
+                "description": _text(rng, 20, scripts),
+            }
+            for i in range(2)
+        },
+        "Projects": {
+            f"project_{i}": {
+                "name": f"Project {i}",
+                "duration": ["2020-09", "Present"],
+                "link": f"https://example.com/projects/{i}",
+                "description": _text(rng, 20, scripts),
+                "skills": rng.sample(WORDS["latin"], 3),
+            }
+            for i in range(links)
+        },
+        "HonorsAndAwards": {
+            f"award_{i}": {
+                "title": f"Award {i}",
+                "issuer": "Awards Committee",
+                "issued_on": "2016-04",
+                "description": _text(rng, 10, scripts),
+            }
+            for i in range(2)
+        },
+        "Languages": {
+            "english": {"language": "English", "proficiency": "Native or Bilingual"},
+            "french": {"language": "French", "proficiency": "Professional Working"},
+        },
+        "Articles": {
+            f"article_{i}": {
+                "title": f"Article {i}",
+                "publication": "Engineering Blog",
+                "date": "2022-03",
+                "url": f"https://example.com/articles/{i}",
+                "description": _text(rng, 15, scripts),
+            }
+            for i in range(links)
+        },
+    }
+
+
+def benchmark_config(config: dict) -> dict:
+    """Return the configuration a benchmark renders with.
+
+    Every section is enabled, the fragment cache is off so that each run lays
+    out every entry, and the output is reproducible.
+
+    Args:
+        config (dict): Configuration loaded from config.yaml.
+
+    Returns:
+        dict: A new configuration; the original one is left unchanged.
+    """
+    config = dict(config, sections=list(SECTIONS), fragment_cache="off", deterministic_output=True)
+    config.pop("max_pages", None)
+    return config
+
+
+def run_scenario(name: str, config_path: str = "config.yaml", repeat: int = 3) -> dict:
+    """Render a synthetic resume and time each stage.
+
+    Args:
+        name (str): Scenario name, a key of SCENARIOS.
+        config_path (str): Path of the configuration file.
+        repeat (int): Number of renders.
+
+    Returns:
+        dict: The scenario parameters, the page count and PDF size, and the
+            minimum and median milliseconds of each stage.
+    """
+    samples = defaultdict(list)
+
+    @contextmanager
+    def stage(label):
+        start = time.perf_counter()
+        yield
+        samples[label].append((time.perf_counter() - start) * 1000)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        resume_path = os.path.join(tmp, "resume.json")
+        with open(resume_path, "w", encoding="utf-8") as file:
+            json.dump(synthetic_resume(**SCENARIOS[name]), file, ensure_ascii=False)
+
+        for _ in range(max(repeat, 1)):
+            with stage("load_config"):
+                config = benchmark_config(load_config(config_path))
+            with stage("load_resume_data"):
+                resume_data = load_resume_data(resume_path)
+            with stage("setup_pdf"):
+                pdf, template_config = setup_pdf(config, resume_data)
+            with stage("build_sections"):
+                sections = build_sections(
+                    pdf, template_config, resume_data, modern_styles, config["sections"]
+                )
+            for section in sections:
+                with stage(f"add_section:{_SECTION_NAMES[type(section).__name__]}"):
+                    section.render()
+            with stage("pdf.output"):
+                output = pdf.output()
+
+    stages = {
+        label: {"min_ms": round(min(times), 3), "median_ms": round(statistics.median(times), 3)}
+        for label, times in samples.items()
+    }
+    return {
+        "parameters": SCENARIOS[name],
+        "pages": pdf.pages_count,
+        "pdf_bytes": len(output),
+        "total_ms": round(sum(stage["median_ms"] for stage in stages.values()), 3),
+        "stages": stages,
+    }
+
+
+def run_benchmarks(scenarios=None, config_path: str = "config.yaml", repeat: int = 3) -> dict:
+    """Run benchmark scenarios.
+
+    Args:
+        scenarios (list, optional): Scenario names. Defaults to all of SCENARIOS.
+        config_path (str): Path of the configuration file.
+        repeat (int): Number of renders of each scenario.
+
+    Returns:
+        dict: Machine-readable results, with the environment they were measured in.
+    """
+    return {
+        "version": RESULTS_FORMAT_VERSION,
+        "python": platform.python_version(),
+        "fpdf": fpdf_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "scenarios": {
+            name: run_scenario(name, config_path, repeat) for name in scenarios or SCENARIOS
+        },
+    }
+
+
+class Regression(NamedTuple):
+    """A stage slower than in the baseline."""
+
+    scenario: str
+    stage: str
+    baseline_ms: float
+    current_ms: float
+
+    @property
+    def change(self) -> float:
+        """Relative change of the median time."""
+        return self.current_ms / self.baseline_ms - 1 if self.baseline_ms else float("inf")
+
+
+def compare(results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """Compare the median stage times of two benchmark runs.
+
+    Scenarios and stages missing from either run are skipped, as are stages
+    that changed by less than MIN_DELTA_MS.
+
+    Args:
+        results (dict): Results of `run_benchmarks`.
+        baseline (dict): Saved results to compare against.
+        threshold (float): Relative slowdown reported as a regression.
+
+    Returns:
+        list: Regression entries, in the order of the results.
+    """
+    regressions = []
+    for scenario, result in results["scenarios"].items():
+        baseline_stages = baseline.get("scenarios", {}).get(scenario, {}).get("stages", {})
+        for stage, times in result["stages"].items():
+            if stage not in baseline_stages:
+                continue
+            before, after = baseline_stages[stage]["median_ms"], times["median_ms"]
+            if after - before > max(before * threshold, MIN_DELTA_MS):
+                regressions.append(Regression(scenario, stage, before, after))
+    return regressions
+
+
+def main(argv=None) -> int:
+    """Run the benchmark suite from the command line.
+
+    Args:
+        argv (list, optional): Command-line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: 0, or 1 if a stage regressed against the baseline.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark resume rendering stage by stage.")
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=list(SCENARIOS), help="Scenarios to run (default: all)"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Renders of each scenario")
+    parser.add_argument("--config", "-c", default="config.yaml", help="Configuration file")
+    parser.add_argument(
+        "--output", "-o", default="benchmark.json", help="JSON results file ('-' for stdout)"
+    )
+    parser.add_argument("--baseline", help="Saved results to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Relative slowdown reported as a regression",
+    )
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    # Keep stdout for the results when they are written there
+    log = sys.stderr if args.output == "-" else sys.stdout
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    results = run_benchmarks(args.scenarios, args.config, args.repeat)
+    for name, result in results["scenarios"].items():
+        print(
+            f"{name}: {result['total_ms']:.1f} ms, {result['pages']} pages, "
+            f"{result['pdf_bytes']} bytes",
+            file=log,
+        )
+        for stage, times in result["stages"].items():
+            print(f"  {times['median_ms']:10.2f} ms  {stage}", file=log)
+
+    if args.output == "-":
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"Results written to {args.output}", file=log)
+
+    if baseline is None:
+        return 0
+    regressions = compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print(
+            f"Regression in {regression.scenario} {regression.stage}: "
+            f"{regression.baseline_ms:.2f} ms -> {regression.current_ms:.2f} ms "
+            f"({regression.change:+.0%})",
+            file=log,
+        )
+    if not regressions:
+        print(f"No stage slower than the baseline by more than {args.threshold:.0%}", file=log)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
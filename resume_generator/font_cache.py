@@ -0,0 +1,546 @@
+"""Persistent on-disk cache of parsed TTF font metrics.
+
+Registering a TrueType font with fpdf parses its cmap and horizontal metrics
+through fontTools, which dominates the cold start of a render. This module stores
+the parsed metrics, cmap and glyph width tables of each font in a compact binary
+file so that later runs can rebuild fpdf's font objects without re-parsing.
+
+Cache entries are keyed by font file path, size, modification time and content
+hash. A stale entry is detected automatically and rebuilt on the next load.
+
+Usage:
+    python -m resume_generator.font_cache build [--fonts-dir fonts]
+    python -m resume_generator.font_cache clear
+
+`build` also pre-builds the code-point coverage index of `font_coverage`.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections import OrderedDict
+from collections import defaultdict
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from resume_generator.profiling import traced
+
+# fpdf and fontTools take a third of a second to import; they are imported by
+# the methods that parse, build or subset fonts, so that commands which only
+# check the caches (`--help`, an up-to-date build) never load them
+if TYPE_CHECKING:
+    from fpdf import FPDF
+    from fpdf.fonts import TTFFont
+
+DEFAULT_CACHE_DIR = ".font_cache"
+DEFAULT_FONTS_DIR = "fonts"
+
+CACHE_MAGIC = b"RGFC"
+CACHE_FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct("<4sHI")
+# Names of the cache entries written by `entry_path`: font stem and path digest
+ENTRY_FILE_PATTERN = "*-" + "[0-9a-f]" * 16 + ".bin"
+
+# Tables fpdf drops when it subsets a font for embedding
+SUBSET_DROP_TABLES = ["FFTM", "GDEF", "GPOS", "GSUB", "MATH", "hdmx", "meta"]
+
+
+@lru_cache(maxsize=None)
+def fpdf_version() -> str:
+    """Return the installed fpdf2 version, read from its metadata without importing fpdf.
+
+    Returns:
+        str: The version string, the same as `fpdf.__version__`.
+    """
+    # importlib.metadata takes tens of milliseconds to import, and only the
+    # cache keys need the version
+    import importlib.metadata
+
+    return importlib.metadata.version("fpdf2")
+
+
+class FontMetrics:
+    """Parsed font data needed by fpdf to lay out and embed a TTF font."""
+
+    __slots__ = (
+        "header",
+        "codepoints",
+        "widths",
+        "glyph_ids",
+        "glyph_names",
+    )
+
+    def __init__(self, header: dict, codepoints, widths, glyph_ids, glyph_names):
+        """Initialize the font metrics.
+
+        Args:
+            header (dict): Scalar metrics and the cache key of the font file.
+            codepoints (array): Unicode code points covered by the font.
+            widths (array): Advance width of each code point, in 1/1000 em.
+            glyph_ids (array): Glyph ID of each code point.
+            glyph_names (list): Glyph name of each code point.
+        """
+        self.header = header
+        self.codepoints = codepoints
+        self.widths = widths
+        self.glyph_ids = glyph_ids
+        self.glyph_names = glyph_names
+
+    @classmethod
+    def from_ttf(cls, font_path: Path, key: dict) -> "FontMetrics":
+        """Parse a TTF file with fpdf and extract its metrics.
+
+        Args:
+            font_path (Path): Path to the TTF file.
+            key (dict): Cache key of the font file.
+
+        Returns:
+            FontMetrics: The parsed metrics.
+        """
+        from fpdf import FPDF
+        from fpdf.fonts import TTFFont
+
+        font = TTFFont(FPDF(), font_path, "", "")
+        try:
+            desc = font.desc
+            header = dict(
+                key,
+                scale=font.scale,
+                name=font.name,
+                up=font.up,
+                ut=font.ut,
+                desc={
+                    "ascent": desc.ascent,
+                    "descent": desc.descent,
+                    "cap_height": desc.cap_height,
+                    "flags": desc.flags.value,
+                    "font_b_box": desc.font_b_box,
+                    "italic_angle": desc.italic_angle,
+                    "stem_v": desc.stem_v,
+                    "missing_width": desc.missing_width,
+                },
+            )
+            codepoints = array("I", font.cmap)
+            widths = array("i", (font.cw[char] for char in font.cmap))
+            glyph_ids = array("I", (font.glyph_ids[char] for char in font.cmap))
+            glyph_names = list(font.cmap.values())
+        finally:
+            font.close()
+        return cls(header, codepoints, widths, glyph_ids, glyph_names)
+
+    def to_bytes(self) -> bytes:
+        """Serialize the metrics into the compact cache format.
+
+        Returns:
+            bytes: Preamble, JSON header and zlib-compressed tables.
+        """
+        tables = [self.codepoints, self.widths, self.glyph_ids]
+        if sys.byteorder == "big":
+            tables = [array(table.typecode, table) for table in tables]
+            for table in tables:
+                table.byteswap()
+        body = b"".join(
+            [struct.pack("<I", len(self.codepoints))]
+            + [table.tobytes() for table in tables]
+            + ["\0".join(self.glyph_names).encode("utf-8")]
+        )
+        header = json.dumps(self.header, separators=(",", ":")).encode("utf-8")
+        preamble = _PREAMBLE.pack(CACHE_MAGIC, CACHE_FORMAT_VERSION, len(header))
+        return preamble + header + zlib.compress(body)
+
+    @classmethod
+    def read_header(cls, raw: bytes) -> dict | None:
+        """Read only the JSON header of a serialized cache entry.
+
+        Args:
+            raw (bytes): Serialized cache entry.
+
+        Returns:
+            dict | None: The header, or None if the entry has an unknown format.
+        """
+        if len(raw) < _PREAMBLE.size:
+            return None
+        magic, version, header_len = _PREAMBLE.unpack_from(raw)
+        if magic != CACHE_MAGIC or version != CACHE_FORMAT_VERSION:
+            return None
+        return json.loads(raw[_PREAMBLE.size : _PREAMBLE.size + header_len])
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "FontMetrics":
+        """Deserialize metrics written by `to_bytes`.
+
+        Args:
+            raw (bytes): Serialized cache entry.
+
+        Returns:
+            FontMetrics: The deserialized metrics.
+
+        Raises:
+            ValueError: If the entry is truncated or has an unknown format.
+        """
+        header = cls.read_header(raw)
+        if header is None:
+            raise ValueError("Unknown font cache format")
+        header_len = _PREAMBLE.unpack_from(raw)[2]
+        body = zlib.decompress(raw[_PREAMBLE.size + header_len :])
+        (count,) = struct.unpack_from("<I", body)
+        offset = 4
+        tables = []
+        for typecode in ("I", "i", "I"):
+            table = array(typecode)
+            size = count * table.itemsize
+            table.frombytes(body[offset : offset + size])
+            if sys.byteorder == "big":
+                table.byteswap()
+            tables.append(table)
+            offset += size
+        glyph_names = body[offset:].decode("utf-8").split("\0") if count else []
+        if len(glyph_names) != count:
+            raise ValueError("Corrupted font cache entry")
+        codepoints, widths, glyph_ids = tables
+        return cls(header, codepoints, widths, glyph_ids, glyph_names)
+
+    def to_ttf_font(self, pdf: "FPDF", font_path: Path, fontkey: str, style: str) -> "TTFFont":
+        """Build an fpdf font object from the metrics without re-parsing the font.
+
+        This mirrors `fpdf.fonts.TTFFont.__init__` of fpdf 2.8, which is why
+        pyproject.toml pins fpdf2 to 2.8. The fontTools font is still
+        opened lazily, since fpdf needs it to subset glyphs at output time.
+
+        Args:
+            pdf (FPDF): The PDF document the font will be registered with.
+            font_path (Path): Path to the TTF file.
+            fontkey (str): fpdf font key (lowercase family followed by style).
+            style (str): Font style ("", "B", "I" or "BI").
+
+        Returns:
+            TTFFont: A font object equivalent to a freshly parsed one.
+        """
+        from fontTools import ttLib
+        from fpdf.enums import FontDescriptorFlags
+        from fpdf.enums import TextEmphasis
+        from fpdf.fonts import PDFFontDescriptor
+        from fpdf.fonts import SubsetMap
+        from fpdf.fonts import TTFFont
+
+        header = self.header
+        font = TTFFont.__new__(TTFFont)
+        font.i = len(pdf.fonts) + 1
+        font.type = "TTF"
+        font.ttffile = font_path
+        font.fontkey = fontkey
+        font.ttfont = ttLib.TTFont(font_path, recalcTimestamp=False, fontNumber=0, lazy=True)
+        font.scale = header["scale"]
+
+        desc = dict(header["desc"])
+        desc["flags"] = FontDescriptorFlags(desc["flags"])
+        font.desc = PDFFontDescriptor(**desc)
+
+        default_width = desc["missing_width"]
+        font.cw = defaultdict(lambda: default_width, zip(self.codepoints, self.widths))
+        font.cmap = dict(zip(self.codepoints, self.glyph_names))
+        font.glyph_ids = dict(zip(self.codepoints, self.glyph_ids))
+        font.missing_glyphs = []
+
+        sbarr = "\x00 \r\n"
+        if pdf.str_alias_nb_pages:
+            sbarr += "0123456789"
+            sbarr += pdf.str_alias_nb_pages
+
+        font.name = header["name"]
+        font.up = header["up"]
+        font.ut = header["ut"]
+        font.emphasis = TextEmphasis.coerce(style)
+        font.subset = SubsetMap(font, [ord(char) for char in sbarr])
+        return font
+
+
+class FontCache:
+    """On-disk cache of parsed font metrics, one file per font."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        """Initialize the font cache.
+
+        Args:
+            cache_dir (str): Directory holding the cache entries.
+        """
+        self.cache_dir = Path(cache_dir)
+        # Metrics already loaded by this process, with the file key they match
+        self._loaded: dict[str, tuple] = {}
+        # Embedded font subsets already built by this process, by glyph set
+        self._subsets: OrderedDict[tuple, bytes] = OrderedDict()
+        self.max_subsets = 64
+
+    def entry_path(self, font_path) -> Path:
+        """Return the cache entry path for a font file.
+
+        Args:
+            font_path: Path to the TTF file.
+
+        Returns:
+            Path: Location of the cache entry.
+        """
+        resolved = str(Path(font_path).resolve())
+        digest = hashlib.sha1(resolved.encode("utf-8")).hexdigest()[:16]
+        return self.cache_dir / f"{Path(font_path).stem}-{digest}.bin"
+
+    @staticmethod
+    def _content_hash(font_path) -> str:
+        """Return the SHA-256 digest of a font file."""
+        with open(font_path, "rb") as file:
+            return hashlib.file_digest(file, "sha256").hexdigest()
+
+    @staticmethod
+    def _file_key(font_path) -> dict:
+        """Return the part of the cache key that only needs a stat call."""
+        stat = os.stat(font_path)
+        return {
+            "path": str(Path(font_path).resolve()),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "fpdf": fpdf_version(),
+        }
+
+    def _read_entry(self, font_path, file_key: dict) -> FontMetrics | None:
+        """Return the cached metrics for a font if the entry is still valid."""
+        try:
+            raw = self.entry_path(font_path).read_bytes()
+            header = FontMetrics.read_header(raw)
+        except (OSError, ValueError):
+            return None
+        if header is None or header.get("fpdf") != file_key["fpdf"]:
+            return None
+        if header.get("path") != file_key["path"]:
+            return None
+        if header.get("size") != file_key["size"]:
+            return None
+        if header.get("mtime_ns") != file_key["mtime_ns"]:
+            # The file was touched; it is still valid if the content is unchanged
+            if header.get("sha256") != self._content_hash(font_path):
+                return None
+        try:
+            metrics = FontMetrics.from_bytes(raw)
+        except (ValueError, zlib.error, struct.error):
+            return None
+        if metrics.header["mtime_ns"] != file_key["mtime_ns"]:
+            metrics.header["mtime_ns"] = file_key["mtime_ns"]
+            self._write_entry(font_path, metrics)
+        return metrics
+
+    def _write_entry(self, font_path, metrics: FontMetrics) -> None:
+        """Atomically write a cache entry, ignoring unwritable cache directories."""
+        entry_path = self.entry_path(font_path)
+        tmp_path = entry_path.with_name(f"{entry_path.name}.{os.getpid()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(metrics.to_bytes())
+            os.replace(tmp_path, entry_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+
+    def build(self, font_path) -> FontMetrics:
+        """Parse a font and store its metrics, replacing any existing entry.
+
+        Args:
+            font_path: Path to the TTF file.
+
+        Returns:
+            FontMetrics: The freshly parsed metrics.
+        """
+        file_key = self._file_key(font_path)
+        key = dict(file_key, sha256=self._content_hash(font_path))
+        metrics = FontMetrics.from_ttf(Path(font_path), key)
+        self._write_entry(font_path, metrics)
+        self._loaded[file_key["path"]] = (file_key, metrics)
+        return metrics
+
+    @traced
+    def load(self, font_path) -> FontMetrics:
+        """Return the metrics of a font, parsing and caching it on a miss.
+
+        Metrics are also kept in memory, so a long-lived cache only stats the
+        font file when the same font is registered again.
+
+        Args:
+            font_path: Path to the TTF file.
+
+        Returns:
+            FontMetrics: The font metrics.
+
+        Raises:
+            FileNotFoundError: If the font file does not exist.
+        """
+        if not os.path.exists(font_path):
+            raise FileNotFoundError(f"Font file not found: {font_path}")
+        file_key = self._file_key(font_path)
+        loaded = self._loaded.get(file_key["path"])
+        if loaded is not None and loaded[0] == file_key:
+            return loaded[1]
+        metrics = self._read_entry(font_path, file_key)
+        if metrics is None:
+            return self.build(font_path)
+        self._loaded[file_key["path"]] = (file_key, metrics)
+        return metrics
+
+    def add_font(self, pdf: "FPDF", family: str, font_path, style: str = "") -> None:
+        """Register a font with a PDF document, like `FPDF.add_font`.
+
+        Args:
+            pdf (FPDF): The PDF document.
+            family (str): Font family name used with `FPDF.set_font`.
+            font_path: Path to the TTF file.
+            style (str): Font style ("", "B", "I" or "BI").
+
+        Raises:
+            FileNotFoundError: If the font file does not exist.
+        """
+        style = "".join(sorted(style.upper()))
+        fontkey = f"{family.lower()}{style}"
+        if fontkey in pdf.fonts:
+            return
+        metrics = self.load(font_path)
+        pdf.fonts[fontkey] = metrics.to_ttf_font(pdf, Path(font_path), fontkey, style)
+
+    def subset(self, font: "TTFFont") -> bytes:
+        """Return the subset of a registered font that fpdf embeds.
+
+        Subsetting parses the cmap and glyph names of the whole font, which is
+        most of the time spent writing a PDF. Consecutive documents of a
+        long-lived cache usually draw the same glyphs, so subsets are kept in
+        memory by font file and glyph set.
+
+        Args:
+            font (TTFFont): A font registered with a document about to be output.
+
+        Returns:
+            bytes: The subset font, with the options fpdf uses for embedding.
+        """
+        glyph_names = font.subset.get_all_glyph_names()
+        file_key = self._file_key(font.ttffile)
+        key = (*file_key.values(), *sorted(glyph_names))
+        subset = self._subsets.get(key)
+        if subset is None:
+            from fontTools import subset as ftsubset
+            from fontTools import ttLib
+
+            options = ftsubset.Options(notdef_outline=True, recommended_glyphs=True)
+            options.drop_tables += SUBSET_DROP_TABLES
+            # fpdf subsets the cached subset again by glyph name, so the names must survive
+            options.glyph_names = True
+            subsetter = ftsubset.Subsetter(options)
+            subsetter.populate(glyphs=glyph_names)
+            ttfont = ttLib.TTFont(font.ttffile, recalcTimestamp=False, fontNumber=0, lazy=True)
+            subsetter.subset(ttfont)
+            output = BytesIO()
+            ttfont.save(output)
+            ttfont.close()
+            subset = output.getvalue()
+            self._subsets[key] = subset
+            while len(self._subsets) > self.max_subsets:
+                self._subsets.popitem(last=False)
+        self._subsets.move_to_end(key)
+        return subset
+
+    def invalidate(self, font_path) -> bool:
+        """Remove the cache entry of a single font.
+
+        Args:
+            font_path: Path to the TTF file.
+
+        Returns:
+            bool: True if an entry was removed.
+        """
+        self._loaded.pop(str(Path(font_path).resolve()), None)
+        self._subsets.clear()
+        try:
+            self.entry_path(font_path).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def clear(self) -> int:
+        """Remove every cache entry, including the font coverage index.
+
+        Only the files the cache writes are removed, along with temporary files
+        left by interrupted writes, so other files in the directory are kept.
+
+        Returns:
+            int: Number of files removed.
+        """
+        # Imported here since the coverage index is itself built from this cache
+        from resume_generator.font_coverage import INDEX_FILE_NAME
+
+        self._loaded.clear()
+        self._subsets.clear()
+        removed = 0
+        if not self.cache_dir.is_dir():
+            return removed
+        for name in (ENTRY_FILE_PATTERN, INDEX_FILE_NAME):
+            for pattern in (name, f"{name}.*.tmp"):
+                for entry in self.cache_dir.glob(pattern):
+                    if entry.is_file():
+                        entry.unlink(missing_ok=True)
+                        removed += 1
+        return removed
+
+    def build_directory(self, fonts_dir: str = DEFAULT_FONTS_DIR) -> dict:
+        """Pre-build cache entries for every TTF file in a directory.
+
+        Args:
+            fonts_dir (str): Directory containing the TTF files.
+
+        Returns:
+            dict: Mapping of font path to an error message, for fonts that failed.
+        """
+        failures = {}
+        for font_path in sorted(Path(fonts_dir).glob("*.ttf")):
+            try:
+                self.load(font_path)
+            except Exception as e:
+                failures[str(font_path)] = str(e)
+        return failures
+
+
+def main(argv=None) -> int:
+    """Build or clear the font cache from the command line.
+
+    Args:
+        argv (list, optional): Command-line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: Process exit code.
+    """
+    parser = argparse.ArgumentParser(description="Manage the parsed font cache.")
+    parser.add_argument(
+        "command", choices=["build", "clear"], help="Pre-build or invalidate the cache"
+    )
+    parser.add_argument("--fonts-dir", default=DEFAULT_FONTS_DIR, help="TTF font directory")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Cache directory")
+    args = parser.parse_args(argv)
+
+    cache = FontCache(args.cache_dir)
+    if args.command == "clear":
+        print(f"Removed {cache.clear()} cache files from {cache.cache_dir}")
+        return 0
+
+    # Imported here since the coverage index is itself built from this cache
+    from resume_generator.font_coverage import CoverageIndex
+
+    failures = cache.build_directory(args.fonts_dir)
+    for font_path, error in failures.items():
+        print(f"Skipped {font_path}: {error}")
+    built = len(list(Path(args.fonts_dir).glob("*.ttf"))) - len(failures)
+    CoverageIndex.load(args.fonts_dir, cache)
+    print(f"Cached {built} fonts and their coverage index in {cache.cache_dir}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+"""Code-point coverage index over the bundled font library.
+
+The index records which code points each TTF file in the fonts directory can
+draw. Coverage is stored per 256-code-point page as a 256-bit bitset, so the
+whole library fits in a few hundred kilobytes and a query only touches the
+pages that the text actually uses.
+
+The index is saved next to the font cache and rebuilt automatically when the
+set of font files changes. `python -m resume_generator.font_cache build`
+pre-builds it together with the font metrics.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import zlib
+from array import array
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from resume_generator.font_cache import DEFAULT_FONTS_DIR
+from resume_generator.font_cache import FontCache
+from resume_generator.validation import DeferredEntry
+
+INDEX_FILE_NAME = "coverage.idx"
+INDEX_MAGIC = b"RGCI"
+INDEX_FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct("<4sHI")
+
+PAGE_SHIFT = 8
+PAGE_MASK = (1 << PAGE_SHIFT) - 1
+PAGE_BYTES = (1 << PAGE_SHIFT) // 8
+
+# File name markers of non-regular faces, which are only picked as a last resort
+STYLED_FACE_MARKERS = ("Bold", "Oblique", "Italic", "Light", "-b")
+
+
+def collect_codepoints(value) -> set:
+    """Collect the code points of every string in validated resume data.
+
+    Entries marked `include: false` are never rendered and are skipped.
+
+    Args:
+        value: A model, a list or tuple of models, or a plain value.
+
+    Returns:
+        set: Code points of the printable characters found.
+    """
+    codepoints: set[int] = set()
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, DeferredEntry):
+            continue
+        if isinstance(item, BaseModel):
+            if getattr(item, "include", True) is False:
+                continue
+            stack.extend(getattr(item, name) for name in type(item).model_fields)
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+        elif item is not None and not isinstance(item, bool):
+            codepoints.update(map(ord, str(item)))
+    # Control characters such as line breaks are never drawn with a glyph
+    return {codepoint for codepoint in codepoints if codepoint >= 0x20}
+
+
+def _to_pages(codepoints) -> dict:
+    """Group code points into a mapping of page number to bitset."""
+    pages: dict[int, int] = {}
+    for codepoint in codepoints:
+        page = codepoint >> PAGE_SHIFT
+        pages[page] = pages.get(page, 0) | (1 << (codepoint & PAGE_MASK))
+    return pages
+
+
+def _from_pages(pages: dict) -> list:
+    """Expand a mapping of page number to bitset into sorted code points."""
+    codepoints = []
+    for page, bits in sorted(pages.items()):
+        while bits:
+            low = bits & -bits
+            codepoints.append((page << PAGE_SHIFT) | (low.bit_length() - 1))
+            bits ^= low
+    return codepoints
+
+
+class CoverageIndex:
+    """Mapping of Unicode pages to the fonts that cover them, as bitsets."""
+
+    __slots__ = ("fonts", "coverage", "key")
+
+    def __init__(self, fonts: list, coverage: list, key: str):
+        """Initialize the coverage index.
+
+        Args:
+            fonts (list): Font family names, in library order.
+            coverage (list): For each font, a mapping of page number to bitset.
+            key (str): Fingerprint of the font files the index was built from.
+        """
+        self.fonts = fonts
+        self.coverage = coverage
+        self.key = key
+
+    @staticmethod
+    def library_key(fonts_dir) -> str:
+        """Fingerprint the font files of a directory by name, size and mtime.
+
+        Args:
+            fonts_dir: Directory containing the TTF files.
+
+        Returns:
+            str: Hex digest identifying the current state of the library.
+        """
+        digest = hashlib.sha256()
+        for font_path in sorted(Path(fonts_dir).glob("*.ttf")):
+            stat = os.stat(font_path)
+            digest.update(f"{font_path.name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+        return digest.hexdigest()
+
+    @classmethod
+    def build(cls, fonts_dir, font_cache: FontCache) -> "CoverageIndex":
+        """Build the index from the cmaps of every font in a directory.
+
+        Args:
+            fonts_dir: Directory containing the TTF files.
+            font_cache (FontCache): Cache used to load the font cmaps.
+
+        Returns:
+            CoverageIndex: The new index. Fonts that fail to parse are left out.
+        """
+        fonts, coverage = [], []
+        for font_path in sorted(Path(fonts_dir).glob("*.ttf")):
+            try:
+                metrics = font_cache.load(font_path)
+            except Exception:
+                continue
+            fonts.append(font_path.stem)
+            coverage.append(_to_pages(metrics.codepoints))
+        return cls(fonts, coverage, cls.library_key(fonts_dir))
+
+    def to_bytes(self) -> bytes:
+        """Serialize the index.
+
+        Returns:
+            bytes: Preamble, JSON header and zlib-compressed page bitsets.
+        """
+        body = []
+        for pages in self.coverage:
+            page_numbers = array("H", sorted(pages))
+            body.append(struct.pack("<H", len(page_numbers)))
+            body.append(page_numbers.tobytes())
+            body.extend(pages[page].to_bytes(PAGE_BYTES, "little") for page in page_numbers)
+        header = json.dumps({"key": self.key, "fonts": self.fonts}).encode("utf-8")
+        preamble = _PREAMBLE.pack(INDEX_MAGIC, INDEX_FORMAT_VERSION, len(header))
+        return preamble + header + zlib.compress(b"".join(body))
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "CoverageIndex":
+        """Deserialize an index written by `to_bytes`.
+
+        Args:
+            raw (bytes): Serialized index.
+
+        Returns:
+            CoverageIndex: The deserialized index.
+
+        Raises:
+            ValueError: If the data has an unknown format.
+        """
+        magic, version, header_len = _PREAMBLE.unpack_from(raw)
+        if magic != INDEX_MAGIC or version != INDEX_FORMAT_VERSION:
+            raise ValueError("Unknown font coverage index format")
+        header = json.loads(raw[_PREAMBLE.size : _PREAMBLE.size + header_len])
+        body = zlib.decompress(raw[_PREAMBLE.size + header_len :])
+        offset, coverage = 0, []
+        for _ in header["fonts"]:
+            (count,) = struct.unpack_from("<H", body, offset)
+            offset += 2
+            page_numbers = array("H")
+            page_numbers.frombytes(body[offset : offset + 2 * count])
+            offset += 2 * count
+            pages = {}
+            for page in page_numbers:
+                pages[page] = int.from_bytes(body[offset : offset + PAGE_BYTES], "little")
+                offset += PAGE_BYTES
+            coverage.append(pages)
+        return cls(header["fonts"], coverage, header["key"])
+
+    @classmethod
+    def load(
+        cls, fonts_dir=DEFAULT_FONTS_DIR, font_cache: FontCache | None = None
+    ) -> "CoverageIndex":
+        """Load the saved index, rebuilding it if the font library changed.
+
+        Args:
+            fonts_dir: Directory containing the TTF files.
+            font_cache (FontCache, optional): Cache holding the index and font metrics.
+
+        Returns:
+            CoverageIndex: An index matching the current font library.
+        """
+        font_cache = font_cache or FontCache()
+        index_path = font_cache.cache_dir / INDEX_FILE_NAME
+        key = cls.library_key(fonts_dir)
+        try:
+            index = cls.from_bytes(index_path.read_bytes())
+            if index.key == key:
+                return index
+        except (OSError, ValueError, struct.error, zlib.error):
+            pass
+        index = cls.build(fonts_dir, font_cache)
+        index.save(index_path)
+        return index
+
+    def save(self, index_path) -> None:
+        """Atomically write the index, ignoring unwritable cache directories.
+
+        Args:
+            index_path: Destination file.
+        """
+        index_path = Path(index_path)
+        tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+        try:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(self.to_bytes())
+            os.replace(tmp_path, index_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+
+    def missing(self, family: str, codepoints) -> set:
+        """Return the code points that a font of the library cannot draw.
+
+        Args:
+            family (str): Font family name (file name without extension).
+            codepoints: Code points to check.
+
+        Returns:
+            set: The code points not covered by the font.
+        """
+        pages = self.coverage[self.fonts.index(family)] if family in self.fonts else {}
+        return {
+            codepoint
+            for codepoint in codepoints
+            if not pages.get(codepoint >> PAGE_SHIFT, 0) >> (codepoint & PAGE_MASK) & 1
+        }
+
+    def select_fonts(self, codepoints, preferred=()) -> list:
+        """Choose a small set of fonts that together cover the given code points.
+
+        This is a greedy set cover: the font drawing the most uncovered code
+        points is picked until everything is covered. Ties go to the preferred
+        fonts first, then to regular faces, then to library order.
+
+        Args:
+            codepoints: Code points that need a font.
+            preferred (sequence): Font families to favour, in order.
+
+        Returns:
+            list: Font family names, in the order they were picked.
+
+        Raises:
+            ValueError: If no font of the library can draw some of the code points.
+        """
+        remaining = _to_pages(codepoints)
+        order = [self.fonts.index(family) for family in preferred if family in self.fonts]
+        order += sorted(
+            (font for font in range(len(self.fonts)) if font not in order),
+            key=lambda font: any(marker in self.fonts[font] for marker in STYLED_FACE_MARKERS),
+        )
+
+        selected = []
+        while remaining:
+            best, best_gain = None, 0
+            for font in order:
+                pages = self.coverage[font]
+                gain = sum(
+                    (pages.get(page, 0) & bits).bit_count() for page, bits in remaining.items()
+                )
+                if gain > best_gain:
+                    best, best_gain = font, gain
+            if best is None:
+                break
+            selected.append(self.fonts[best])
+            pages = self.coverage[best]
+            remaining = {
+                page: bits & ~pages.get(page, 0)
+                for page, bits in remaining.items()
+                if bits & ~pages.get(page, 0)
+            }
+
+        if remaining:
+            uncovered = _from_pages(remaining)
+            chars = ", ".join(f"U+{char:04X} '{chr(char)}'" for char in uncovered[:10])
+            if len(uncovered) > 10:
+                chars += f", ... (and {len(uncovered) - 10} others)"
+            raise ValueError(f"No bundled font can draw: {chars}")
+        return selected
+
+
+def select_fallback_fonts(
+    resume_data, base_fonts: list, preferred: list, index: CoverageIndex
+) -> list:
+    """Choose the fallback fonts needed to draw the text of a resume.
+
+    Args:
+        resume_data: Data of the drawn sections of a resume, as returned by
+            `resume_generator.sections.registry.drawn_sections`.
+        base_fonts (list): Font families the styles render text with.
+        preferred (list): Font families to favour as fallbacks, in order.
+        index (CoverageIndex): Coverage index of the font library.
+
+    Returns:
+        list: Font families covering every character the base fonts lack.
+
+    Raises:
+        ValueError: If no bundled font can draw some of the characters.
+    """
+    codepoints = collect_codepoints(resume_data)
+    needed = set()
+    for family in base_fonts:
+        needed |= index.missing(family, codepoints)
+    return index.select_fonts(needed, preferred)
@@ -0,0 +1,293 @@
+"""Content-hashed cache of rendered section and entry fragments.
+
+Tailored copies of a resume mostly render the same entries again. A fragment
+is the sequence of draw operations an entry or a whole section produced (font
+and colour selections, cells, text already broken into lines, links).
+Fragments are keyed by a fingerprint of the entry's model, the resolved styles,
+the page geometry and the font files, and replaying one issues the same fpdf
+calls without laying the text out again. Fragments also record the vertical
+space they took, so that a layout-only pass (see `resume_generator.autofit`)
+can step over a cached fragment that fits on the current page without
+replaying it.
+
+Draw operations are plain tuples, so fragments do not depend on the document
+they were recorded in and can be stored on disk:
+
+    ("font", family, style, size)   select a font
+    ("color", *components)          select the text colour (gray or RGB)
+    ("cell", w, h, text)            single-line cell
+    ("text", w, h, text, lines)     multi-line cell; lines is a list of
+                                    `WrappedLine` fields, or None when the
+                                    text is left to fpdf's own line breaker
+    ("inline", w, h, runs, bold)    multi-line cell mixing regular and bold
+                                    text and links; runs are (text, bold,
+                                    url or None), and bold is the font
+                                    family of the bold runs
+    ("link", url)                   clickable URL
+
+Sections also play operations describing the structure of the content, which
+draw nothing; see `resume_generator.renderers`.
+"""
+
+import hashlib
+import json
+import os
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+from resume_generator.font_cache import fpdf_version
+from resume_generator.validation import model_to_json
+
+DEFAULT_FRAGMENT_CACHE_DIR = ".fragment_cache"
+FRAGMENT_FORMAT_VERSION = 3
+
+
+class DrawFragment(NamedTuple):
+    """Draw operations of a rendered entry or section, and the space they took.
+
+    `height` is the distance travelled down the flow, not counting the bottom
+    margins skipped by the `page_breaks` it crossed.
+    """
+
+    ops: tuple
+    height: float = 0.0
+    page_breaks: int = 0
+
+
+class FragmentRecorder:
+    """Collects the draw operations played while a fragment is rendered."""
+
+    def __init__(self):
+        """Initialize an empty recording."""
+        self.ops = []
+        self.height = 0.0
+        self.page_breaks = 0
+
+    def add(self, op: tuple) -> None:
+        """Record a draw operation.
+
+        Args:
+            op (tuple): The draw operation.
+        """
+        self.ops.append(op)
+
+    def measure(self, height: float, page_breaks: int) -> None:
+        """Record the space taken by the operations.
+
+        Args:
+            height (float): Distance travelled down the flow.
+            page_breaks (int): Number of page breaks crossed.
+        """
+        self.height = height
+        self.page_breaks = page_breaks
+
+    def fragment(self) -> DrawFragment:
+        """Return the recorded fragment.
+
+        Returns:
+            DrawFragment: The operations and space recorded so far.
+        """
+        return DrawFragment(tuple(self.ops), self.height, self.page_breaks)
+
+
+@lru_cache(maxsize=None)
+def renderer_version() -> str:
+    """Hash the modules that draw fragments, so that code changes invalidate them.
+
+    Returns:
+        str: Hex digest of the drawing code.
+    """
+    package_dir = Path(__file__).parent
+    digest = hashlib.sha256()
+    modules = [package_dir / "pdf.py", package_dir / "measure.py", package_dir / "markup.py"]
+    modules.append(package_dir / "styles" / "compiled.py")
+    for path in sorted([*modules, *(package_dir / "sections").glob("*.py")]):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def fingerprint(*parts) -> str:
+    """Hash models, styles and geometry into a fragment cache key.
+
+    Args:
+        *parts: JSON-compatible values or pydantic models.
+
+    Returns:
+        str: Hex digest identifying the content.
+    """
+    payload = json.dumps(
+        [FRAGMENT_FORMAT_VERSION, fpdf_version(), renderer_version(), *parts],
+        default=model_to_json,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class FragmentCache:
+    """Base class of fragment caches, counting hits and misses."""
+
+    def __init__(self):
+        """Initialize the hit and miss counters."""
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> DrawFragment | None:
+        """Return the fragment stored for a fingerprint.
+
+        Args:
+            key (str): Fragment fingerprint.
+
+        Returns:
+            DrawFragment | None: The cached fragment, or None on a miss.
+        """
+        fragment = self._load(key)
+        if fragment is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return fragment
+
+    def put(self, key: str, fragment: DrawFragment) -> None:
+        """Store a fragment under a fingerprint.
+
+        Args:
+            key (str): Fragment fingerprint.
+            fragment (DrawFragment): The recorded fragment.
+        """
+        self._store(key, fragment)
+
+    def stats(self) -> dict:
+        """Return the hit and miss counters.
+
+        Returns:
+            dict: Hits, misses and hit rate.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _load(self, key: str) -> DrawFragment | None:
+        raise NotImplementedError
+
+    def _store(self, key: str, fragment: DrawFragment) -> None:
+        raise NotImplementedError
+
+
+class MemoryFragmentCache(FragmentCache):
+    """In-memory fragment cache evicting the least recently used entries."""
+
+    def __init__(self, max_entries: int = 1024):
+        """Initialize the cache.
+
+        Args:
+            max_entries (int): Maximum number of fragments kept.
+        """
+        super().__init__()
+        self.max_entries = max_entries
+        self._fragments: OrderedDict[str, DrawFragment] = OrderedDict()
+
+    def _load(self, key: str) -> DrawFragment | None:
+        fragment = self._fragments.get(key)
+        if fragment is not None:
+            self._fragments.move_to_end(key)
+        return fragment
+
+    def _store(self, key: str, fragment: DrawFragment) -> None:
+        self._fragments[key] = fragment
+        self._fragments.move_to_end(key)
+        while len(self._fragments) > self.max_entries:
+            self._fragments.popitem(last=False)
+
+
+class DiskFragmentCache(FragmentCache):
+    """On-disk fragment cache, one compressed JSON file per fragment."""
+
+    def __init__(self, cache_dir: str = DEFAULT_FRAGMENT_CACHE_DIR):
+        """Initialize the cache.
+
+        Args:
+            cache_dir (str): Directory holding the fragment files.
+        """
+        super().__init__()
+        self.cache_dir = Path(cache_dir)
+
+    def entry_path(self, key: str) -> Path:
+        """Return the file holding the fragment of a fingerprint.
+
+        Args:
+            key (str): Fragment fingerprint.
+
+        Returns:
+            Path: Location of the fragment file.
+        """
+        return self.cache_dir / key[:2] / f"{key}.frag"
+
+    def _load(self, key: str) -> DrawFragment | None:
+        try:
+            data = json.loads(zlib.decompress(self.entry_path(key).read_bytes()))
+            ops = tuple(tuple(op) for op in data["ops"])
+            return DrawFragment(ops, float(data["height"]), int(data["page_breaks"]))
+        except (OSError, ValueError, KeyError, TypeError, zlib.error):
+            return None
+
+    def _store(self, key: str, fragment: DrawFragment) -> None:
+        """Atomically write a fragment, ignoring unwritable cache directories."""
+        entry_path = self.entry_path(key)
+        tmp_path = entry_path.with_name(f"{entry_path.name}.{os.getpid()}.tmp")
+        data = json.dumps(
+            {"ops": fragment.ops, "height": fragment.height, "page_breaks": fragment.page_breaks}
+        )
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(zlib.compress(data.encode("utf-8")))
+            os.replace(tmp_path, entry_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+
+    def clear(self) -> int:
+        """Remove every fragment file.
+
+        Returns:
+            int: Number of files removed.
+        """
+        removed = 0
+        if not self.cache_dir.is_dir():
+            return removed
+        for entry in self.cache_dir.glob("*/*.frag"):
+            entry.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+
+def fragment_cache_from_config(config: dict, default: str = "off") -> FragmentCache | None:
+    """Create the fragment cache selected by the configuration.
+
+    Args:
+        config (dict): Configuration dictionary. `fragment_cache` is "memory",
+            "disk" or "off", and `fragment_cache_directory` sets the directory
+            of the disk cache.
+        default (str): Backend used when the configuration does not set one.
+            A one-shot render has nothing to reuse, so it defaults to "off";
+            modes rendering many documents in one process pass "memory".
+
+    Returns:
+        FragmentCache | None: The cache, or None if fragment caching is off.
+
+    Raises:
+        ValueError: If `fragment_cache` has an unknown value.
+    """
+    backend = config.get("fragment_cache", default)
+    if backend == "memory":
+        return MemoryFragmentCache()
+    if backend == "disk":
+        return DiskFragmentCache(config.get("fragment_cache_directory", DEFAULT_FRAGMENT_CACHE_DIR))
+    if backend in ("off", None, False):
+        return None
+    raise ValueError(f"Unknown fragment cache backend: {backend}")
@@ -6,41 +6,39 @@ various sections including personal information, work experience, education,
 certifications, volunteering, projects, awards, and languages.
 """
 
+import argparse
 import json
 import os
+import sys
 import warnings
 from datetime import datetime
+from datetime import timezone
 
 import yaml
-from fpdf import FPDF
-
-from resume_generator.schemas import ApplicationInfo
-from resume_generator.schemas import Articles
-from resume_generator.schemas import Education
-from resume_generator.schemas import General
-from resume_generator.schemas import HonorsAndAwards
-from resume_generator.schemas import Jobs
-from resume_generator.schemas import Languages
-from resume_generator.schemas import LicensesAndCertifications
-from resume_generator.schemas import Projects
-from resume_generator.schemas import VolunteerExperience
-from resume_generator.sections import ArticlesSection
-from resume_generator.sections import AwardsSection
-from resume_generator.sections import CertificationsSection
-from resume_generator.sections import EducationSection
-from resume_generator.sections import GeneralSection
-from resume_generator.sections import JobsSection
-from resume_generator.sections import LanguagesSection
-from resume_generator.sections import ProjectsSection
-from resume_generator.sections import VolunteeringSection
+
+from resume_generator.font_cache import DEFAULT_CACHE_DIR
+from resume_generator.font_cache import DEFAULT_FONTS_DIR
+from resume_generator.font_cache import FontCache
+from resume_generator.profiling import start_tracing
+from resume_generator.profiling import stop_tracing
+from resume_generator.profiling import traced
+from resume_generator.renderers import RENDERERS
+from resume_generator.renderers import create_renderers
+from resume_generator.renderers import write_outputs
+from resume_generator.sections.registry import build_sections
+from resume_generator.sections.registry import drawn_sections
 from resume_generator.styles import modern_styles
 
 warnings.simplefilter("default", DeprecationWarning)
 
 
-def load_config():
+@traced
+def load_config(path="config.yaml"):
     """Load configuration from config.yaml file.
 
+    Args:
+        path (str, optional): Path of the configuration file.
+
     Returns:
         dict: Configuration settings loaded from YAML file.
 
@@ -49,17 +47,25 @@ def load_config():
         ValueError: If config.yaml contains invalid YAML.
     """
     try:
-        with open("config.yaml", "r") as file:
+        with open(path, "r") as file:
             return yaml.safe_load(file)
     except FileNotFoundError:
-        raise FileNotFoundError("config.yaml not found")
+        raise FileNotFoundError(f"{path} not found")
     except yaml.YAMLError as e:
-        raise ValueError(f"Invalid YAML in config.yaml: {str(e)}")
+        raise ValueError(f"Invalid YAML in {path}: {str(e)}")
 
 
-def load_resume_data():
+@traced
+def load_resume_data(path="resume.json", cache=None, defer_excluded=False):
     """Load and validate resume data from JSON file.
 
+    Args:
+        path (str, optional): Path of the resume data file.
+        cache (ValidationCache, optional): Cache of the sections and entries
+            validated before, reused when their content did not change.
+        defer_excluded (bool): Validate entries marked `include: false` only
+            when they are read.
+
     Returns:
         tuple: Validated resume data sections (application_info, general, jobs, etc.).
 
@@ -68,98 +74,191 @@ def load_resume_data():
         ValueError: If resume.json contains invalid JSON or data validation fails.
     """
     try:
-        with open("resume.json", "r") as file:
+        with open(path, "r") as file:
             resume_data = json.load(file)
     except FileNotFoundError:
-        raise FileNotFoundError("resume.json not found")
+        raise FileNotFoundError(f"{path} not found")
     except json.JSONDecodeError as e:
-        raise ValueError(f"Invalid JSON in resume.json: {str(e)}")
+        raise ValueError(f"Invalid JSON in {path}: {str(e)}")
+    return validate_resume_data(resume_data, cache, defer_excluded)
+
+
+@traced
+def validate_resume_data(resume_data, cache=None, defer_excluded=False):
+    """Validate resume data already parsed from JSON.
+
+    Without a cache, the whole document is validated in one pass by
+    pydantic-core; on failure, the first invalid section or entry is reported
+    as validating it alone does. With a cache, only the sections and entries
+    whose content was not validated before are.
+
+    Args:
+        resume_data (dict): Resume data with the same layout as resume.json.
+        cache (ValidationCache, optional): Cache of the sections and entries
+            validated before, reused when their content did not change.
+        defer_excluded (bool): Validate entries marked `include: false` only
+            when they are read (see `DeferredEntry`).
+
+    Returns:
+        tuple: Validated resume data sections (application_info, general, jobs, etc.).
+
+    Raises:
+        ValueError: If a section is missing or data validation fails.
+    """
+    # Imported here since building the pydantic models takes most of the
+    # startup time, which `--help` and snapshot loads do not need
+    from pydantic import ValidationError
+
+    from resume_generator.schemas import RESUME_ADAPTER
+    from resume_generator.schemas import RESUME_SECTIONS
+    from resume_generator.schemas import document_sections
+    from resume_generator.schemas import first_entry_error
+    from resume_generator.validation import ValidationCache
 
     try:
-        # Validate and parse resume sections
-        application_info = ApplicationInfo.model_validate(
-            resume_data["ApplicationInfo"]
-        )
-        general = General.model_validate(resume_data["General"])
-        jobs = [
-            Jobs.model_validate(job_data) for job_data in resume_data["Jobs"].values()
-        ]
-        schools = [
-            Education.model_validate(edu_data)
-            for edu_data in resume_data["Education"].values()
-        ]
-        certifications = [
-            LicensesAndCertifications.model_validate(cert_data)
-            for cert_data in resume_data["LicensesAndCertifications"].values()
-        ]
-        volunteer_experiences = [
-            VolunteerExperience.model_validate(exp_data)
-            for exp_data in resume_data["VolunteerExperience"].values()
-        ]
-        projects = [
-            Projects.model_validate(proj_data)
-            for proj_data in resume_data["Projects"].values()
-        ]
-        awards = [
-            HonorsAndAwards.model_validate(award_data)
-            for award_data in resume_data["HonorsAndAwards"].values()
-        ]
-        languages = [
-            Languages.model_validate(lang_data)
-            for lang_data in resume_data["Languages"].values()
-        ]
-        articles = [
-            Articles.model_validate(article_data)
-            for article_data in resume_data["Articles"].values()
-        ]
-
-        return (
-            application_info,
-            general,
-            jobs,
-            schools,
-            certifications,
-            volunteer_experiences,
-            projects,
-            awards,
-            languages,
-            articles,
-        )
+        missing = [key for key, _, _ in RESUME_SECTIONS if key not in resume_data]
+        if missing:
+            raise KeyError(missing[0])
+        if cache is None and not defer_excluded:
+            return document_sections(RESUME_ADAPTER.validate_python(resume_data))
+        return (cache or ValidationCache(max_entries=0)).validate(resume_data, defer_excluded)
     except KeyError as e:
         raise ValueError(f"Missing required section in resume.json: {str(e)}")
+    except ValidationError as e:
+        raise ValueError(f"Error validating resume data: {str(first_entry_error(e, resume_data))}")
     except Exception as e:
         raise ValueError(f"Error validating resume data: {str(e)}")
 
 
-def setup_pdf(config):
+def get_build_date(config):
+    """Return the date of the build.
+
+    In deterministic mode (`deterministic_output` in the config), the date is
+    read from the `SOURCE_DATE_EPOCH` environment variable when it is set, so
+    that the file name and the PDF do not depend on when the build ran.
+
+    Args:
+        config (dict): Configuration dictionary.
+
+    Returns:
+        datetime: The build date, or None in deterministic mode without
+            `SOURCE_DATE_EPOCH`, in which case no creation date is embedded.
+    """
+    if not config.get("deterministic_output"):
+        return datetime.now(timezone.utc)
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch is None:
+        return None
+    return datetime.fromtimestamp(int(epoch), timezone.utc)
+
+
+@traced
+def get_fallback_fonts(template_config, font_cache, resume_data=None, coverage=None, sections=None):
+    """Select the fallback fonts for the characters the template fonts lack.
+
+    Only the text of the sections that are drawn is checked.
+
+    Args:
+        template_config (dict): Template configuration settings.
+        font_cache (FontCache): Cache holding the font coverage index.
+        resume_data (tuple, optional): Validated resume data sections. Without
+            it, the template's emoji font is used as the only fallback.
+        coverage (CoverageIndex, optional): Coverage index already loaded, for
+            callers selecting fonts for many resumes.
+        sections (list, optional): Enabled section names, from `sections` in
+            the config. Defaults to the registry's default sections.
+
+    Returns:
+        list: Fallback font families.
+
+    Raises:
+        ValueError: If no bundled font can draw some of the characters.
+    """
+    fonts = template_config["fonts"]
+    fallback_fonts = [fonts["emoji"]] if "emoji" in fonts else []
+    if resume_data is None:
+        return fallback_fonts
+    # Imported here since the coverage index depends on the resume models
+    from resume_generator.font_coverage import CoverageIndex
+    from resume_generator.font_coverage import select_fallback_fonts
+
+    base_fonts = [font for name, font in fonts.items() if name != "emoji"]
+    if coverage is None:
+        coverage = CoverageIndex.load(DEFAULT_FONTS_DIR, font_cache)
+    drawn = drawn_sections(resume_data, sections)
+    return select_fallback_fonts(drawn, base_fonts, fallback_fonts, coverage)
+
+
+@traced
+def setup_pdf(config, resume_data=None, font_cache=None, fallback_fonts=None, fragment_cache=None):
     """Initialize PDF with configuration settings.
 
+    When resume data is given, its text is checked against the font coverage
+    index, and the smallest set of bundled fonts covering the characters that
+    the template fonts lack is used as fallback.
+
+    With `optimize_size` in the config, the document's output is optimized
+    for size (see `resume_generator.optimize`).
+
     Args:
         config (dict): Configuration dictionary containing PDF settings.
+        resume_data (tuple, optional): Validated resume data sections.
+        font_cache (FontCache, optional): Font cache to reuse across documents.
+        fallback_fonts (list, optional): Fallback fonts already selected for the
+            resume data, which skips the coverage check.
+        fragment_cache (FragmentCache, optional): Fragment cache to reuse across
+            documents. Defaults to the one selected by `fragment_cache` in the config.
 
     Returns:
-        tuple: (FPDF object, template configuration dictionary).
+        tuple: (ResumePDF object, template configuration dictionary).
 
     Raises:
         FileNotFoundError: If required font files are not found.
         ValueError: If required configuration is missing.
-        RuntimeError: If PDF setup fails.
+        RuntimeError: If PDF setup fails, or no bundled font can draw some characters.
     """
     try:
         template_config = config["templates"][config["template"]]
-        pdf = FPDF(format=template_config["pdf_format"])
+        fonts = template_config["fonts"]
+
+        # Fonts are registered lazily by ResumePDF: only the families that the
+        # styles select, plus the fallback fonts once some text needs them
+        font_files = {
+            font_file: os.path.join(DEFAULT_FONTS_DIR, f"{font_file}.ttf")
+            for font_file in fonts.values()
+        }
+        if font_cache is None:
+            font_cache = FontCache(config.get("font_cache_directory", DEFAULT_CACHE_DIR))
+        if fallback_fonts is None:
+            fallback_fonts = get_fallback_fonts(
+                template_config, font_cache, resume_data, sections=config.get("sections")
+            )
+        # Imported here since it loads fpdf, fontTools and numpy, which the
+        # commands that render nothing do not need
+        from resume_generator.fragments import fragment_cache_from_config
+        from resume_generator.pdf import ResumePDF
+
+        if fragment_cache is None:
+            fragment_cache = fragment_cache_from_config(config)
+
+        pdf = ResumePDF(
+            font_files,
+            fallback_fonts,
+            font_cache,
+            fragment_cache=fragment_cache,
+            optimize_size=config.get("optimize_size", False),
+            inline_markup=config.get("inline_markup", False),
+            format=template_config["pdf_format"],
+        )
+        build_date = get_build_date(config)
+        if build_date is None:
+            pdf.creation_date = None
+        else:
+            pdf.set_creation_date(build_date)
         pdf.add_page()
 
-        # Add fonts
-        for font_name, font_file in template_config["fonts"].items():
-            font_path = f"fonts/{font_file}.ttf"
-            if not os.path.exists(font_path):
-                raise FileNotFoundError(f"Font file not found: {font_path}")
-            pdf.add_font(font_file, "", font_path)
-
-        pdf.set_fallback_fonts(["TwitterEmojis"])
         pdf.set_font(
-            template_config["fonts"]["primary"],
+            fonts["primary"],
             size=template_config["font_size"]["normal"],
         )
 
@@ -193,7 +292,218 @@ def ensure_output_directory(config, application_info):
         raise RuntimeError(f"Error creating output directory: {str(e)}")
 
 
-def main():
+@traced
+def add_sections(pdf, template_config, resume_data, styles, sections=None):
+    """Add every enabled resume section to the PDF.
+
+    Args:
+        pdf (ResumePDF): The PDF document object.
+        template_config (dict): Template configuration settings.
+        resume_data (tuple): Validated resume data sections.
+        styles (dict): Style definitions for the sections.
+        sections (list, optional): Enabled section names in drawing order, from
+            `sections` in the config. Defaults to the registry's default sections.
+
+    Raises:
+        ValueError: If a section name is unknown.
+    """
+    # Generate resume sections using section handlers, skipping empty ones
+    for section in build_sections(pdf, template_config, resume_data, styles, sections):
+        section.render()
+
+
+@traced
+def build_resume(
+    resume_data,
+    config,
+    styles=modern_styles,
+    font_cache=None,
+    fragment_cache=None,
+    fallback_fonts=None,
+    renderers=(),
+):
+    """Lay out a resume, without writing it.
+
+    With `max_pages` in the config, the resume is first fitted to the page
+    count (see `resume_generator.autofit`), and the document's `fit` records
+    the chosen scale.
+
+    Args:
+        resume_data (dict | tuple): Resume data parsed from JSON, or already
+            validated resume data sections.
+        config (dict): Configuration dictionary.
+        styles (dict): Style definitions for the sections.
+        font_cache (FontCache, optional): Font cache to reuse across documents.
+        fragment_cache (FragmentCache, optional): Fragment cache to reuse across
+            documents. Defaults to the one selected by `fragment_cache` in the config.
+        fallback_fonts (list, optional): Fallback fonts already selected for the
+            resume data, e.g. by a snapshot.
+        renderers (iterable): Renderers of other formats fed with the draw
+            operations of the sections, e.g. from `create_renderers`.
+
+    Returns:
+        ResumePDF: The document, ready to be output.
+
+    Raises:
+        ValueError: If the resume data or required configuration is invalid, or
+            the resume does not fit in `max_pages` even at the minimum scale.
+        RuntimeError: If PDF setup fails.
+    """
+    if isinstance(resume_data, dict):
+        resume_data = validate_resume_data(resume_data)
+    fit = None
+    if config.get("max_pages"):
+        # Imported here since autofit lays out resumes with this module
+        from resume_generator.autofit import fit_to_pages
+        from resume_generator.fragments import MemoryFragmentCache
+        from resume_generator.fragments import fragment_cache_from_config
+
+        # The caches carry the fonts and the last measured layout over to the render
+        if font_cache is None:
+            font_cache = FontCache(config.get("font_cache_directory", DEFAULT_CACHE_DIR))
+        if fragment_cache is None:
+            fragment_cache = fragment_cache_from_config(config) or MemoryFragmentCache()
+        fit = fit_to_pages(
+            config,
+            resume_data,
+            config["max_pages"],
+            styles,
+            font_cache=font_cache,
+            fragment_cache=fragment_cache,
+        )
+        config = fit.config
+    pdf, template_config = setup_pdf(
+        config,
+        resume_data,
+        font_cache=font_cache,
+        fallback_fonts=fallback_fonts,
+        fragment_cache=fragment_cache,
+    )
+    pdf.fit = fit
+    pdf.renderers.extend(renderers)
+    add_sections(pdf, template_config, resume_data, styles, config.get("sections"))
+    return pdf
+
+
+@traced
+def render_resume(
+    resume_data,
+    config,
+    output=None,
+    styles=modern_styles,
+    font_cache=None,
+    fragment_cache=None,
+    fallback_fonts=None,
+):
+    """Render a resume in memory, without creating directories or output files.
+
+    Like `build_resume`, this fits the resume to `max_pages` if the config sets it.
+
+    Args:
+        resume_data (dict | tuple): Resume data parsed from JSON, or already
+            validated resume data sections.
+        config (dict): Configuration dictionary.
+        output (file, optional): Binary file-like object the PDF is written to.
+        styles (dict): Style definitions for the sections.
+        font_cache (FontCache, optional): Font cache to reuse across documents.
+        fragment_cache (FragmentCache, optional): Fragment cache to reuse across
+            documents. Defaults to the one selected by `fragment_cache` in the config.
+        fallback_fonts (list, optional): Fallback fonts already selected for the
+            resume data, e.g. by a snapshot.
+
+    Returns:
+        bytearray: The PDF, or None if it was written to `output`. This is
+            fpdf's own output buffer, which is not copied either way.
+
+    Raises:
+        ValueError: If the resume data or required configuration is invalid, or
+            the resume does not fit in `max_pages` even at the minimum scale.
+        RuntimeError: If PDF setup fails.
+    """
+    pdf = build_resume(resume_data, config, styles, font_cache, fragment_cache, fallback_fonts)
+    return pdf.output(output)
+
+
+def get_output_path(config, output_dir, general, application_info, record=""):
+    """Build the path of the generated PDF from the file name template.
+
+    In deterministic mode without `SOURCE_DATE_EPOCH`, `{date}` is still the
+    current date: it only affects the file name, not the PDF.
+
+    Args:
+        config (dict): Configuration dictionary containing output settings.
+        output_dir (str): Directory returned by `ensure_output_directory`.
+        general (General): General personal information.
+        application_info (ApplicationInfo): Application-specific information.
+        record (str, optional): Name of the record in a stream of resumes,
+            for `{record}` in the template.
+
+    Returns:
+        str: Path of the PDF file.
+    """
+    output_file = config["file_name_template"].format(
+        name=general.name,
+        company=application_info.company,
+        job=application_info.job,
+        date=(get_build_date(config) or datetime.now()).strftime("%Y-%m-%d"),
+        record=record,
+    )
+    return os.path.join(output_dir, output_file)
+
+
+def parse_args(argv=None):
+    """Parse the command-line arguments of `main`.
+
+    Args:
+        argv (list, optional): Command-line arguments. Defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Generate a customized PDF resume.")
+    parser.add_argument(
+        "--input", "-i", default="resume.json", help="Resume JSON file, or - to read stdin"
+    )
+    parser.add_argument("--config", "-c", default="config.yaml", help="Configuration file")
+    parser.add_argument("--template", "-t", help="Template to use (e.g., modern, minimal)")
+    parser.add_argument("--output-dir", "-o", help="Output directory for generated resumes")
+    parser.add_argument("--output", help="Write the PDF to this file, or - to stream it to stdout")
+    parser.add_argument(
+        "--max-pages", type=int, help="Scale fonts and spacing down to fit this many pages"
+    )
+    parser.add_argument(
+        "--optimize-size",
+        action="store_true",
+        help="Make the PDF as small as possible and report its size before and after",
+    )
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=sorted(RENDERERS),
+        help="Also write these versions of the resume next to the PDF",
+    )
+    parser.add_argument(
+        "--profile", help="Write a trace of the render stages to this file (Chrome trace format)"
+    )
+    parser.add_argument(
+        "--memory-report", help="Write the memory used by each render stage to this JSON file"
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=float,
+        help="Abort the render when it allocates more than this many MB",
+    )
+    args = parser.parse_args(argv)
+    if args.max_pages is not None and args.max_pages < 1:
+        parser.error("--max-pages must be at least 1")
+    if args.memory_budget is not None and args.memory_budget <= 0:
+        parser.error("--memory-budget must be positive")
+    if args.formats and args.output == "-":
+        parser.error("--formats needs an output file or directory, not stdout")
+    return args
+
+
+def main(argv=None):
     """Generate a customized PDF resume from JSON data and YAML configuration.
 
     This function orchestrates the entire resume generation process by:
@@ -203,69 +513,211 @@ def main():
     4. Adding each resume section to the PDF
     5. Saving the final PDF file
 
+    When a snapshot compiled from the same resume and configuration files
+    exists (`python -m resume_generator.main compile`), the validated data is
+    loaded from it instead of parsing and validating the files.
+
+    With `skip_unchanged` in the config, the build manifest is checked first
+    and nothing is rendered if the inputs did not change since the last build.
+
+    With `--input -` the resume JSON is read from stdin, and with `--output`
+    the PDF is written to that file (`-` streams it to stdout) instead of the
+    output directory layout, without the manifest.
+
+    With `--max-pages` (or `max_pages` in the config), font sizes and spacing
+    are scaled down until the resume fits, measuring the layout without
+    writing any PDF, and the resume is rendered once at the chosen scale.
+
+    With `--optimize-size` (or `optimize_size` in the config), the PDF is
+    rewritten to be as small as possible, and its size before and after is
+    printed.
+
+    With `--formats` (or `output_formats` in the config), plain-text and HTML
+    versions are rendered from the same section pass and written next to the
+    PDF, while the PDF is serialized.
+
+    With `--profile`, the stages of the run are traced (nested spans, cells
+    drawn, font switches, pages and bytes written) and saved in Chrome
+    trace-event format, even if the run fails.
+
+    With `--memory-report` or `--memory-budget`, the memory allocated by each
+    stage is measured with tracemalloc; the report is printed and saved as
+    JSON, and the render is aborted once it allocates more than the budget.
+
+    Args:
+        argv (list, optional): Command-line arguments. Defaults to sys.argv.
+
     Raises:
         Various exceptions with descriptive error messages if any step fails.
     """
+    args = parse_args(argv)
+    # Keep stdout for the PDF when it is streamed there
+    log = sys.stderr if args.output == "-" else sys.stdout
+    measure_memory = args.memory_report or args.memory_budget
+    if not (args.profile or measure_memory):
+        generate_resume(args, log)
+        return
+    if measure_memory:
+        # Import the validation and render stacks first, so that their module
+        # code is not counted as memory allocated by the stage importing them
+        import resume_generator.font_coverage  # noqa: F401
+        import resume_generator.pdf  # noqa: F401
+        from resume_generator.memory import MB
+        from resume_generator.memory import MemoryTracer
+
+        budget = int(args.memory_budget * MB) if args.memory_budget else None
+        tracer = start_tracing(MemoryTracer(budget, record_events=bool(args.profile)))
+    else:
+        tracer = start_tracing()
     try:
-        # Load configuration and resume data
-        config = load_config()
-        resume_data = load_resume_data()
-        (
-            application_info,
-            general,
-            jobs,
-            schools,
-            certifications,
-            volunteer_experiences,
-            projects,
-            awards,
-            languages,
-            articles,
-        ) = resume_data
-
-        # Setup PDF with configuration
-        pdf, template_config = setup_pdf(config)
-
-        # Create output directory
-        output_dir = ensure_output_directory(config, application_info)
+        with tracer.span("main"):
+            generate_resume(args, log)
+    finally:
+        stop_tracing()
+        if args.profile:
+            tracer.save(args.profile)
+            print(f"Profile written to {args.profile}", file=log)
+        if measure_memory:
+            tracer.finish()
+            print(tracer.format_report(), file=log)
+            if args.memory_report:
+                tracer.save_report(args.memory_report)
+                print(f"Memory report written to {args.memory_report}", file=log)
+
+
+def report_output_size(pdf, log):
+    """Print the size of an optimized PDF before and after optimization.
+
+    Args:
+        pdf (ResumePDF): A document that was output.
+        log (file): Stream the report is printed to.
+    """
+    if pdf.output_sizes is not None:
+        print(f"Optimized size: {pdf.output_sizes.describe()}", file=log)
 
-        # Get styles based on template
-        styles = modern_styles  # For now, we only have modern style
-
-        # Generate resume sections using section handlers
-        sections = [
-            GeneralSection(pdf, general, styles, template_config),
-            ProjectsSection(pdf, projects, styles, template_config),
-            ArticlesSection(pdf, articles, styles, template_config),
-            JobsSection(pdf, jobs, styles, template_config),
-            # EducationSection(pdf, schools, styles, template_config),
-            # CertificationsSection(pdf, certifications, styles, template_config),
-            # VolunteeringSection(pdf, volunteer_experiences, styles, template_config),
-            # AwardsSection(pdf, awards, styles, template_config),
-            # LanguagesSection(pdf, languages, styles, template_config),
-        ]
-
-        # Add each section to the PDF
-        for section in sections:
-            section.add_section()
-
-        # Generate output filename
-        output_file = config["file_name_template"].format(
-            name=general.name,
-            company=application_info.company,
-            job=application_info.job,
-            date=datetime.now().strftime("%Y-%m-%d"),
-        )
-        output_path = os.path.join(output_dir, output_file)
 
-        # Save the PDF
-        pdf.output(output_path)
+def report_other_formats(paths, log):
+    """Print the paths of the formats written next to the PDF.
+
+    Args:
+        paths (list): Paths of the other formats.
+        log (file): Stream the paths are printed to.
+    """
+    for path in paths:
+        print(f"Also written: {path}", file=log)
+
+
+def generate_resume(args, log):
+    """Generate the resume described by the command-line arguments of `main`.
+
+    Args:
+        args (argparse.Namespace): Arguments parsed by `parse_args`.
+        log (file): Stream the progress messages are printed to.
+
+    Raises:
+        Various exceptions with descriptive error messages if any step fails.
+    """
+    try:
+        # Load configuration and resume data, from their compiled snapshot
+        # if it is up to date
+        snapshot = None
+        if args.input != "-":
+            from resume_generator.snapshot import load_snapshot
+
+            snapshot = load_snapshot(args.input, args.config)
+        config = snapshot.config if snapshot else load_config(args.config)
+        if args.template:
+            config["template"] = args.template
+        if args.output_dir:
+            config["output_directory"] = args.output_dir
+        defer = config.get("defer_excluded_validation", False)
+        if snapshot:
+            resume_data = snapshot.resume_data
+        elif args.input == "-":
+            try:
+                resume_data = validate_resume_data(json.load(sys.stdin), defer_excluded=defer)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on stdin: {str(e)}")
+        else:
+            resume_data = load_resume_data(args.input, defer_excluded=defer)
+        application_info, general = resume_data[:2]
+
+        # Get styles based on template; for now, we only have modern style
+        styles = snapshot.styles if snapshot else modern_styles
+        # The snapshot's fallback fonts were selected for its own template
+        fallback_fonts = snapshot.fallback_fonts if snapshot and not args.template else None
+
+        # The page limit and size optimization are part of the config, and of
+        # the manifest digest
+        if args.max_pages:
+            config["max_pages"] = args.max_pages
+        if args.optimize_size:
+            config["optimize_size"] = True
+        if args.formats:
+            config["output_formats"] = args.formats
+        renderers = create_renderers(config.get("output_formats", []))
+        if renderers and args.output == "-":
+            raise ValueError("Output formats other than PDF cannot be streamed to stdout")
+
+        # Skip the build if the inputs did not change since the last one
+        manifest = None
+        if config.get("skip_unchanged") and not args.output:
+            from resume_generator.manifest import BuildManifest
+            from resume_generator.manifest import InputDigest
+            from resume_generator.manifest import manifest_path
+
+            manifest = BuildManifest.load(manifest_path(config))
+            digest = InputDigest(config, resume_data, styles).for_target(application_info)
+            up_to_date = manifest.lookup(digest)
+            if up_to_date:
+                print(f"Resume is up to date: {up_to_date}")
+                return
+
+        document = build_resume(
+            resume_data,
+            config,
+            styles,
+            fallback_fonts=fallback_fonts,
+            renderers=renderers.values(),
+        )
+        if document.fit is not None:
+            fit = document.fit
+            print(f"Fitted to {fit.pages} page(s) at scale {fit.scale:.2f}", file=log)
+        if args.output == "-":
+            document.output(sys.stdout.buffer)
+            sys.stdout.buffer.flush()
+            report_output_size(document, log)
+            return
+        if args.output:
+            paths = write_outputs(document, renderers, args.output)
+            print(f"Resume generated successfully: {args.output}", file=log)
+            report_other_formats(paths[1:], log)
+            report_output_size(document, log)
+            return
+
+        # Create output directory and save the PDF, and the other formats next to it
+        output_dir = ensure_output_directory(config, application_info)
+        output_path = get_output_path(config, output_dir, general, application_info)
+        paths = write_outputs(document, renderers, output_path)
+        if manifest is not None:
+            manifest.record(digest, application_info, paths)
+            manifest.save()
         print(f"Resume generated successfully: {output_path}")
+        report_other_formats(paths[1:], log)
+        report_output_size(document, log)
 
     except Exception as e:
-        print(f"Error generating resume: {str(e)}")
+        print(f"Error generating resume: {str(e)}", file=log)
         raise
 
 
 if __name__ == "__main__":
+    if "--watch" in sys.argv[1:]:
+        from resume_generator.watch import main as watch_main
+
+        sys.exit(watch_main([arg for arg in sys.argv[1:] if arg != "--watch"]))
+    if sys.argv[1:2] == ["compile"]:
+        from resume_generator.snapshot import main as compile_main
+
+        sys.exit(compile_main(sys.argv[2:]))
     main()
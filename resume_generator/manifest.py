@@ -0,0 +1,197 @@
+"""Content-addressed build manifest used to skip unchanged resumes.
+
+Every render is identified by a digest of all its inputs: the validated resume
+data (including the target's application info), the configuration, the styles,
+the font library and the rendering code. The manifest maps each digest to the
+files it produced (the PDF and its other formats) with their SHA-256, so a
+target whose inputs did not change since the last build, and whose files are
+still in place and unmodified, is skipped without rendering anything.
+
+The manifest is a JSON file stored next to the output directory, e.g.
+`generated_applications.manifest.json` (configurable with `manifest_file`).
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from resume_generator.font_cache import DEFAULT_FONTS_DIR
+from resume_generator.font_cache import fpdf_version
+from resume_generator.font_coverage import CoverageIndex
+from resume_generator.fragments import renderer_version
+from resume_generator.validation import model_to_json
+
+MANIFEST_FORMAT_VERSION = 2
+
+
+def _code_version() -> str:
+    """Hash the rendering code, including the section list, the styles and the other formats."""
+    package_dir = Path(__file__).parent
+    digest = hashlib.sha256(renderer_version().encode("utf-8"))
+    modules = [package_dir / "main.py", package_dir / "renderers.py"]
+    for path in sorted([*modules, *(package_dir / "styles").glob("*.py")]):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def manifest_path(config: dict) -> str:
+    """Return the location of the build manifest.
+
+    Args:
+        config (dict): Configuration dictionary.
+
+    Returns:
+        str: `manifest_file` if configured, otherwise a file named after the
+            output directory, next to it.
+    """
+    if config.get("manifest_file"):
+        return config["manifest_file"]
+    output_dir = os.path.normpath(config["output_directory"])
+    return f"{output_dir}.manifest.json"
+
+
+class InputDigest:
+    """Hashes the inputs of renders that only differ by their target.
+
+    The inputs shared by every target are hashed once, so the digest of each
+    target only costs hashing its application info.
+    """
+
+    def __init__(self, config: dict, resume_data: tuple, styles: dict, fonts_dir=DEFAULT_FONTS_DIR):
+        """Hash the shared inputs.
+
+        Args:
+            config (dict): Configuration dictionary.
+            resume_data (tuple): Validated resume data sections.
+            styles (dict): Style definitions for the sections.
+            fonts_dir: Directory of the font library.
+        """
+        shared = [
+            MANIFEST_FORMAT_VERSION,
+            fpdf_version(),
+            _code_version(),
+            CoverageIndex.library_key(fonts_dir),
+            os.environ.get("SOURCE_DATE_EPOCH"),
+            config,
+            styles,
+            list(resume_data[1:]),
+        ]
+        self._shared = hashlib.sha256(self._dumps(shared))
+
+    @staticmethod
+    def _dumps(value) -> bytes:
+        payload = json.dumps(value, default=model_to_json, sort_keys=True, separators=(",", ":"))
+        return payload.encode("utf-8")
+
+    def for_target(self, application_info) -> str:
+        """Return the digest of the inputs of one target.
+
+        Args:
+            application_info (ApplicationInfo): Company and job of the target.
+
+        Returns:
+            str: Hex digest of every input of the render.
+        """
+        digest = self._shared.copy()
+        digest.update(self._dumps(application_info))
+        return digest.hexdigest()
+
+
+def file_sha256(path) -> str:
+    """Hash the content of a file.
+
+    Args:
+        path: Path of the file.
+
+    Returns:
+        str: Hex SHA-256 digest of the file.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+class BuildManifest:
+    """Mapping of input digests to the files they produced."""
+
+    def __init__(self, path, entries: dict | None = None):
+        """Initialize the manifest.
+
+        Args:
+            path: File the manifest is saved to.
+            entries (dict, optional): Digest to output entry mapping.
+        """
+        self.path = Path(path)
+        self.entries = entries or {}
+        self._targets = {tuple(entry["target"]): key for key, entry in self.entries.items()}
+
+    @classmethod
+    def load(cls, path) -> "BuildManifest":
+        """Load a manifest, starting an empty one if it is missing or unreadable.
+
+        Args:
+            path: Manifest file.
+
+        Returns:
+            BuildManifest: The manifest.
+        """
+        try:
+            data = json.loads(Path(path).read_text())
+            if data.get("version") == MANIFEST_FORMAT_VERSION:
+                return cls(path, data["entries"])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            pass
+        return cls(path)
+
+    def lookup(self, digest: str) -> str | None:
+        """Return the output of a digest if all its files are still in place.
+
+        Args:
+            digest (str): Input digest of the render.
+
+        Returns:
+            str | None: Path of the up-to-date PDF, or None if it must be rendered
+                because a file it produced is missing or was modified.
+        """
+        entry = self.entries.get(digest)
+        if entry is None:
+            return None
+        try:
+            for path, sha256 in entry["files"].items():
+                if file_sha256(path) != sha256:
+                    return None
+        except OSError:
+            return None
+        return entry["output"]
+
+    def record(self, digest: str, application_info, output_paths: list) -> None:
+        """Record the files produced for a digest, replacing older builds of the target.
+
+        Args:
+            digest (str): Input digest of the render.
+            application_info (ApplicationInfo): Company and job of the target.
+            output_paths (list): Paths of the files written, the PDF first, as
+                returned by `write_outputs`.
+        """
+        target = (application_info.company, application_info.job)
+        self.entries.pop(self._targets.get(target), None)
+        self._targets[target] = digest
+        self.entries[digest] = {
+            "target": list(target),
+            "output": output_paths[0],
+            "files": {path: file_sha256(path) for path in output_paths},
+        }
+
+    def save(self) -> None:
+        """Atomically write the manifest."""
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        data = {"version": MANIFEST_FORMAT_VERSION, "entries": self.entries}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(data, indent=1, sort_keys=True))
+            os.replace(tmp_path, self.path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
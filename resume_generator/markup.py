@@ -0,0 +1,80 @@
+"""Inline markup of resume descriptions.
+
+With `inline_markup` in the config, descriptions may mark text as bold with
+`**double asterisks**` and add links with `[label](https://example.com)`.
+Markers that are not closed are kept as plain text, and markup does not nest.
+Only http, https and mailto links are drawn; links with any other scheme, or
+none, are kept as plain text.
+"""
+
+import re
+from typing import NamedTuple
+from urllib.parse import urlsplit
+
+INLINE_MARKUP = re.compile(
+    r"\*\*(?P<bold>.+?)\*\*|\[(?P<label>[^\[\]]+)\]\((?P<url>[^()\s]+)\)", re.S
+)
+LINK_SCHEMES = ("http", "https", "mailto")
+
+
+class InlineRun(NamedTuple):
+    """A run of text drawn with the same weight and link."""
+
+    text: str
+    bold: bool = False
+    link: str | None = None
+
+
+def is_allowed_link(url: str) -> bool:
+    """Return whether a link of the markup may be drawn.
+
+    Args:
+        url (str): Target of a `[label](url)` link.
+
+    Returns:
+        bool: True if the URL is well formed and its scheme is in LINK_SCHEMES.
+    """
+    try:
+        return urlsplit(url).scheme.lower() in LINK_SCHEMES
+    except ValueError:
+        return False
+
+
+def parse_inline(text: str) -> tuple:
+    """Split text into runs of plain, bold and linked text.
+
+    Args:
+        text (str): Text with inline markup.
+
+    Returns:
+        tuple: InlineRun entries, in order, without empty runs.
+    """
+    runs = []
+    position = 0
+    for match in INLINE_MARKUP.finditer(text):
+        if match.group("bold") is not None:
+            run = InlineRun(match.group("bold"), bold=True)
+        elif is_allowed_link(match.group("url")):
+            run = InlineRun(match.group("label"), link=match.group("url"))
+        else:
+            # Kept as plain text, with the text before it
+            continue
+        if match.start() > position:
+            runs.append(InlineRun(text[position : match.start()]))
+        runs.append(run)
+        position = match.end()
+    if position < len(text):
+        runs.append(InlineRun(text[position:]))
+    return tuple(runs)
+
+
+def has_markup(runs: tuple) -> bool:
+    """Return whether parsed runs contain bold or linked text.
+
+    Args:
+        runs (tuple): InlineRun entries returned by `parse_inline`.
+
+    Returns:
+        bool: True unless the runs are plain text.
+    """
+    return any(run.bold or run.link for run in runs)
@@ -0,0 +1,266 @@
+"""Vectorized glyph-width measurement and line breaking.
+
+fpdf measures text one character at a time, and its line breaker re-measures the
+whole current line for every character it adds. This module keeps each font's
+advance widths in a NumPy array instead, so a string or a sequence of words is
+measured with a single gather-and-sum and line breaks are found from a prefix
+sum. Results are memoized by font, size and text in bounded LRU caches; fonts
+are identified by the size and modification time of their file, so results are
+not reused once a font file is replaced.
+
+Widths are computed with the same floating-point expressions as fpdf, so the
+line breaks and the rendered output are identical to `FPDF.multi_cell`.
+"""
+
+import os
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+from fpdf.fonts import TTFFont
+from fpdf.line_break import BREAKING_SPACE_SYMBOLS
+from fpdf.line_break import FORM_FEED
+from fpdf.line_break import NBSP
+from fpdf.line_break import SOFT_HYPHEN
+
+# Code points below this bound are looked up in a dense table; others are rare
+# enough to be resolved one by one
+DENSE_TABLE_SIZE = 0x10000
+
+NEWLINE = ord("\n")
+SPACE = ord(" ")
+
+# Characters for which fpdf's line breaker has special rules (breaking spaces
+# other than " ", NBSP, soft hyphen, form feed); text containing them is left to fpdf
+UNSUPPORTED_CHARACTERS = frozenset(BREAKING_SPACE_SYMBOLS + [NBSP, SOFT_HYPHEN, FORM_FEED]) - {" "}
+
+
+class WrappedLine(NamedTuple):
+    """A line produced by `TextMeasurer.wrap`, as a slice of the wrapped text."""
+
+    start: int
+    end: int
+    width: float
+    number_of_spaces: int
+    justified: bool
+    trailing_nl: bool
+    has_fragment: bool
+
+
+class FontWidths:
+    """Advance widths of a font, indexed by code point."""
+
+    __slots__ = ("dense", "sparse", "default")
+
+    def __init__(self, font: TTFFont):
+        """Build the width tables of a font.
+
+        Args:
+            font (TTFFont): An fpdf TrueType font.
+        """
+        self.default = font.cw.default_factory()
+        self.dense = np.full(DENSE_TABLE_SIZE, self.default, dtype=np.int64)
+        self.sparse = {}
+        for codepoint, width in font.cw.items():
+            if codepoint < DENSE_TABLE_SIZE:
+                self.dense[codepoint] = width
+            else:
+                self.sparse[codepoint] = width
+
+    def gather(self, codes: np.ndarray) -> np.ndarray:
+        """Return the advance width of each code point.
+
+        Args:
+            codes (np.ndarray): Code points.
+
+        Returns:
+            np.ndarray: Widths in 1/1000 em, as int64.
+        """
+        widths = self.dense[np.minimum(codes, DENSE_TABLE_SIZE - 1)]
+        for index in np.flatnonzero(codes >= DENSE_TABLE_SIZE):
+            widths[index] = self.sparse.get(int(codes[index]), self.default)
+        return widths
+
+
+def _codes(text: str) -> np.ndarray:
+    """Return the code points of a string as an array."""
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+
+class TextMeasurer:
+    """Measurement engine holding per-font width tables and memo caches."""
+
+    def __init__(self, cache_size: int = 4096):
+        """Initialize the measurement engine.
+
+        Args:
+            cache_size (int): Maximum number of memoized results per operation.
+        """
+        self._fonts: dict[tuple, FontWidths] = {}
+        self.text_units = lru_cache(maxsize=cache_size)(self._text_units)
+        self._wrap = lru_cache(maxsize=cache_size)(self._wrap_uncached)
+
+    def font_key(self, font: TTFFont) -> tuple:
+        """Return the key of a font's width tables, building them on first use.
+
+        Tables are keyed by font file, its size and modification time, and font
+        key, so they are shared by every document that registers the same font,
+        and the memoized results of a replaced font file are not reused.
+
+        Args:
+            font (TTFFont): An fpdf TrueType font.
+
+        Returns:
+            tuple: (path, size, mtime_ns, fpdf font key).
+        """
+        path = str(font.ttffile)
+        stat = os.stat(path)
+        key = (path, stat.st_size, stat.st_mtime_ns, font.fontkey)
+        if key not in self._fonts:
+            # Drop the tables of earlier versions of the file
+            stale = [other for other in self._fonts if (other[0], other[3]) == (path, font.fontkey)]
+            for other in stale:
+                del self._fonts[other]
+            self._fonts[key] = FontWidths(font)
+        return key
+
+    def font_widths(self, font: TTFFont) -> FontWidths:
+        """Return the width tables of a font, building them on first use.
+
+        Args:
+            font (TTFFont): An fpdf TrueType font.
+
+        Returns:
+            FontWidths: The width tables.
+        """
+        return self._fonts[self.font_key(font)]
+
+    def _text_units(self, font_key: tuple, text: str) -> int:
+        """Return the width of a string in 1/1000 em (memoized)."""
+        return int(self._fonts[font_key].gather(_codes(text)).sum())
+
+    def text_width(self, font: TTFFont, size_pt: float, text: str) -> float:
+        """Return the width of a string in points.
+
+        Args:
+            font (TTFFont): An fpdf TrueType font.
+            size_pt (float): Font size in points.
+            text (str): Text to measure.
+
+        Returns:
+            float: The width, as computed by `TTFFont.get_text_width`.
+        """
+        return self.text_units(self.font_key(font), text) * size_pt * 0.001
+
+    def text_widths(self, font: TTFFont, size_pt: float, texts) -> list:
+        """Return the widths of several strings with one gather-and-sum.
+
+        Args:
+            font (TTFFont): An fpdf TrueType font.
+            size_pt (float): Font size in points.
+            texts (sequence): Strings to measure, e.g. the words of a paragraph.
+
+        Returns:
+            list: The width of each string in points.
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+        widths = np.zeros(len(texts), dtype=np.int64)
+        non_empty = lengths > 0
+        if non_empty.any():
+            glyphs = self.font_widths(font).gather(_codes("".join(texts)))
+            offsets: np.ndarray = np.concatenate(([0], np.cumsum(lengths)[:-1]))[non_empty]
+            widths[non_empty] = np.add.reduceat(glyphs, offsets)
+        return [int(units) * size_pt * 0.001 for units in widths]
+
+    def wrap(self, font: TTFFont, size_pt: float, k: float, text: str, max_width: float):
+        """Break text into lines the same way `FPDF.multi_cell` does in WORD mode.
+
+        Args:
+            font (TTFFont): An fpdf TrueType font.
+            size_pt (float): Font size in points.
+            k (float): Scale factor of the document unit.
+            text (str): Text to wrap.
+            max_width (float): Usable line width in document units.
+
+        Returns:
+            tuple: WrappedLine entries, or None if the text needs fpdf's own line
+                breaker (special spaces and hyphens, a character wider than the
+                line, or a last line whose characters have no width).
+        """
+        if not text or not UNSUPPORTED_CHARACTERS.isdisjoint(text):
+            return None
+        return self._wrap(self.font_key(font), size_pt, k, text, max_width)
+
+    def _wrap_uncached(self, font_key, size_pt, k, text, max_width):
+        """Compute line breaks from prefix sums of the glyph widths (memoized)."""
+        codes = _codes(text)
+        glyphs = self._fonts[font_key].gather(codes)
+        prefix = np.concatenate(([0], np.cumsum(glyphs)))
+        char_widths = (glyphs * size_pt * 0.001) / k
+        is_newline = codes == NEWLINE
+        is_space = codes == SPACE
+        spaces_before = np.concatenate(([0], np.cumsum(is_space)))
+
+        def line(start, end, justified=False, trailing_nl=False):
+            return WrappedLine(
+                start,
+                end,
+                (int(prefix[end] - prefix[start]) * size_pt * 0.001) / k,
+                int(spaces_before[end] - spaces_before[start]),
+                justified,
+                trailing_nl,
+                # fpdf only creates a fragment once a character is added
+                end > start or not trailing_nl,
+            )
+
+        # Beyond this many width units, a line certainly overflows
+        overflow_units = max_width * k / (size_pt * 0.001) * (1 + 1e-9) + 1
+        count = len(codes)
+        lines = []
+        start = 0
+        while start < count:
+            stop = int(np.searchsorted(prefix, prefix[start] + overflow_units, side="right"))
+            stop = min(max(stop, start + 1), count)
+            line_widths = ((prefix[start:stop] - prefix[start]) * size_pt * 0.001) / k
+            breaks = is_newline[start:stop] | (line_widths + char_widths[start:stop] > max_width)
+            if not breaks.any():
+                if stop < count:
+                    # The bound was not reached yet: widen the window
+                    overflow_units *= 2
+                    continue
+                if prefix[count] == prefix[start]:
+                    # fpdf drops a last line whose characters have no width,
+                    # e.g. a lone combining accent; its line breaker deals with it
+                    return None
+                lines.append(line(start, count))
+                break
+
+            index = start + int(np.argmax(breaks))
+            if is_newline[index]:
+                lines.append(line(start, index, trailing_nl=True))
+                start = index + 1
+                continue
+            if index == start:
+                # Not even one character fits; fpdf's own line breaker deals with it
+                return None
+            if is_space[index]:
+                # A space that overflows the line is dropped
+                lines.append(line(start, index, justified=True))
+                start = index + 1
+                continue
+            line_spaces = np.flatnonzero(is_space[start:index])
+            if len(line_spaces):
+                # Break at the last space of the line, which is dropped
+                end = start + int(line_spaces[-1])
+                lines.append(line(start, end, justified=True))
+                start = end + 1
+            else:
+                lines.append(line(start, index))
+                start = index
+        return tuple(lines)
+
+
+DEFAULT_MEASURER = TextMeasurer()
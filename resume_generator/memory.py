@@ -0,0 +1,181 @@
+"""Memory accounting of renders with tracemalloc, and a peak-memory budget.
+
+`MemoryTracer` is a profiling tracer that also measures the Python heap
+around every span: the stages of `main`, each section, and the cells they
+draw. For each span name it keeps the number of calls, the peak growth of
+the heap above its size when the span started, and the memory the span left
+allocated when it ended. When the run finishes, a tracemalloc snapshot
+attributes the memory still allocated to the packages that allocated it
+(pydantic models, fontTools and fpdf font buffers, fpdf pages, ...).
+
+With a budget, a span ending after the heap grew beyond it since the render
+started aborts the render with MemoryBudgetExceeded. Spans end often (every
+cell is one), so the render stops close to where the budget was crossed.
+
+tracemalloc only sees memory allocated by Python, and slows rendering down
+several times, so memory accounting is opt-in.
+"""
+
+import json
+import os
+import tracemalloc
+from contextlib import contextmanager
+
+from resume_generator.profiling import Tracer
+
+MB = 1024 * 1024
+# Packages listed in the retained memory breakdown
+TOP_PACKAGES = 10
+
+
+class MemoryBudgetExceeded(RuntimeError):
+    """Raised when the heap grows beyond the memory budget of a render."""
+
+
+def _package(filename: str) -> str:
+    """Return the package a source file belongs to, for the retained memory breakdown."""
+    if filename.startswith("<frozen importlib"):
+        return "module code"
+    parts = filename.replace(os.sep, "/").split("/")
+    for marker in ("site-packages", "dist-packages"):
+        if marker in parts[:-1]:
+            return parts[parts.index(marker) + 1].removesuffix(".py")
+    if "resume_generator" in parts[:-1]:
+        return "resume_generator"
+    return "python"
+
+
+class MemoryTracer(Tracer):
+    """Tracer recording heap peaks and retained memory of each span."""
+
+    def __init__(self, budget: int | None = None, record_events: bool = False):
+        """Start tracing Python memory allocations.
+
+        Args:
+            budget (int, optional): Heap growth in bytes that aborts the render
+                when a span reaches it.
+            record_events (bool): Also record the trace events of `Tracer`;
+                they are allocated on the traced heap, so they are off unless
+                the trace is saved.
+        """
+        super().__init__()
+        self.budget = budget
+        self.record_events = record_events
+        self.spans: dict[str, dict] = {}
+        self.peak = 0
+        self.retained_by_package: dict[str, int] = {}
+        self._stack: list[list[int]] = []
+        self._started = not tracemalloc.is_tracing()
+        if self._started:
+            tracemalloc.start()
+        self._baseline = tracemalloc.get_traced_memory()[0]
+
+    @contextmanager
+    def span(self, name: str, **args):
+        """Record the block as a span, with its heap peak and retained memory.
+
+        Args:
+            name (str): Span name.
+            **args: Values shown with the span.
+
+        Raises:
+            MemoryBudgetExceeded: If the heap peaked above the budget.
+        """
+        start, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+        # The peak is reset for this span; the enclosing ones took it into account
+        tracemalloc.reset_peak()
+        frame = [start, start]
+        self._stack.append(frame)
+        try:
+            if self.record_events:
+                with super().span(name, **args):
+                    yield
+            else:
+                yield
+        finally:
+            end, peak = tracemalloc.get_traced_memory()
+            frame[1] = max(frame[1], peak)
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][1] = max(self._stack[-1][1], frame[1])
+            self.peak = max(self.peak, frame[1] - self._baseline)
+            stats = self.spans.setdefault(name, {"calls": 0, "peak": 0, "retained": 0})
+            stats["calls"] += 1
+            stats["peak"] = max(stats["peak"], frame[1] - start)
+            stats["retained"] += end - start
+        if self.budget and frame[1] - self._baseline > self.budget:
+            raise MemoryBudgetExceeded(
+                f"Render exceeded its memory budget of {self.budget / MB:.1f} MB in {name} "
+                f"(heap peaked at {(frame[1] - self._baseline) / MB:.1f} MB)"
+            )
+
+    def finish(self) -> None:
+        """Attribute the memory still allocated to packages and stop tracing."""
+        snapshot = tracemalloc.take_snapshot()
+        retained: dict[str, int] = {}
+        for stat in snapshot.statistics("filename"):
+            package = _package(stat.traceback[0].filename)
+            retained[package] = retained.get(package, 0) + stat.size
+        ranked = sorted(retained.items(), key=lambda item: item[1], reverse=True)
+        self.retained_by_package = dict(ranked[:TOP_PACKAGES])
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+    def report(self) -> dict:
+        """Return the memory report.
+
+        Returns:
+            dict: Budget and overall peak in bytes, the calls, peak growth and
+                retained bytes of each span name in order of first use, and the
+                retained bytes of the packages allocating the most.
+        """
+        return {
+            "budget_bytes": self.budget,
+            "peak_bytes": self.peak,
+            "spans": [
+                {
+                    "name": name,
+                    "calls": stats["calls"],
+                    "peak_bytes": stats["peak"],
+                    "retained_bytes": stats["retained"],
+                }
+                for name, stats in self.spans.items()
+            ],
+            "retained_by_package": self.retained_by_package,
+        }
+
+    def save_report(self, path) -> None:
+        """Write the memory report to a JSON file.
+
+        Args:
+            path: Destination file.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.report(), file, indent=2)
+
+    def format_report(self) -> str:
+        """Return the memory report as a table.
+
+        Returns:
+            str: One line per span name, then the retained memory by package.
+        """
+        report = self.report()
+        budget = report["budget_bytes"]
+        lines = [
+            f"Heap peak: {report['peak_bytes'] / MB:.2f} MB"
+            + (f" (budget {budget / MB:.1f} MB)" if budget else ""),
+            f"{'Span':<40} {'Calls':>7} {'Peak MB':>10} {'Retained MB':>12}",
+        ]
+        for span in report["spans"]:
+            lines.append(
+                f"{span['name'][:40]:<40} {span['calls']:>7} "
+                f"{span['peak_bytes'] / MB:>10.2f} {span['retained_bytes'] / MB:>12.2f}"
+            )
+        if report["retained_by_package"]:
+            lines.append("Retained by package:")
+            for package, size in report["retained_by_package"].items():
+                lines.append(f"  {size / MB:8.2f} MB  {package}")
+        return "\n".join(lines)
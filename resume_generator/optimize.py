@@ -0,0 +1,377 @@
+"""Size-optimized rewriting of the PDFs written by fpdf.
+
+fpdf embeds font subsets with their hinting programs and full name tables,
+leaves the ToUnicode maps uncompressed, writes every object on its own with a
+plain cross-reference table, and embeds every registered font, even a
+fallback font that no text ended up using. `optimize_pdf` rewrites such a PDF:
+
+- objects that nothing refers to are dropped, which removes unused fonts;
+- embedded TrueType fonts are subset again without hinting, glyph names and
+  most of the name table, keeping their glyph IDs so that the CID maps of the
+  document stay valid;
+- every stream is compressed at the highest zlib level, except metadata;
+- identical objects are merged, except pages, which the page tree must list
+  once each;
+- the objects that are not streams are packed into a compressed object
+  stream, with a cross-reference stream (PDF 1.5).
+
+The page content, and so the rendering and the extractable text, are
+unchanged.
+"""
+
+import re
+import zlib
+from functools import lru_cache
+from io import BytesIO
+from typing import NamedTuple
+
+FLATE_LEVEL = 9
+OBJECT_STREAMS_VERSION = b"1.5"
+# Tables that PDF viewers do not read from an embedded TrueType font
+FONT_DROP_TABLES = ["DSIG", "LTSH", "PCLT", "VDMX", "gasp", "hdmx", "kern"]
+# Font programs subset again, kept across documents that draw the same glyphs
+FONT_CACHE_SIZE = 64
+
+_OBJECT_HEADER = re.compile(rb"(\d+) (\d+) obj\s*")
+_XREF_ENTRY = re.compile(rb"(\d{10}) (\d{5}) ([nf])")
+# Strings (with one level of nested parentheses) are matched too, so that
+# references are only looked for outside of them
+_REFERENCE = re.compile(
+    rb"\((?:\\.|[^\\()]|\((?:\\.|[^\\()])*\))*\)|<[0-9A-Fa-f\s]*>|\b(\d+) 0 R\b", re.S
+)
+_LENGTH = re.compile(rb"/Length\s+(\d+)\b")
+_LENGTH1 = re.compile(rb"/Length1\s+(\d+)\b")
+_FLATE = re.compile(rb"/Filter\s*/FlateDecode\b\s*")
+_FONT_FILE = re.compile(rb"/FontFile2\s+(\d+) 0 R")
+_PAGE = re.compile(rb"/Type\s*/Page(?![A-Za-z])")
+_TRAILER_ENTRIES = re.compile(rb"/(?:Root|Info)\s+\d+ 0 R|/ID\s*\[[^\]]*\]")
+
+
+class PDFObject(NamedTuple):
+    """An indirect object: its value, and its stream data if it is a stream."""
+
+    value: bytes
+    stream: bytes | None = None
+
+
+class OutputSizes(NamedTuple):
+    """Size of a PDF before and after optimization."""
+
+    before: int
+    after: int
+
+    def describe(self) -> str:
+        """Return the sizes and the saving.
+
+        Returns:
+            str: e.g. "24,291 -> 10,877 bytes (-55.2%)".
+        """
+        change = self.after / self.before - 1 if self.before else 0.0
+        return f"{self.before:,} -> {self.after:,} bytes ({change:+.1%})"
+
+
+def optimize_pdf(data: bytes) -> bytes:
+    """Rewrite a PDF written by fpdf to make it smaller.
+
+    Args:
+        data (bytes): The PDF.
+
+    Returns:
+        bytes: The optimized PDF.
+
+    Raises:
+        ValueError: If the PDF has no cross-reference table, is encrypted, or
+            cannot be parsed.
+    """
+    version, objects, trailer = parse_pdf(data)
+    objects = _reachable(objects, trailer)
+    font_files = {
+        int(number) for obj in objects.values() for number in _FONT_FILE.findall(obj.value)
+    }
+    objects = {
+        number: _compress(_subset_font(obj) if number in font_files else obj)
+        for number, obj in objects.items()
+    }
+    objects, trailer = _merge_duplicates(objects, trailer)
+    return _write_pdf(max(version, OBJECT_STREAMS_VERSION), objects, trailer)
+
+
+def parse_pdf(data: bytes) -> tuple:
+    """Split a PDF with a cross-reference table into its objects.
+
+    Args:
+        data (bytes): The PDF.
+
+    Returns:
+        tuple: (version, {object number: PDFObject}, trailer dictionary).
+
+    Raises:
+        ValueError: If the PDF has no cross-reference table, is encrypted, or
+            cannot be parsed.
+    """
+    if not data.startswith(b"%PDF-"):
+        raise ValueError("Not a PDF file")
+    version = data[5:8]
+    xref = data.rfind(b"\nxref\n")
+    trailer_start = data.find(b"trailer", xref)
+    if xref < 0 or trailer_start < 0:
+        raise ValueError("Only PDFs with a cross-reference table can be optimized")
+    trailer = data[trailer_start + len(b"trailer") : data.find(b"startxref", trailer_start)]
+    trailer = trailer.strip()
+    if b"/Encrypt" in trailer:
+        raise ValueError("Encrypted PDFs cannot be optimized")
+
+    lines = data[xref + len(b"\nxref\n") : trailer_start].split(b"\n")
+    objects = {}
+    index = 0
+    while index < len(lines) and lines[index].strip():
+        first, count = (int(field) for field in lines[index].split())
+        for number, line in enumerate(lines[index + 1 : index + 1 + count], start=first):
+            entry = _XREF_ENTRY.match(line)
+            if entry is None:
+                raise ValueError(f"Invalid cross-reference entry: {line!r}")
+            if entry.group(3) == b"n":
+                objects[number] = _parse_object(data, int(entry.group(1)), number)
+        index += 1 + count
+    return version, objects, trailer
+
+
+def _parse_object(data: bytes, offset: int, number: int) -> PDFObject:
+    """Parse the indirect object at an offset of the file."""
+    header = _OBJECT_HEADER.match(data, offset)
+    if header is None or int(header.group(1)) != number or header.group(2) != b"0":
+        raise ValueError(f"Object {number} is not at offset {offset}")
+    start = header.end()
+    end = _value_end(data, start)
+    value = data[start:end].rstrip()
+    if not data.startswith(b"stream", end):
+        return PDFObject(value)
+    length = _LENGTH.search(value)
+    if length is None:
+        raise ValueError(f"Object {number} has no direct stream length")
+    stream_start = end + len(b"stream")
+    stream_start += 2 if data.startswith(b"\r\n", stream_start) else 1
+    return PDFObject(value, data[stream_start : stream_start + int(length.group(1))])
+
+
+def _value_end(data: bytes, pos: int) -> int:
+    """Return where the value of an object starting at `pos` ends."""
+    depth = 0
+    while pos < len(data):
+        char = data[pos : pos + 1]
+        if char == b"(":
+            pos = _string_end(data, pos)
+        elif data.startswith(b"<<", pos) or data.startswith(b">>", pos):
+            depth += 1 if char == b"<" else -1
+            pos += 2
+        elif char == b"<":
+            pos = data.index(b">", pos) + 1
+        elif char in b"[]":
+            depth += 1 if char == b"[" else -1
+            pos += 1
+        elif depth == 0 and (data.startswith(b"endobj", pos) or data.startswith(b"stream", pos)):
+            return pos
+        else:
+            pos += 1
+    raise ValueError("Unterminated object")
+
+
+def _string_end(data: bytes, pos: int) -> int:
+    """Return the position after the literal string starting at `pos`."""
+    depth = 0
+    while pos < len(data):
+        char = data[pos]
+        if char == 0x5C:  # backslash
+            pos += 2
+            continue
+        if char == 0x28:  # (
+            depth += 1
+        elif char == 0x29:  # )
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        pos += 1
+    raise ValueError("Unterminated string")
+
+
+def _references(value: bytes) -> list:
+    """Return the object numbers a value refers to."""
+    return [int(number) for number in _REFERENCE.findall(value) if number]
+
+
+def _renumber(value: bytes, numbers: dict) -> bytes:
+    """Replace the references of a value according to a mapping of object numbers."""
+
+    def replace(match):
+        number = match.group(1)
+        if number is None or int(number) not in numbers:
+            return match.group(0)
+        return b"%d 0 R" % numbers[int(number)]
+
+    return _REFERENCE.sub(replace, value)
+
+
+def _reachable(objects: dict, trailer: bytes) -> dict:
+    """Drop the objects that the trailer does not lead to."""
+    reached = set()
+    pending = _references(trailer)
+    while pending:
+        number = pending.pop()
+        if number in reached or number not in objects:
+            continue
+        reached.add(number)
+        pending += _references(objects[number].value)
+    return {number: obj for number, obj in objects.items() if number in reached}
+
+
+def _subset_font(obj: PDFObject) -> PDFObject:
+    """Subset an embedded TrueType font again, leaving it uncompressed."""
+    value, program = obj
+    if program is None:
+        return obj
+    if _FLATE.search(value):
+        program = zlib.decompress(program)
+        value = _FLATE.sub(b"", value)
+    elif b"/Filter" in value:
+        return obj
+    program = _subset_program(program)
+    if _LENGTH1.search(value):
+        value = _LENGTH1.sub(b"/Length1 %d" % len(program), value)
+    return PDFObject(value, program)
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def _subset_program(program: bytes) -> bytes:
+    """Subset a TrueType font program without hinting or glyph names, keeping its glyph IDs."""
+    from fontTools import subset as ftsubset
+    from fontTools import ttLib
+
+    font = ttLib.TTFont(BytesIO(program), recalcTimestamp=False, fontNumber=0)
+    options = ftsubset.Options(
+        retain_gids=True,
+        notdef_outline=True,
+        hinting=False,
+        glyph_names=False,
+        name_IDs=[1, 2],
+        name_legacy=False,
+        name_languages=[0x0409],
+    )
+    options.drop_tables += FONT_DROP_TABLES
+    subsetter = ftsubset.Subsetter(options)
+    subsetter.populate(gids=range(len(font.getGlyphOrder())))
+    subsetter.subset(font)
+    output = BytesIO()
+    font.save(output)
+    font.close()
+    return output.getvalue()
+
+
+def _compress(obj: PDFObject) -> PDFObject:
+    """Compress a stream at the highest level, if that makes it smaller."""
+    value, stream = obj
+    # Metadata stays readable by tools that do not parse PDFs
+    if stream is None or b"/Type /Metadata" in value:
+        return obj
+    if _FLATE.search(value) and b"/DecodeParms" not in value:
+        data = zlib.decompress(stream)
+    elif b"/Filter" not in value:
+        data = stream
+    else:
+        return obj
+    compressed = zlib.compress(data, FLATE_LEVEL)
+    if len(compressed) >= len(stream):
+        return obj
+    value = _LENGTH.sub(b"/Length %d" % len(compressed), value)
+    if not _FLATE.search(value):
+        value = b"<<\n/Filter /FlateDecode" + value[2:]
+    return PDFObject(value, compressed)
+
+
+def _merge_duplicates(objects: dict, trailer: bytes) -> tuple:
+    """Merge identical objects until no two are the same, except pages.
+
+    Identical pages, whose content streams were merged, stay separate objects:
+    a page may only appear once in the page tree.
+    """
+    while True:
+        first: dict[PDFObject, int] = {}
+        duplicates = {}
+        for number in sorted(objects):
+            if _PAGE.search(objects[number].value):
+                continue
+            original = first.setdefault(objects[number], number)
+            if original != number:
+                duplicates[number] = original
+        if not duplicates:
+            return objects, trailer
+        objects = {
+            number: obj._replace(value=_renumber(obj.value, duplicates))
+            for number, obj in objects.items()
+            if number not in duplicates
+        }
+        trailer = _renumber(trailer, duplicates)
+
+
+def _write_pdf(version: bytes, objects: dict, trailer: bytes) -> bytes:
+    """Write objects with an object stream and a cross-reference stream."""
+    numbers = {old: new for new, old in enumerate(sorted(objects), start=1)}
+    objects = {
+        numbers[old]: obj._replace(value=_renumber(obj.value, numbers))
+        for old, obj in objects.items()
+    }
+    trailer = _renumber(trailer, numbers)
+    object_stream = len(objects) + 1
+    xref_stream = object_stream + 1
+    # Cross-reference entries: (type, offset or object stream, generation or index)
+    entries = {0: (0, 0, 65535)}
+    out = bytearray(b"%PDF-" + version + b"\n")
+
+    def write_object(number, value, stream=None):
+        entries[number] = (1, len(out), 0)
+        out.extend(b"%d 0 obj\n" % number + value)
+        if stream is not None:
+            out.extend(b"\nstream\n" + stream + b"\nendstream")
+        out.extend(b"\nendobj\n")
+
+    packed = []
+    for number, obj in sorted(objects.items()):
+        if obj.stream is None:
+            packed.append(number)
+        else:
+            write_object(number, obj.value, obj.stream)
+
+    offsets = []
+    body = bytearray()
+    for index, number in enumerate(packed):
+        entries[number] = (2, object_stream, index)
+        offsets.append(b"%d %d" % (number, len(body)))
+        body.extend(objects[number].value + b"\n")
+    if packed:
+        header = b" ".join(offsets) + b"\n"
+        stream = zlib.compress(header + body, FLATE_LEVEL)
+        value = b"<<\n/Type /ObjStm\n/N %d\n/First %d\n/Filter /FlateDecode\n/Length %d\n>>" % (
+            len(packed),
+            len(header),
+            len(stream),
+        )
+        write_object(object_stream, value, stream)
+    else:
+        entries[object_stream] = (0, 0, 0)
+
+    xref_offset = len(out)
+    entries[xref_stream] = (1, xref_offset, 0)
+    offset_width = max(1, (max(entry[1] for entry in entries.values()).bit_length() + 7) // 8)
+    rows = b"".join(
+        bytes([kind]) + field.to_bytes(offset_width, "big") + index.to_bytes(2, "big")
+        for kind, field, index in (entries[number] for number in range(xref_stream + 1))
+    )
+    stream = zlib.compress(rows, FLATE_LEVEL)
+    value = b"<<\n/Type /XRef\n/Size %d\n/W [1 %d 2]\n%s\n/Filter /FlateDecode\n/Length %d\n>>" % (
+        xref_stream + 1,
+        offset_width,
+        b"\n".join(_TRAILER_ENTRIES.findall(trailer)),
+        len(stream),
+    )
+    write_object(xref_stream, value, stream)
+    out.extend(b"startxref\n%d\n%%%%EOF\n" % xref_offset)
+    return bytes(out)
@@ -0,0 +1,623 @@
+"""PDF document with lazy font registration, fast text wrapping and fragment replay.
+
+Text is drawn through fpdf internals (`_render_styled_text_line`,
+`_preload_font_styles`, `_perform_page_break`, `_get_current_graphics_state`
+and `_fallback_font_ids`) rather than `multi_cell`, so fpdf2 is pinned to the
+2.8 releases they were written against in pyproject.toml.
+"""
+
+import os
+from contextlib import contextmanager
+from io import BytesIO
+
+from fontTools import ttLib
+from fpdf import FPDF
+from fpdf import Align
+from fpdf import XPos
+from fpdf import YPos
+from fpdf.line_break import Fragment
+from fpdf.line_break import MultiLineBreak
+from fpdf.line_break import TextLine
+from fpdf.output import OutputProducer
+from fpdf.util import Padding
+
+from resume_generator.font_cache import DEFAULT_FONTS_DIR
+from resume_generator.font_cache import FontCache
+from resume_generator.fragments import DrawFragment
+from resume_generator.fragments import FragmentCache
+from resume_generator.fragments import FragmentRecorder
+from resume_generator.measure import DEFAULT_MEASURER
+from resume_generator.measure import TextMeasurer
+from resume_generator.measure import WrappedLine
+from resume_generator.optimize import OutputSizes
+from resume_generator.optimize import optimize_pdf
+from resume_generator.profiling import count
+from resume_generator.profiling import span
+from resume_generator.renderers import Renderer
+
+
+class SubsetCachingOutputProducer(OutputProducer):
+    """Output producer embedding font subsets from the document's font cache.
+
+    fpdf subsets every TTF font when it writes the document. Each font is
+    replaced by its cached subset first, which fpdf subsets again to the same
+    glyphs at a fraction of the cost, so the output bytes are unchanged.
+    """
+
+    def _add_fonts(self):
+        with span("subset_fonts"):
+            for font in self.fpdf.fonts.values():
+                if font.type == "TTF":
+                    subset = self.fpdf.font_cache.subset(font)
+                    font.ttfont.close()
+                    font.ttfont = ttLib.TTFont(
+                        BytesIO(subset), recalcTimestamp=False, fontNumber=0, lazy=True
+                    )
+        return super()._add_fonts()
+
+
+class ResumePDF(FPDF):
+    """FPDF document that registers fonts only when they are first used.
+
+    Every registered font is parsed and embedded in the output, so fonts are
+    added the first time `set_font` asks for them, and fallback fonts only once
+    some text contains code points that the current font cannot draw.
+
+    Font and colour operations played while they are already in effect are
+    skipped, so a style selected for every cell only costs a comparison when
+    it did not change.
+
+    With `optimize_size`, the output is rewritten by
+    `resume_generator.optimize.optimize_pdf` and `output_sizes` records its
+    size before and after.
+    """
+
+    # Declared for type checkers, since fpdf ships no type information
+    page: int
+    underline: bool
+    y: float
+
+    def __init__(
+        self,
+        font_files: dict,
+        fallback_fonts: list,
+        font_cache: FontCache,
+        fonts_dir: str = DEFAULT_FONTS_DIR,
+        measurer: TextMeasurer = DEFAULT_MEASURER,
+        fragment_cache: FragmentCache | None = None,
+        optimize_size: bool = False,
+        inline_markup: bool = False,
+        **kwargs,
+    ):
+        """Initialize the PDF document.
+
+        Args:
+            font_files (dict): Mapping of font family to TTF file path.
+            fallback_fonts (list): Font families to fall back on for missing glyphs.
+            font_cache (FontCache): Cache used to load parsed font metrics.
+            fonts_dir (str): Directory searched for families missing from font_files.
+            measurer (TextMeasurer): Engine used to measure and wrap text.
+            fragment_cache (FragmentCache, optional): Cache of rendered section
+                and entry fragments, or None to render everything.
+            optimize_size (bool): Rewrite the output to make it as small as possible.
+            inline_markup (bool): Draw the bold and link markup of descriptions,
+                see `resume_generator.markup`, instead of its plain text.
+            **kwargs: Arguments passed on to `FPDF`.
+        """
+        super().__init__(**kwargs)
+        self.font_files = dict(font_files)
+        self.font_cache = font_cache
+        self.fonts_dir = fonts_dir
+        self.pending_fallback_fonts = list(fallback_fonts)
+        self.fallback_fonts = list(fallback_fonts)
+        self.measurer = measurer
+        self.fragment_cache = fragment_cache
+        self.fragment_recorders: list[FragmentRecorder] = []
+        # Renderers of other formats, e.g. plain text, fed with every draw operation
+        self.renderers: list[Renderer] = []
+        self.optimize_size = optimize_size
+        self.inline_markup = inline_markup
+        # Size of the last output before and after optimization, with optimize_size
+        self.output_sizes = None
+        # Scale and page count chosen by `resume_generator.autofit`, with max_pages
+        self.fit = None
+        # Set by layout-only passes, which count pages and are never output
+        self.layout_only = False
+        # Font and colour operations in effect, or None once changed outside `play`
+        self.font_op: tuple | None = None
+        self.color_op: tuple | None = None
+        self._font_stamps: list | None = None
+
+    def register_font(self, family: str) -> None:
+        """Register a font family with the document if it is not already.
+
+        Families absent from `font_files` are looked up as `<fonts_dir>/<family>.ttf`.
+        Unknown families are left to fpdf, which handles its core fonts.
+
+        Args:
+            family (str): Font family name.
+
+        Raises:
+            FileNotFoundError: If the configured font file does not exist.
+        """
+        if family.lower() in self.fonts:
+            return
+        font_path = self.font_path(family)
+        if family not in self.font_files and not os.path.exists(font_path):
+            return
+        self.font_cache.add_font(self, family, font_path)
+
+    def font_path(self, family: str) -> str:
+        """Return the file of a font family, from `font_files` or `fonts_dir`.
+
+        Args:
+            family (str): Font family name.
+
+        Returns:
+            str: Path of the TTF file, which may not exist.
+        """
+        font_path = self.font_files.get(family)
+        if font_path is None:
+            font_path = os.path.join(self.fonts_dir, f"{family}.ttf")
+        return font_path
+
+    def font_stamps(self) -> list:
+        """Identify the font files the document can draw with, e.g. for fragment keys.
+
+        The configured families, their bold counterparts and the fallback fonts
+        are identified by path, size and modification time, so that a replaced
+        font file changes the result. It is computed once per document.
+
+        Returns:
+            list: (path, size, mtime_ns) of each existing font file, sorted.
+        """
+        if self._font_stamps is None:
+            families = {*self.font_files, *self.fallback_fonts}
+            families |= {f"{family}-Bold" for family in families}
+            stamps = []
+            for font_path in {self.font_path(family) for family in families}:
+                try:
+                    stat = os.stat(font_path)
+                except OSError:
+                    continue
+                stamps.append((str(font_path), stat.st_size, stat.st_mtime_ns))
+            self._font_stamps = sorted(stamps)
+        return self._font_stamps
+
+    def register_fallback_fonts(self) -> None:
+        """Register the pending fallback fonts and enable them."""
+        for family in self.pending_fallback_fonts:
+            self.register_font(family)
+        self.set_fallback_fonts(self.pending_fallback_fonts)
+        self.pending_fallback_fonts = []
+
+    def bold_family(self, family: str) -> str:
+        """Return the bold counterpart of a font family.
+
+        Bold fonts are separate families named `<family>-Bold`, in `font_files`
+        or in `fonts_dir`.
+
+        Args:
+            family (str): Font family name.
+
+        Returns:
+            str: The bold family, or `family` itself if it has none.
+        """
+        bold = f"{family}-Bold"
+        if bold in self.font_files or os.path.exists(self.font_path(bold)):
+            return bold
+        return family
+
+    def set_font(self, family=None, style="", size=0):
+        """Set the current font, registering its family on first use."""
+        if family:
+            self.register_font(family)
+        super().set_font(family, style, size)
+        self.font_op = None
+
+    def set_text_color(self, r, g=-1, b=-1):
+        """Set the text colour."""
+        super().set_text_color(r, g, b)
+        self.color_op = None
+
+    def add_page(self, *args, **kwargs):
+        """Start a new page, counting it in the profile."""
+        super().add_page(*args, **kwargs)
+        count("pages")
+
+    def output(self, name="", *args, **kwargs):
+        """Output the PDF, embedding font subsets from the font cache.
+
+        With `optimize_size`, the PDF is optimized before it is written to
+        `name` or returned.
+        """
+        kwargs.setdefault("output_producer_class", SubsetCachingOutputProducer)
+        with span("pdf.output"):
+            if not self.optimize_size:
+                result = super().output(name, *args, **kwargs)
+            else:
+                buffer = super().output("", *args, **kwargs)
+                # fpdf only produces the document once; later calls return the same buffer
+                if self.output_sizes is None:
+                    with span("optimize_pdf"):
+                        self.buffer = bytearray(optimize_pdf(bytes(buffer)))
+                    self.output_sizes = OutputSizes(len(buffer), len(self.buffer))
+                result = self._write_buffer(name)
+        count("bytes_written", len(self.buffer))
+        return result
+
+    def _write_buffer(self, name):
+        """Write the output buffer the way `FPDF.output` does."""
+        if not name:
+            return self.buffer
+        if isinstance(name, os.PathLike):
+            name.write_bytes(self.buffer)
+        elif isinstance(name, str):
+            with open(name, "wb") as file:
+                file.write(self.buffer)
+        else:
+            name.write(self.buffer)
+        return None
+
+    def normalize_text(self, text):
+        """Normalize text, registering fallback fonts if it needs them."""
+        text = super().normalize_text(text)
+        if self.pending_fallback_fonts and self.is_ttf_font:
+            cmap = self.current_font.cmap
+            # fpdf never looks up fallback glyphs for line breaks
+            if any(ord(char) not in cmap for char in set(text) - {"\n"}):
+                self.register_fallback_fonts()
+        return text
+
+    def supports_measured_wrap(self, text: str) -> bool:
+        """Return whether the current font settings allow `wrap_text` for a text."""
+        return not (
+            not self.is_ttf_font
+            or self._fallback_font_ids
+            or self.text_shaping
+            or self.char_spacing
+            or self.font_stretching != 100
+            or (self.str_alias_nb_pages and self.str_alias_nb_pages in text)
+        )
+
+    def wrap_text(self, w: float, text: str):
+        """Break normalized text into lines with the measurement engine.
+
+        Args:
+            w (float): Cell width.
+            text (str): Normalized text, without carriage returns.
+
+        Returns:
+            tuple: WrappedLine entries, or None if the text or the current font
+                settings need fpdf's own line breaker.
+        """
+        if not self.supports_measured_wrap(text):
+            return None
+        max_width = w - 2 * self.c_margin
+        return self.measurer.wrap(self.current_font, self.font_size_pt, self.k, text, max_width)
+
+    def multi_cell_measured(
+        self,
+        w: float,
+        h: float,
+        text: str,
+        new_x: XPos = XPos.RIGHT,
+        new_y: YPos = YPos.NEXT,
+        align: Align = Align.J,
+        lines=None,
+    ) -> bool:
+        """Print a multi-line cell, wrapping the text with the measurement engine.
+
+        The output is identical to `multi_cell` without border, fill, padding or
+        markdown. fpdf's line breaker re-measures the whole line for every
+        character it adds, which dominates rendering time for long paragraphs.
+
+        Args:
+            w (float): Cell width, or 0 to extend up to the right margin.
+            h (float): Line height.
+            text (str): Text to print.
+            new_x (XPos): Horizontal position after the cell.
+            new_y (YPos): Vertical position after the cell.
+            align (Align): Text alignment.
+            lines (sequence, optional): Lines already computed for this text,
+                width and font, e.g. replayed from a fragment.
+
+        Returns:
+            bool: Whether a page break was performed.
+        """
+        w, text, lines = self.layout_text(w, text, lines)
+        if align == Align.X:
+            lines = None
+        return self.render_text(w, h, text, lines, new_x, new_y, align)
+
+    def layout_text(self, w: float, text: str, lines=None) -> tuple:
+        """Normalize text and break it into lines for `render_text`.
+
+        Args:
+            w (float): Cell width, or 0 to extend up to the right margin.
+            text (str): Text to print.
+            lines (sequence, optional): Lines already computed for this text,
+                width and font. They are only reused if the measurement engine
+                still applies, e.g. no fallback font was enabled since.
+
+        Returns:
+            tuple: (cell width, normalized text, WrappedLine entries or None).
+        """
+        if w == 0:
+            w = self.w - self.r_margin - self.x
+        text = self.normalize_text(text).replace("\r", "")
+        if lines is not None and self.supports_measured_wrap(text):
+            return w, text, tuple(WrappedLine._make(line) for line in lines)
+        return w, text, self.wrap_text(w, text)
+
+    def render_text(
+        self,
+        w: float,
+        h: float,
+        text: str,
+        lines,
+        new_x: XPos = XPos.RIGHT,
+        new_y: YPos = YPos.NEXT,
+        align: Align = Align.J,
+        link: str | None = None,
+    ) -> bool:
+        """Print text laid out by `layout_text`.
+
+        Args:
+            w (float): Cell width.
+            h (float): Line height.
+            text (str): Normalized text.
+            lines (tuple): WrappedLine entries, or None to use `multi_cell`.
+            new_x (XPos): Horizontal position after the cell.
+            new_y (YPos): Vertical position after the cell.
+            align (Align): Text alignment.
+            link (str, optional): URL that every line of the text links to.
+
+        Returns:
+            bool: Whether a page break was performed.
+        """
+        if lines is None:
+            return self.multi_cell(
+                w, h, text=text, new_x=new_x, new_y=new_y, align=align, link=link
+            )
+
+        graphics_state = self._get_current_graphics_state()
+        line_align = Align.L if align == Align.J else align
+        text_lines = []
+        for line in lines:
+            fragments = []
+            if line.has_fragment:
+                fragments.append(Fragment(text[line.start : line.end], graphics_state, self.k))
+            text_lines.append(
+                TextLine(
+                    fragments,
+                    text_width=line.width,
+                    number_of_spaces=line.number_of_spaces,
+                    align=align if line.justified else line_align,
+                    height=self.font_size,
+                    max_width=w,
+                    trailing_nl=line.trailing_nl,
+                )
+            )
+        return self.render_lines(text_lines, h, new_x, new_y, link)
+
+    def render_inline(
+        self,
+        w: float,
+        h: float,
+        runs,
+        bold_family: str,
+        new_x: XPos = XPos.RIGHT,
+        new_y: YPos = YPos.NEXT,
+        align: Align = Align.J,
+    ) -> bool:
+        """Print a multi-line cell mixing regular and bold text, and links.
+
+        Runs are drawn in the current font, or in `bold_family` for bold runs,
+        at the current style, size and colour; linked runs are underlined and
+        clickable. The runs are
+        broken into lines by fpdf's line breaker, as `multi_cell` does for
+        markdown, without parsing any markup.
+
+        Args:
+            w (float): Cell width, or 0 to extend up to the right margin.
+            h (float): Line height.
+            runs (sequence): (text, bold, URL or None) of each run.
+            bold_family (str): Font family of the bold runs.
+            new_x (XPos): Horizontal position after the cell.
+            new_y (YPos): Vertical position after the cell.
+            align (Align): Text alignment.
+
+        Returns:
+            bool: Whether a page break was performed.
+        """
+        if w == 0:
+            w = self.w - self.r_margin - self.x
+        family, style, size = self.font_family, self.font_style, self.font_size_pt
+        underline, font_op, page = self.underline, self.font_op, self.page
+        fragments = []
+        # On page 0, set_font selects the fonts without writing them to the page
+        self.page = 0
+        try:
+            for text, bold, link in runs:
+                self.set_font(bold_family if bold else family, style, size)
+                self.underline = underline or bool(link)
+                text = self.normalize_text(text).replace("\r", "")
+                for fragment in self._preload_font_styles(text, False):
+                    fragment.link = link
+                    fragments.append(fragment)
+        finally:
+            self.set_font(family, style, size)
+            self.underline = underline
+            self.font_op = font_op
+            self.page = page
+
+        line_break = MultiLineBreak(fragments, w, [self.c_margin, self.c_margin], align=align)
+        text_lines = list(iter(line_break.get_line, None))
+        if not text_lines:
+            return self.render_text(w, h, "", None, new_x, new_y, align)
+        return self.render_lines(text_lines, h, new_x, new_y)
+
+    def render_lines(
+        self,
+        text_lines: list,
+        h: float,
+        new_x: XPos = XPos.RIGHT,
+        new_y: YPos = YPos.NEXT,
+        link: str | None = None,
+    ) -> bool:
+        """Print broken lines of text the way `multi_cell` does.
+
+        Args:
+            text_lines (list): fpdf TextLine entries.
+            h (float): Line height.
+            new_x (XPos): Horizontal position after the last line.
+            new_y (YPos): Vertical position after the last line.
+            link (str, optional): URL that every line links to.
+
+        Returns:
+            bool: Whether a page break was performed.
+        """
+        prev_y = self.y
+        page_break_triggered = False
+        for index, text_line in enumerate(text_lines):
+            if self.will_page_break(h):
+                page_break_triggered = True
+                self._perform_page_break()
+            is_last_line = index == len(text_lines) - 1
+            self._render_styled_text_line(
+                text_line,
+                h=h,
+                new_x=new_x if is_last_line else XPos.LEFT,
+                new_y=new_y if is_last_line else YPos.NEXT,
+                border=0,
+                fill=False,
+                link=link,
+                padding=Padding(0, 0, 0, 0),
+            )
+
+        if page_break_triggered and new_y == YPos.TOP:
+            prev_y = self.y
+        if text_lines[-1].trailing_nl and new_y in (YPos.LAST, YPos.NEXT):
+            self.ln()
+        if new_y == YPos.TOP:
+            self.y = prev_y
+        return page_break_triggered
+
+    def play(self, op: tuple) -> None:
+        """Execute a draw operation, record it and pass it on to the other renderers.
+
+        See `resume_generator.fragments` for the operations. Every operation
+        but "font" and "color" ends at the left margin of the next line. Font
+        and colour operations that are already in effect are not executed, but
+        still recorded. The operations describing the structure of the content
+        (see `resume_generator.renderers`) draw nothing.
+
+        Args:
+            op (tuple): The draw operation.
+
+        Raises:
+            ValueError: If the operation is unknown.
+        """
+        kind = op[0]
+        if kind in ("font", "color"):
+            self._select(op)
+        elif kind == "cell":
+            _, w, h, text = op
+            self.cell(w, h, text=text, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            count("cells")
+        elif kind == "text":
+            _, w, h, text, lines = op
+            cell_w, normalized, lines = self.layout_text(w, text, lines)
+            self.render_text(cell_w, h, normalized, lines, XPos.LMARGIN, YPos.NEXT)
+            count("cells")
+            op = (kind, w, h, text, lines)
+        elif kind == "inline":
+            _, w, h, runs, bold_family = op
+            self.render_inline(w, h, runs, bold_family, XPos.LMARGIN, YPos.NEXT)
+            count("cells")
+        elif kind == "link":
+            # Drawn in the text colour, underlined, and wrapped like any other text
+            url = op[1]
+            underline = self.underline
+            self.underline = True
+            try:
+                w, text, lines = self.layout_text(0, url)
+                self.render_text(
+                    w, self.font_size, text, lines, XPos.LMARGIN, YPos.NEXT, Align.L, url
+                )
+            finally:
+                self.underline = underline
+            count("links")
+        elif kind in ("begin", "end", "style"):
+            # Structure of the content, for the other renderers
+            pass
+        else:
+            raise ValueError(f"Unknown draw operation: {kind}")
+        for recorder in self.fragment_recorders:
+            recorder.add(op)
+        for renderer in self.renderers:
+            renderer.play(op)
+
+    def _select(self, op: tuple) -> None:
+        """Select the font or text colour of an operation, unless already in effect."""
+        if op[0] == "font":
+            if op != self.font_op:
+                self.set_font(*op[1:])
+                self.font_op = op
+                count("font_switches")
+        elif op != self.color_op:
+            self.set_text_color(*op[1:])
+            self.color_op = op
+            count("color_switches")
+
+    def replay(self, fragment: DrawFragment) -> None:
+        """Play the draw operations of a cached fragment.
+
+        In a layout-only pass, a fragment that did not cross a page break and
+        fits on the current page is stepped over by its recorded height
+        instead: only its last font and colour are selected, for the content
+        that follows, and its operations still go to the enclosing recordings.
+
+        Args:
+            fragment (DrawFragment): The fragment to replay.
+        """
+        if (
+            self.layout_only
+            and not self.renderers
+            and fragment.page_breaks == 0
+            and not self.will_page_break(fragment.height)
+        ):
+            for recorder in self.fragment_recorders:
+                recorder.ops.extend(fragment.ops)
+            selected = {op[0]: op for op in fragment.ops if op[0] in ("font", "color")}
+            for op in selected.values():
+                self._select(op)
+            self.set_xy(self.l_margin, self.y + fragment.height)
+            count("fragments_skipped")
+            return
+        for op in fragment.ops:
+            self.play(op)
+
+    @contextmanager
+    def record_fragment(self):
+        """Record the draw operations played inside the block.
+
+        Recordings nest, so an entry replayed or recorded while its section
+        is being recorded also ends up in the section's fragment. The space the
+        block took is measured when it completes.
+
+        Yields:
+            FragmentRecorder: The recorder holding the operations.
+        """
+        recorder = FragmentRecorder()
+        page, y = self.page, self.y
+        self.fragment_recorders.append(recorder)
+        try:
+            yield recorder
+            # Distance travelled in the flow, skipping the bottom margins
+            page_breaks = self.page - page
+            height = self.y - y + page_breaks * (self.page_break_trigger - self.t_margin)
+            recorder.measure(height, page_breaks)
+        finally:
+            self.fragment_recorders.remove(recorder)
@@ -0,0 +1,182 @@
+"""Span and counter tracing of renders, exported in Chrome trace-event format.
+
+Instrumented code opens spans with `span` or the `traced` decorator, and
+bumps counters (cells drawn, font switches, pages added, bytes written) with
+`count`. Nothing is recorded until `start_tracing` installs a tracer: without
+one, `span` returns a shared no-op context manager and `count` returns at
+once, so instrumentation costs a function call and a global lookup.
+
+Each span becomes a complete event ("ph": "X") whose arguments hold the
+counters incremented while it was open, and the counter totals are sampled
+as counter events ("ph": "C") when a span changed them. The saved file opens
+in chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextlib import nullcontext
+
+# Tracer recording the current run, set by `start_tracing`
+_tracer = None
+_NULL_SPAN = nullcontext()
+
+
+class Tracer:
+    """Records nested spans and counters of one run."""
+
+    def __init__(self):
+        """Start the trace clock."""
+        self.events = []
+        self.counters = defaultdict(int)
+        self.pid = os.getpid()
+        self._origin = time.perf_counter_ns()
+
+    def now(self) -> float:
+        """Return the microseconds elapsed since the tracer was created."""
+        return (time.perf_counter_ns() - self._origin) / 1000
+
+    @contextmanager
+    def span(self, name: str, **args):
+        """Record the block as a span.
+
+        Args:
+            name (str): Span name.
+            **args: Values shown with the span.
+        """
+        before = dict(self.counters)
+        start = self.now()
+        try:
+            yield
+        finally:
+            end = self.now()
+            tid = threading.get_ident()
+            deltas = {
+                counter: value - before.get(counter, 0)
+                for counter, value in self.counters.items()
+                if value != before.get(counter, 0)
+            }
+            self.events.append(
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": start,
+                    "dur": end - start,
+                    "pid": self.pid,
+                    "tid": tid,
+                    "args": dict(args, **deltas),
+                }
+            )
+            if deltas:
+                self.events.append(
+                    {
+                        "name": "counters",
+                        "ph": "C",
+                        "ts": end,
+                        "pid": self.pid,
+                        "tid": tid,
+                        "args": dict(self.counters),
+                    }
+                )
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Increment a counter.
+
+        Args:
+            name (str): Counter name.
+            value (int): Amount added.
+        """
+        self.counters[name] += value
+
+    def to_dict(self) -> dict:
+        """Return the trace in Chrome trace-event format.
+
+        Returns:
+            dict: The events, sorted by start time, and the counter totals.
+        """
+        return {
+            "traceEvents": sorted(self.events, key=lambda event: event["ts"]),
+            "displayTimeUnit": "ms",
+            "otherData": {"counters": dict(self.counters)},
+        }
+
+    def save(self, path) -> None:
+        """Write the trace to a JSON file.
+
+        Args:
+            path: Destination file.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file)
+
+
+def start_tracing(tracer: Tracer | None = None) -> Tracer:
+    """Install a tracer, replacing the current one.
+
+    Args:
+        tracer (Tracer, optional): The tracer to install. Defaults to a new Tracer.
+
+    Returns:
+        Tracer: The tracer recording from now on.
+    """
+    global _tracer
+    _tracer = tracer or Tracer()
+    return _tracer
+
+
+def stop_tracing() -> Tracer | None:
+    """Uninstall the current tracer.
+
+    Returns:
+        Tracer | None: The tracer that was recording, or None.
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def span(name: str, **args):
+    """Return a context manager recording a span if a tracer is installed.
+
+    Args:
+        name (str): Span name.
+        **args: Values shown with the span.
+
+    Returns:
+        A context manager; a no-op one when tracing is off.
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, **args)
+
+
+def count(name: str, value: int = 1) -> None:
+    """Increment a counter if a tracer is installed.
+
+    Args:
+        name (str): Counter name.
+        value (int): Amount added.
+    """
+    tracer = _tracer
+    if tracer is not None:
+        tracer.counters[name] += value
+
+
+def traced(func):
+    """Decorate a function so that each call is recorded as a span named after it."""
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        tracer = _tracer
+        if tracer is None:
+            return func(*args, **kwargs)
+        with tracer.span(name):
+            return func(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,293 @@
+"""Plain-text and HTML versions of a resume, rendered alongside the PDF.
+
+Sections draw through `ResumePDF.play`, which also passes every draw
+operation, including those of replayed fragments, to the document's other
+renderers. Besides the drawing operations (see `resume_generator.fragments`),
+sections play operations that only describe the structure of the resume:
+
+    ("begin", kind, name)   start of a "section" or an "entry" of section `name`
+    ("end", kind)           end of the section or entry
+    ("style", key)          style key of the text that follows
+
+A renderer turns them into its own format: headings, paragraphs and links,
+without any layout. The PDF is serialized while the other formats are written
+in threads (see `write_outputs`).
+"""
+
+import html
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Style keys of headings outside entries, by heading level
+HEADING_KEYS = {"name": 1, "section_header": 2, "description_header": 2}
+
+
+class Renderer:
+    """Output format built from the draw operations of the sections.
+
+    Subclasses implement the `add_*` methods and `render`; this class tracks
+    the structure: the current section, whether the text is in an entry, and
+    the style key of the text.
+    """
+
+    # File name suffix of the format
+    suffix = ""
+
+    def __init__(self):
+        """Initialize an empty document."""
+        self.section = None
+        self.style_key = None
+        self.in_entry = False
+        # Whether the next text of the entry is its title
+        self.entry_title = False
+
+    def play(self, op: tuple) -> None:
+        """Add the content of a draw operation to the document.
+
+        Args:
+            op (tuple): The draw operation.
+
+        Raises:
+            ValueError: If the operation is unknown.
+        """
+        kind = op[0]
+        if kind == "style":
+            self.style_key = op[1]
+        elif kind in ("cell", "text"):
+            # Empty cells only add vertical space
+            if op[3]:
+                self.add_text(op[3])
+        elif kind == "inline":
+            self.add_runs(op[3])
+        elif kind == "link":
+            self.add_link(op[1])
+        elif kind == "begin":
+            if op[1] == "entry":
+                self.in_entry = self.entry_title = True
+            else:
+                self.section = op[2]
+            self.begin(op[1])
+        elif kind == "end":
+            self.end(op[1])
+            if op[1] == "entry":
+                self.in_entry = self.entry_title = False
+            else:
+                self.section = None
+        elif kind not in ("font", "color"):
+            raise ValueError(f"Unknown draw operation: {kind}")
+
+    def heading_level(self) -> int:
+        """Return the heading level of the text being added.
+
+        The title of an entry is its first text; outside entries, the style key
+        tells headings apart (see HEADING_KEYS).
+
+        Returns:
+            int: 1 to 3, or 0 for text that is not a heading.
+        """
+        if self.in_entry:
+            level = 3 if self.entry_title else 0
+            self.entry_title = False
+            return level
+        return HEADING_KEYS.get(self.style_key, 0)
+
+    def begin(self, kind: str) -> None:
+        """Start a "section" or an "entry"."""
+
+    def end(self, kind: str) -> None:
+        """End a "section" or an "entry"."""
+
+    def add_text(self, text: str) -> None:
+        """Add a heading or a paragraph of text."""
+        raise NotImplementedError("Renderers must implement add_text()")
+
+    def add_runs(self, runs) -> None:
+        """Add a paragraph of (text, bold, URL or None) runs."""
+        raise NotImplementedError("Renderers must implement add_runs()")
+
+    def add_link(self, url: str) -> None:
+        """Add a URL on its own line."""
+        raise NotImplementedError("Renderers must implement add_link()")
+
+    def render(self) -> str:
+        """Return the document."""
+        raise NotImplementedError("Renderers must implement render()")
+
+    def save(self, path: str) -> None:
+        """Write the document to a UTF-8 file.
+
+        Args:
+            path (str): Path of the file.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.render())
+
+
+class TextRenderer(Renderer):
+    """Plain text for the forms of applicant tracking systems.
+
+    Section headings are upper-cased, sections and entries are separated by
+    blank lines, and links keep their URL next to their label.
+    """
+
+    suffix = ".txt"
+
+    def __init__(self):
+        """Initialize an empty document."""
+        super().__init__()
+        self.lines = []
+
+    def blank_line(self) -> None:
+        """Separate what follows from the previous lines."""
+        if self.lines and self.lines[-1]:
+            self.lines.append("")
+
+    def begin(self, kind: str) -> None:
+        """Start a section or an entry on a new paragraph."""
+        self.blank_line()
+
+    def add_text(self, text: str) -> None:
+        """Add a line of text, upper-casing section headings."""
+        if self.heading_level() == 2:
+            self.blank_line()
+            text = text.upper()
+        self.lines.extend(text.split("\n"))
+
+    def add_runs(self, runs) -> None:
+        """Add a paragraph, writing links as "label (URL)"."""
+        text = "".join(
+            f"{text} ({link})" if link and link != text else text for text, _, link in runs
+        )
+        self.add_text(text)
+
+    def add_link(self, url: str) -> None:
+        """Add a URL on its own line."""
+        self.add_text(url)
+
+    def render(self) -> str:
+        """Return the text, ending with a newline."""
+        return "\n".join(self.lines).strip("\n") + "\n"
+
+
+class HtmlRenderer(Renderer):
+    """Semantic HTML: a `section` per section, an `article` per entry.
+
+    The name is the `h1` and the page title, section headings are `h2` and
+    entry titles `h3`. Other text is a paragraph with its style key as class.
+    """
+
+    suffix = ".html"
+
+    def __init__(self):
+        """Initialize an empty document."""
+        super().__init__()
+        self.parts = []
+        self.title = ""
+
+    def begin(self, kind: str) -> None:
+        """Open the element of a section or an entry."""
+        if kind == "entry":
+            self.parts.append("<article>")
+        else:
+            self.parts.append(f'<section class="{html.escape(self.section)}">')
+
+    def end(self, kind: str) -> None:
+        """Close the element of a section or an entry."""
+        self.parts.append("</article>" if kind == "entry" else "</section>")
+
+    def add_element(self, content: str) -> None:
+        """Add a heading or a paragraph of HTML content."""
+        level = self.heading_level()
+        if level:
+            self.parts.append(f"<h{level}>{content}</h{level}>")
+        else:
+            self.parts.append(f'<p class="{html.escape(self.style_key or "")}">{content}</p>')
+
+    def add_text(self, text: str) -> None:
+        """Add text, keeping its line breaks."""
+        if not self.title and not self.in_entry and self.style_key == "name":
+            self.title = text
+        self.add_element(html.escape(text).replace("\n", "<br>\n"))
+
+    def add_runs(self, runs) -> None:
+        """Add text with `strong` bold runs and `a` links."""
+        content = []
+        for text, bold, link in runs:
+            text = html.escape(text).replace("\n", "<br>\n")
+            if bold:
+                text = f"<strong>{text}</strong>"
+            if link:
+                text = f'<a href="{html.escape(link)}">{text}</a>'
+            content.append(text)
+        self.add_element("".join(content))
+
+    def add_link(self, url: str) -> None:
+        """Add a link showing its URL."""
+        url = html.escape(url)
+        self.add_element(f'<a href="{url}">{url}</a>')
+
+    def render(self) -> str:
+        """Return the HTML document."""
+        body = "\n".join(self.parts)
+        return (
+            "<!DOCTYPE html>\n"
+            "<html>\n"
+            "<head>\n"
+            '<meta charset="utf-8">\n'
+            f"<title>{html.escape(self.title)}</title>\n"
+            "</head>\n"
+            f"<body>\n{body}\n</body>\n"
+            "</html>\n"
+        )
+
+
+# Renderers of the formats written next to the PDF, by format name
+RENDERERS = {"txt": TextRenderer, "html": HtmlRenderer}
+
+
+def create_renderers(formats) -> dict:
+    """Create the renderers of the formats written next to the PDF.
+
+    Args:
+        formats (list): Format names, keys of RENDERERS.
+
+    Returns:
+        dict: Renderer of each format, in order.
+
+    Raises:
+        ValueError: If a format is unknown.
+    """
+    unknown = [name for name in formats if name not in RENDERERS]
+    if unknown:
+        raise ValueError(
+            f"Unknown output formats: {', '.join(map(str, unknown))} "
+            f"(available: {', '.join(RENDERERS)})"
+        )
+    return {name: RENDERERS[name]() for name in formats}
+
+
+def write_outputs(document, renderers: dict, pdf_path: str) -> list:
+    """Write the PDF and the other formats of a rendered resume.
+
+    The other formats are written in threads while the PDF is serialized,
+    next to it with their own suffix.
+
+    Args:
+        document (ResumePDF): The rendered document, fed to `renderers`.
+        renderers (dict): Renderer of each other format.
+        pdf_path (str): Path of the PDF.
+
+    Returns:
+        list: Paths of the files written, the PDF first.
+    """
+    stem = os.path.splitext(pdf_path)[0]
+    paths = [pdf_path]
+    with ThreadPoolExecutor(max_workers=max(len(renderers), 1)) as pool:
+        futures = []
+        for renderer in renderers.values():
+            paths.append(stem + renderer.suffix)
+            futures.append(pool.submit(renderer.save, paths[-1]))
+        document.output(pdf_path)
+        for future in futures:
+            future.result()
+    return paths
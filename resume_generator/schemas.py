@@ -1,14 +1,26 @@
-"""Schema definitions for resume data validation using pydantic."""
+"""Schema definitions for resume data validation using pydantic.
+
+The whole resume is validated in one pass by `RESUME_ADAPTER`, a TypeAdapter
+of the `ResumeDocument` mapping, so that pydantic-core walks every section and
+entry itself. Dates, durations and phone numbers share annotated types whose
+checks use precompiled patterns; their error messages are those of the
+per-model validators they replace.
+"""
 
 import re
-from datetime import datetime
+from typing import Annotated
+from typing import Dict
 from typing import List
 from typing import Optional
+from typing import TypedDict
 
+from pydantic import AfterValidator
 from pydantic import BaseModel
 from pydantic import EmailStr
 from pydantic import Field
 from pydantic import HttpUrl
+from pydantic import TypeAdapter
+from pydantic import ValidationError
 from pydantic import field_validator
 
 # Constants
@@ -31,6 +43,39 @@ EMPLOYMENT_TYPES = [
     "Seasonal",
 ]
 
+# Same dates as `datetime.strptime(value, "%Y-%m")` accepts
+YEAR_MONTH_PATTERN = re.compile(r"(?!0000)\d{4}-(?:1[0-2]|0[1-9]|[1-9])")
+PHONE_PATTERN = re.compile(r"^\+?1?\d{9,15}$")
+
+
+def validate_year_month(v: str) -> str:
+    """Validate date format as YYYY-MM."""
+    if not YEAR_MONTH_PATTERN.fullmatch(v):
+        raise ValueError("Invalid date format. Use YYYY-MM")
+    return v
+
+
+def validate_duration(v: List[str]) -> List[str]:
+    """Validate duration format as list of two dates."""
+    if len(v) != 2:
+        raise ValueError("Duration must have exactly 2 elements [start, end]")
+    for date in v:
+        if date.lower() != "present" and not YEAR_MONTH_PATTERN.fullmatch(date):
+            raise ValueError('Invalid date format. Use YYYY-MM or "Present"')
+    return v
+
+
+def validate_phone(v: str) -> str:
+    """Validate phone number format using regex."""
+    if not PHONE_PATTERN.match(v):
+        raise ValueError("Invalid phone number format")
+    return v
+
+
+YearMonth = Annotated[str, AfterValidator(validate_year_month)]
+Duration = Annotated[List[str], Field(max_length=2), AfterValidator(validate_duration)]
+PhoneNumber = Annotated[str, AfterValidator(validate_phone)]
+
 
 class ApplicationInfo(BaseModel):
     """Model for storing application-specific information."""
@@ -46,41 +91,21 @@ class General(BaseModel):
     title: str = Field(..., min_length=1)
     location: str = Field(..., min_length=1)
     email: EmailStr
-    cell_number: Optional[str] = None
+    cell_number: Optional[PhoneNumber] = None
     portfolio: HttpUrl
     linkedin: HttpUrl
     github: HttpUrl
     description: str = Field(..., min_length=10)
 
-    @field_validator("cell_number")
-    def validate_phone(cls, v):
-        """Validate phone number format using regex."""
-        if v is None:
-            return v
-        pattern = re.compile(r"^\+?1?\d{9,15}$")
-        if not pattern.match(v):
-            raise ValueError("Invalid phone number format")
-        return v
-
 
 class Reference(BaseModel):
     """Model for storing reference information."""
 
     name: str
     position: str
-    number: Optional[str] = None
+    number: Optional[PhoneNumber] = None
     web: Optional[HttpUrl] = None
 
-    @field_validator("number")
-    def validate_phone(cls, v):
-        """Validate phone number format using regex."""
-        if v is None:
-            return v
-        pattern = re.compile(r"^\+?1?\d{9,15}$")
-        if not pattern.match(v):
-            raise ValueError("Invalid phone number format")
-        return v
-
 
 class DateRange(BaseModel):
     """Model for storing date ranges with validation."""
@@ -91,13 +116,9 @@ class DateRange(BaseModel):
     @field_validator("start", "end")
     def validate_date(cls, v):
         """Validate date format as YYYY-MM or 'Present'."""
-        if v.lower() == "present":
-            return v
-        try:
-            datetime.strptime(v, "%Y-%m")
+        if v.lower() == "present" or YEAR_MONTH_PATTERN.fullmatch(v):
             return v
-        except ValueError:
-            raise ValueError('Invalid date format. Use YYYY-MM or "Present"')
+        raise ValueError('Invalid date format. Use YYYY-MM or "Present"')
 
 
 class Jobs(BaseModel):
@@ -107,7 +128,7 @@ class Jobs(BaseModel):
     title: str = Field(..., min_length=1)
     company: str = Field(..., min_length=1)
     employment_type: str = Field(..., min_length=1)
-    duration: List[str] = Field(..., max_length=2)
+    duration: Duration
     references: Optional[List[Reference]] = None
     description: Optional[str] = None
     skills: Optional[List[str]] = None
@@ -121,19 +142,6 @@ class Jobs(BaseModel):
             )
         return v
 
-    @field_validator("duration")
-    def validate_duration(cls, v):
-        """Validate duration format as list of two dates."""
-        if len(v) != 2:
-            raise ValueError("Duration must have exactly 2 elements [start, end]")
-        for date in v:
-            if date.lower() != "present":
-                try:
-                    datetime.strptime(date, "%Y-%m")
-                except ValueError:
-                    raise ValueError('Invalid date format. Use YYYY-MM or "Present"')
-        return v
-
 
 class Education(BaseModel):
     """Model for storing education information."""
@@ -142,24 +150,11 @@ class Education(BaseModel):
     school: str = Field(..., min_length=1)
     degree: Optional[str] = None
     field: str = Field(..., min_length=1)
-    duration: List[str] = Field(..., max_length=2)
+    duration: Duration
     gpa: Optional[str] = None
     activities_and_societies: Optional[List[str]] = None
     description: Optional[str] = None
 
-    @field_validator("duration")
-    def validate_duration(cls, v):
-        """Validate duration format as list of two dates."""
-        if len(v) != 2:
-            raise ValueError("Duration must have exactly 2 elements [start, end]")
-        for date in v:
-            if date.lower() != "present":
-                try:
-                    datetime.strptime(date, "%Y-%m")
-                except ValueError:
-                    raise ValueError('Invalid date format. Use YYYY-MM or "Present"')
-        return v
-
     @field_validator("gpa")
     def validate_gpa(cls, v):
         """Validate GPA format and range."""
@@ -180,18 +175,9 @@ class LicensesAndCertifications(BaseModel):
     include: bool = True
     name: str = Field(..., min_length=1)
     issuer: str = Field(..., min_length=1)
-    issued_on: str
+    issued_on: YearMonth
     credential_id: str = Field(..., min_length=1)
 
-    @field_validator("issued_on")
-    def validate_date(cls, v):
-        """Validate date format as YYYY-MM."""
-        try:
-            datetime.strptime(v, "%Y-%m")
-            return v
-        except ValueError:
-            raise ValueError("Invalid date format. Use YYYY-MM")
-
 
 class VolunteerExperience(BaseModel):
     """Model for storing volunteer experience information."""
@@ -200,46 +186,20 @@ class VolunteerExperience(BaseModel):
     organization: str = Field(..., min_length=1)
     role: str = Field(..., min_length=1)
     cause: str = Field(..., min_length=1)
-    duration: List[str] = Field(..., max_length=2)
+    duration: Duration
     description: Optional[str] = None
 
-    @field_validator("duration")
-    def validate_duration(cls, v):
-        """Validate duration format as list of two dates."""
-        if len(v) != 2:
-            raise ValueError("Duration must have exactly 2 elements [start, end]")
-        for date in v:
-            if date.lower() != "present":
-                try:
-                    datetime.strptime(date, "%Y-%m")
-                except ValueError:
-                    raise ValueError('Invalid date format. Use YYYY-MM or "Present"')
-        return v
-
 
 class Projects(BaseModel):
     """Model for storing project information."""
 
     include: bool = True
     name: str = Field(..., min_length=1)
-    duration: List[str] = Field(..., max_length=2)
+    duration: Duration
     link: Optional[HttpUrl] = None
     description: str = Field(..., min_length=10)
     skills: List[str] = Field(default_factory=list)
 
-    @field_validator("duration")
-    def validate_duration(cls, v):
-        """Validate duration format as list of two dates."""
-        if len(v) != 2:
-            raise ValueError("Duration must have exactly 2 elements [start, end]")
-        for date in v:
-            if date.lower() != "present":
-                try:
-                    datetime.strptime(date, "%Y-%m")
-                except ValueError:
-                    raise ValueError('Invalid date format. Use YYYY-MM or "Present"')
-        return v
-
 
 class HonorsAndAwards(BaseModel):
     """Model for storing honors and awards information."""
@@ -247,18 +207,9 @@ class HonorsAndAwards(BaseModel):
     include: bool = True
     title: str = Field(..., min_length=1)
     issuer: str = Field(..., min_length=1)
-    issued_on: str
+    issued_on: YearMonth
     description: str = Field(..., min_length=10)
 
-    @field_validator("issued_on")
-    def validate_date(cls, v):
-        """Validate date format as YYYY-MM."""
-        try:
-            datetime.strptime(v, "%Y-%m")
-            return v
-        except ValueError:
-            raise ValueError("Invalid date format. Use YYYY-MM")
-
 
 class Languages(BaseModel):
     """Model for storing language proficiency information."""
@@ -283,15 +234,86 @@ class Articles(BaseModel):
     include: bool = True
     title: str = Field(..., min_length=1)
     publication: str = Field(..., min_length=1)
-    date: str
+    date: YearMonth
     url: Optional[HttpUrl] = None
     description: Optional[str] = None
 
-    @field_validator("date")
-    def validate_date(cls, v):
-        """Validate date format as YYYY-MM."""
-        try:
-            datetime.strptime(v, "%Y-%m")
-            return v
-        except ValueError:
-            raise ValueError("Invalid date format. Use YYYY-MM")
+
+# Sections of resume.json in the order of the validated resume data, and
+# whether each one is a mapping of entries
+RESUME_SECTIONS = (
+    ("ApplicationInfo", ApplicationInfo, False),
+    ("General", General, False),
+    ("Jobs", Jobs, True),
+    ("Education", Education, True),
+    ("LicensesAndCertifications", LicensesAndCertifications, True),
+    ("VolunteerExperience", VolunteerExperience, True),
+    ("Projects", Projects, True),
+    ("HonorsAndAwards", HonorsAndAwards, True),
+    ("Languages", Languages, True),
+    ("Articles", Articles, True),
+)
+
+
+class ResumeDocument(TypedDict):
+    """Layout of resume.json: the application, the person, and named entries per section."""
+
+    ApplicationInfo: ApplicationInfo
+    General: General
+    Jobs: Dict[str, Jobs]
+    Education: Dict[str, Education]
+    LicensesAndCertifications: Dict[str, LicensesAndCertifications]
+    VolunteerExperience: Dict[str, VolunteerExperience]
+    Projects: Dict[str, Projects]
+    HonorsAndAwards: Dict[str, HonorsAndAwards]
+    Languages: Dict[str, Languages]
+    Articles: Dict[str, Articles]
+
+
+RESUME_ADAPTER = TypeAdapter(ResumeDocument)
+
+
+def document_sections(document: dict) -> tuple:
+    """Return the sections of a validated document as the validated resume data.
+
+    Args:
+        document (dict): Result of `RESUME_ADAPTER.validate_python`.
+
+    Returns:
+        tuple: Validated resume data sections (application_info, general, jobs, etc.),
+            with the entries of each section in file order.
+    """
+    return tuple(
+        list(document[key].values()) if is_list else document[key]
+        for key, _, is_list in RESUME_SECTIONS
+    )
+
+
+def first_entry_error(error: ValidationError, resume_data: dict) -> ValidationError:
+    """Return the validation error of the first invalid section or entry alone.
+
+    Document errors are located from the document root and list every invalid
+    entry. Validating the first invalid one with its own model again gives
+    the error a per-entry validation reports, which is what users are shown.
+
+    Args:
+        error (ValidationError): Error raised by `RESUME_ADAPTER`.
+        resume_data (dict): The data that failed validation.
+
+    Returns:
+        ValidationError: The error of the first invalid section or entry, or
+            `error` itself if it is not about a section or entry model.
+    """
+    loc = error.errors()[0]["loc"]
+    models: dict = {key: (model, is_list) for key, model, is_list in RESUME_SECTIONS}
+    model, is_list = models.get(loc[0], (None, False))
+    if model is None or (is_list and len(loc) < 2):
+        return error
+    data = resume_data[loc[0]]
+    if is_list:
+        data = data[loc[1]]
+    try:
+        model.model_validate(data)
+    except ValidationError as entry_error:
+        return entry_error
+    return error
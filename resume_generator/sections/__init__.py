@@ -1,15 +1,15 @@
-"""Resume section handlers."""
+"""Resume section handlers.
 
-from resume_generator.sections.awards import AwardsSection
-from resume_generator.sections.base import BaseSection
-from resume_generator.sections.certifications import CertificationsSection
-from resume_generator.sections.education import EducationSection
-from resume_generator.sections.general import GeneralSection
-from resume_generator.sections.jobs import JobsSection
-from resume_generator.sections.languages import LanguagesSection
-from resume_generator.sections.projects import ProjectsSection
-from resume_generator.sections.volunteering import VolunteeringSection
-from resume_generator.sections.articles import ArticlesSection
+Handler classes are imported on first access, so that rendering only loads the
+modules of the sections enabled in the configuration (see `registry`).
+"""
+
+import importlib
+
+from resume_generator.sections.registry import SECTIONS
+
+_MODULES = {class_name: module for module, class_name, _ in SECTIONS.values()}
+_MODULES["BaseSection"] = "resume_generator.sections.base"
 
 __all__ = [
     "AwardsSection",
@@ -23,3 +23,11 @@ __all__ = [
     "VolunteeringSection",
     "ArticlesSection",
 ]
+
+
+def __getattr__(name):
+    """Import a section handler class on first access."""
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module), name)
@@ -28,20 +28,27 @@ class ArticlesSection(BaseSection):
         # Add each article entry
         for article in self.data:
             if article.include:
-                # Add article title
-                self.add_cell(article.title, "title", height=5)
+                self.add_entry(article)
 
-                # Add URL if available
-                if article.url:
-                    self.set_style("link")
-                    self.pdf.write_html(f'<a href="{article.url}">{article.url}</a>')
+    def draw_entry(self, article: Articles) -> None:
+        """Add a single article entry to the PDF.
 
-                # Add publication date
-                self.add_multi_cell(article.date, "details")
+        Args:
+            article (Articles): The article entry.
+        """
+        # Add article title
+        self.add_cell(article.title, "title", height=5)
+
+        # Add URL if available
+        if article.url:
+            self.add_link(article.url)
+
+        # Add publication date
+        self.add_multi_cell(article.date, "details")
 
-                # Add description if available
-                if article.description:
-                    self.add_multi_cell(article.description, "details")
+        # Add description if available
+        if article.description:
+            self.add_rich_text(article.description, "details")
 
-                # Add spacing between articles
-                self.add_cell("", "details", height=5)
+        # Add spacing between articles
+        self.add_cell("", "details", height=5)
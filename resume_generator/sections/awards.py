@@ -28,17 +28,25 @@ class AwardsSection(BaseSection):
         # Add each award entry
         for award in self.data:
             if award.include:
-                # Add award title
-                self.add_cell(award.title, "title", height=5)
+                self.add_entry(award)
 
-                # Add issuer
-                self.add_multi_cell(award.issuer, "issuer")
+    def draw_entry(self, award: HonorsAndAwards) -> None:
+        """Add a single award entry to the PDF.
 
-                # Add issue date
-                self.add_multi_cell(award.issued_on, "details")
+        Args:
+            award (HonorsAndAwards): The award entry.
+        """
+        # Add award title
+        self.add_cell(award.title, "title", height=5)
+
+        # Add issuer
+        self.add_multi_cell(award.issuer, "issuer")
+
+        # Add issue date
+        self.add_multi_cell(award.issued_on, "details")
 
-                # Add description
-                self.add_multi_cell(award.description, "details")
+        # Add description
+        self.add_rich_text(award.description, "details")
 
-                # Add spacing between awards
-                self.add_cell("", "details", height=5)
+        # Add spacing between awards
+        self.add_cell("", "details", height=5)
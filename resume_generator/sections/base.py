@@ -1,8 +1,12 @@
 """Base class for resume sections."""
 
-from fpdf import FPDF
-from fpdf import XPos
-from fpdf import YPos
+from resume_generator.fragments import fingerprint
+from resume_generator.markup import has_markup
+from resume_generator.markup import parse_inline
+from resume_generator.pdf import ResumePDF
+from resume_generator.profiling import span
+from resume_generator.profiling import traced
+from resume_generator.styles.compiled import compile_styles
 
 
 class BaseSection:
@@ -10,13 +14,22 @@ class BaseSection:
 
     This class provides common functionality for all resume sections, including
     methods for setting fonts and adding content to the PDF.
+
+    Font sizes, the cell height and explicit cell heights are multiplied by the
+    template's `scale` (1 by default), which is how a resume is fitted to a
+    page count. The styles are compiled with the scale once, when the handler
+    is created.
+
+    Content is drawn through `ResumePDF.play`, so that when the document has a
+    fragment cache, a section or entry rendered before is replayed instead of
+    being laid out again.
     """
 
-    def __init__(self, pdf: FPDF, data: dict, styles: dict, config: dict):
+    def __init__(self, pdf: ResumePDF, data: dict, styles: dict, config: dict):
         """Initialize the section handler.
 
         Args:
-            pdf (FPDF): The PDF document object.
+            pdf (ResumePDF): The PDF document object.
             data (dict): The section-specific data.
             styles (dict): Style definitions for this section.
             config (dict): Template configuration settings.
@@ -24,36 +37,41 @@ class BaseSection:
         self.pdf = pdf
         self.data = data
         self.styles = styles
+        self.scale = config.get("scale", 1)
         self.cell_width = config["cell_width"]
-        self.cell_height = config["cell_height"]
+        self.cell_height = config["cell_height"] * self.scale
+        self.text_styles = compile_styles(styles, self.scale)
+
+    @property
+    def name(self) -> str:
+        """Name of the section, e.g. "jobs" for JobsSection."""
+        return type(self).__name__.removesuffix("Section").lower()
 
     def set_style(self, style_key: str) -> None:
-        """Set the font according to the specified style.
+        """Set the font and text colour according to the specified style.
 
         Args:
             style_key (str): Key to look up in the styles dictionary.
         """
-        style = self.styles[style_key]
-        font_style = style.get("style", "")
-        self.pdf.set_font(style["font"], style=font_style, size=style["size"])
+        style = self.text_styles[style_key]
+        self.pdf.play(("style", style_key))
+        self.pdf.play(style.font_op)
+        self.pdf.play(style.color_op)
 
+    @traced
     def add_cell(self, text: str, style_key: str, height: float = None) -> None:
         """Add a cell with the specified text and style.
 
         Args:
             text (str): The text to add.
             style_key (str): Key to look up in the styles dictionary.
-            height (float, optional): Cell height. Defaults to self.cell_height.
+            height (float, optional): Cell height before scaling. Defaults to self.cell_height.
         """
         self.set_style(style_key)
-        self.pdf.cell(
-            self.cell_width,
-            height or self.cell_height,
-            text=text,
-            new_x=XPos.LMARGIN,
-            new_y=YPos.NEXT,
-        )
+        height = height * self.scale if height else self.cell_height
+        self.pdf.play(("cell", self.cell_width, height, text))
 
+    @traced
     def add_multi_cell(self, text: str, style_key: str) -> None:
         """Add a multi-line cell with the specified text and style.
 
@@ -62,14 +80,33 @@ class BaseSection:
             style_key (str): Key to look up in the styles dictionary.
         """
         self.set_style(style_key)
-        self.pdf.multi_cell(
-            self.cell_width,
-            self.cell_height,
-            text=text,
-            new_x=XPos.LMARGIN,
-            new_y=YPos.NEXT,
-        )
+        self.pdf.play(("text", self.cell_width, self.cell_height, text, None))
 
+    @traced
+    def add_rich_text(self, text: str, style_key: str) -> None:
+        """Add a multi-line cell with inline markup for bold text and links.
+
+        See `resume_generator.markup` for the markup, which is only parsed when
+        the document has `inline_markup` set. Bold runs use the bold family of
+        the style's font; links are underlined in the style's colour. Text
+        without markup is drawn like `add_multi_cell`.
+
+        Args:
+            text (str): The text to add.
+            style_key (str): Key to look up in the styles dictionary.
+        """
+        if not self.pdf.inline_markup:
+            self.add_multi_cell(text, style_key)
+            return
+        runs = parse_inline(text)
+        if not has_markup(runs):
+            self.add_multi_cell(text, style_key)
+            return
+        self.set_style(style_key)
+        bold_family = self.pdf.bold_family(self.text_styles[style_key].font)
+        self.pdf.play(("inline", self.cell_width, self.cell_height, runs, bold_family))
+
+    @traced
     def format_labeled_text(self, label: str, value: str, style_key: str) -> None:
         """Add a cell with a label followed by text.
 
@@ -79,13 +116,103 @@ class BaseSection:
             style_key (str): Key to look up in the styles dictionary.
         """
         self.set_style(style_key)
-        self.pdf.multi_cell(
+        self.pdf.play(("text", self.cell_width, self.cell_height, f"{label} {value}", None))
+
+    @traced
+    def add_link(self, url, style_key: str = "link") -> None:
+        """Add a clickable URL, underlined and wrapped over as many lines as it needs.
+
+        Args:
+            url: The URL to add.
+            style_key (str): Key to look up in the styles dictionary.
+        """
+        self.set_style(style_key)
+        self.pdf.play(("link", str(url)))
+
+    def fragment_key(self, kind: str, data) -> str:
+        """Fingerprint a section or entry with the styles, page geometry and font files.
+
+        Args:
+            kind (str): "section" or "entry".
+            data: The models rendered by the fragment.
+
+        Returns:
+            str: The fragment cache key.
+        """
+        pdf = self.pdf
+        geometry = [
+            pdf.w,
+            pdf.h,
+            pdf.k,
+            pdf.l_margin,
+            pdf.r_margin,
+            pdf.t_margin,
+            pdf.c_margin,
             self.cell_width,
             self.cell_height,
-            text=f"{label} {value}",
-            new_x=XPos.LMARGIN,
-            new_y=YPos.NEXT,
-        )
+            self.scale,
+            pdf.inline_markup,
+        ]
+        fonts = [sorted(pdf.font_files.items()), str(pdf.fonts_dir), pdf.font_stamps()]
+        return fingerprint(type(self).__name__, kind, data, self.styles, geometry, fonts)
+
+    def render_fragment(self, kind: str, data, draw) -> None:
+        """Draw content, replaying its cached fragment if there is one.
+
+        The content is framed by "begin" and "end" operations, which tell the
+        document's other renderers where sections and entries start and end.
+
+        Args:
+            kind (str): "section" or "entry".
+            data: The models rendered by `draw`, used in the fingerprint.
+            draw (callable): Function drawing the content on a cache miss.
+        """
+        pdf = self.pdf
+
+        def draw_block():
+            pdf.play(("begin", kind, self.name))
+            draw()
+            pdf.play(("end", kind))
+
+        cache = pdf.fragment_cache
+        if cache is None:
+            draw_block()
+            return
+        key = self.fragment_key(kind, data)
+        fragment = cache.get(key)
+        if fragment is not None:
+            pdf.replay(fragment)
+            return
+        with pdf.record_fragment() as recorder:
+            draw_block()
+        cache.put(key, recorder.fragment())
+
+    def render(self) -> None:
+        """Add the section to the PDF, replaying it from the fragment cache if possible."""
+        with span(f"{type(self).__name__}.add_section"):
+            self.render_fragment("section", self.data, self.add_section)
+
+    def add_entry(self, entry) -> None:
+        """Add one entry of the section, replaying it from the fragment cache if possible.
+
+        Args:
+            entry: The entry model, drawn by `draw_entry`.
+        """
+        self.render_fragment("entry", entry, lambda: self.draw_entry(entry))
+
+    def draw_entry(self, entry) -> None:
+        """Draw one entry of the section.
+
+        Sections made of a list of entries implement this and call `add_entry`
+        for each one from `add_section`.
+
+        Args:
+            entry: The entry model.
+
+        Raises:
+            NotImplementedError: If the subclass doesn't implement this method.
+        """
+        raise NotImplementedError("Subclasses with entries must implement draw_entry()")
 
     def add_section(self) -> None:
         """Add the section to the PDF.
@@ -30,15 +30,23 @@ class CertificationsSection(BaseSection):
         # Add each certification entry
         for cert in self.data:
             if cert.include:
-                # Add certification name
-                self.add_cell(cert.name, "name", height=5)
+                self.add_entry(cert)
 
-                # Add issuer
-                self.add_multi_cell(cert.issuer, "issuer")
+    def draw_entry(self, cert: LicensesAndCertifications) -> None:
+        """Add a single certification entry to the PDF.
 
-                # Add issue date and credential ID
-                self.add_multi_cell(cert.issued_on, "details")
-                self.add_multi_cell(cert.credential_id, "details")
+        Args:
+            cert (LicensesAndCertifications): The certification entry.
+        """
+        # Add certification name
+        self.add_cell(cert.name, "name", height=5)
+
+        # Add issuer
+        self.add_multi_cell(cert.issuer, "issuer")
+
+        # Add issue date and credential ID
+        self.add_multi_cell(cert.issued_on, "details")
+        self.add_multi_cell(cert.credential_id, "details")
 
-                # Add spacing between certifications
-                self.add_cell("", "details", height=5)
+        # Add spacing between certifications
+        self.add_cell("", "details", height=5)
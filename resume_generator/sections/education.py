@@ -28,30 +28,38 @@ class EducationSection(BaseSection):
         # Add each education entry
         for school in self.data:
             if school.include:
-                # Add school name
-                self.add_cell(school.school, "school", height=5)
+                self.add_entry(school)
 
-                # Add field of study
-                self.add_cell(school.field, "field")
+    def draw_entry(self, school: Education) -> None:
+        """Add a single education entry to the PDF.
 
-                # Add duration
-                self.add_multi_cell(f"{school.duration[0]} - {school.duration[1]}", "details")
+        Args:
+            school (Education): The education entry.
+        """
+        # Add school name
+        self.add_cell(school.school, "school", height=5)
+
+        # Add field of study
+        self.add_cell(school.field, "field")
+
+        # Add duration
+        self.add_multi_cell(f"{school.duration[0]} - {school.duration[1]}", "details")
 
-                # Add degree if available
-                if school.degree:
-                    self.add_multi_cell(school.degree, "details")
+        # Add degree if available
+        if school.degree:
+            self.add_multi_cell(school.degree, "details")
 
-                # Add GPA if available
-                if school.gpa:
-                    self.add_multi_cell(school.gpa, "details")
+        # Add GPA if available
+        if school.gpa:
+            self.add_multi_cell(school.gpa, "details")
 
-                # Add activities and societies if available
-                if school.activities_and_societies:
-                    self.add_multi_cell(', '.join(school.activities_and_societies), "details")
+        # Add activities and societies if available
+        if school.activities_and_societies:
+            self.add_multi_cell(', '.join(school.activities_and_societies), "details")
 
-                # Add description if available
-                if school.description:
-                    self.add_multi_cell(school.description, "details")
+        # Add description if available
+        if school.description:
+            self.add_rich_text(school.description, "details")
 
-                # Add spacing between schools
-                self.add_cell("", "details", height=5)
+        # Add spacing between schools
+        self.add_cell("", "details", height=5)
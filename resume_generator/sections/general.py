@@ -36,17 +36,14 @@ class GeneralSection(BaseSection):
 
         # Add URLs as clickable links with proper spacing
         if self.data.portfolio:
-            self.set_style("link")
-            self.pdf.write_html(f'<a href="{self.data.portfolio}">{self.data.portfolio}</a>')
+            self.add_link(self.data.portfolio)
             self.add_cell("", "contact", height=1)  # Add spacing after link
         if self.data.linkedin:
-            self.set_style("link")
-            self.pdf.write_html(f'<a href="{self.data.linkedin}">{self.data.linkedin}</a>')
+            self.add_link(self.data.linkedin)
             self.add_cell("", "contact", height=1)  # Add spacing after link
         if self.data.github:
-            self.set_style("link")
-            self.pdf.write_html(f'<a href="{self.data.github}">{self.data.github}</a>')
+            self.add_link(self.data.github)
 
         # Add description header and content
         self.add_cell("Description", "description_header", height=8)
-        self.add_multi_cell(self.data.description, "description")
+        self.add_rich_text(self.data.description, "description")
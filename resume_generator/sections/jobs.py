@@ -28,25 +28,33 @@ class JobsSection(BaseSection):
         # Add each job entry
         for job in self.data:
             if job.include:
-                # Add job title
-                self.add_cell(job.title, "title", height=5)
+                self.add_entry(job)
 
-                # Add company name
-                self.add_cell(job.company, "company")
+    def draw_entry(self, job: Jobs) -> None:
+        """Add a single job entry to the PDF.
 
-                # Add employment type and duration
-                self.add_multi_cell(job.employment_type, "details")
-                self.add_multi_cell(f"{job.duration[0]} - {job.duration[1]}", "details")
+        Args:
+            job (Jobs): The job entry.
+        """
+        # Add job title
+        self.add_cell(job.title, "title", height=5)
+
+        # Add company name
+        self.add_cell(job.company, "company")
+
+        # Add employment type and duration
+        self.add_multi_cell(job.employment_type, "details")
+        self.add_multi_cell(f"{job.duration[0]} - {job.duration[1]}", "details")
 
-                # Add description if available
-                if job.description:
-                    self.add_multi_cell(job.description, "details")
+        # Add description if available
+        if job.description:
+            self.add_rich_text(job.description, "details")
 
-                # Add skills if available
-                if job.skills:
-                    self.format_labeled_text(
-                        "Skills:", ", ".join(job.skills), "details"
-                    )
+        # Add skills if available
+        if job.skills:
+            self.format_labeled_text(
+                "Skills:", ", ".join(job.skills), "details"
+            )
 
-                # Add spacing between jobs
-                self.add_cell("", "details", height=5)
+        # Add spacing between jobs
+        self.add_cell("", "details", height=5)
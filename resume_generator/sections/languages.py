@@ -28,11 +28,19 @@ class LanguagesSection(BaseSection):
         # Add each language entry
         for language in self.data:
             if language.include:
-                # Add language name
-                self.add_cell(language.language, "language", height=5)
+                self.add_entry(language)
 
-                # Add proficiency level
-                self.add_multi_cell(language.proficiency, "proficiency")
+    def draw_entry(self, language: Languages) -> None:
+        """Add a single language entry to the PDF.
 
-                # Add spacing between languages
-                self.add_cell("", "proficiency", height=2)
+        Args:
+            language (Languages): The language entry.
+        """
+        # Add language name
+        self.add_cell(language.language, "language", height=5)
+
+        # Add proficiency level
+        self.add_multi_cell(language.proficiency, "proficiency")
+
+        # Add spacing between languages
+        self.add_cell("", "proficiency", height=2)
@@ -28,27 +28,34 @@ class ProjectsSection(BaseSection):
         # Add each project entry
         for project in self.data:
             if project.include:
-                # Add project name
-                self.add_cell(project.name, "name", height=5)
-
-                # Add project link if available
-                if project.link:
-                    self.set_style("link")
-                    self.pdf.write_html(f'<a href="{project.link}">{project.link}</a>')
-
-                # Add duration
-                self.add_multi_cell(
-                    f"{project.duration[0]} - {project.duration[1]}", "details"
-                )
-
-                # Add description
-                self.add_multi_cell(project.description, "details")
-
-                # Add skills if available
-                if project.skills:
-                    self.format_labeled_text(
-                        "Skills:", ", ".join(project.skills), "details"
-                    )
-
-                # Add spacing between projects
-                self.add_cell("", "details", height=5)
+                self.add_entry(project)
+
+    def draw_entry(self, project: Projects) -> None:
+        """Add a single project entry to the PDF.
+
+        Args:
+            project (Projects): The project entry.
+        """
+        # Add project name
+        self.add_cell(project.name, "name", height=5)
+
+        # Add project link if available
+        if project.link:
+            self.add_link(project.link)
+
+        # Add duration
+        self.add_multi_cell(
+            f"{project.duration[0]} - {project.duration[1]}", "details"
+        )
+
+        # Add description
+        self.add_rich_text(project.description, "details")
+
+        # Add skills if available
+        if project.skills:
+            self.format_labeled_text(
+                "Skills:", ", ".join(project.skills), "details"
+            )
+
+        # Add spacing between projects
+        self.add_cell("", "details", height=5)
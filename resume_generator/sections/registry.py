@@ -0,0 +1,121 @@
+"""Registry of the resume sections that the configuration can enable.
+
+`sections` in config.yaml lists the enabled sections in the order they are
+drawn. A section's handler module is only imported when the section is
+enabled, and a section with no included entries is skipped entirely, without
+drawing its header.
+"""
+
+import importlib
+
+# Section name: (handler module, handler class, index of its data in the resume data)
+SECTIONS = {
+    "general": ("resume_generator.sections.general", "GeneralSection", 1),
+    "jobs": ("resume_generator.sections.jobs", "JobsSection", 2),
+    "education": ("resume_generator.sections.education", "EducationSection", 3),
+    "certifications": ("resume_generator.sections.certifications", "CertificationsSection", 4),
+    "volunteering": ("resume_generator.sections.volunteering", "VolunteeringSection", 5),
+    "projects": ("resume_generator.sections.projects", "ProjectsSection", 6),
+    "awards": ("resume_generator.sections.awards", "AwardsSection", 7),
+    "languages": ("resume_generator.sections.languages", "LanguagesSection", 8),
+    "articles": ("resume_generator.sections.articles", "ArticlesSection", 9),
+}
+
+# Sections drawn when the configuration does not list them
+DEFAULT_SECTIONS = ["general", "projects", "articles", "jobs"]
+
+
+def section_names(names=None) -> list:
+    """Return the enabled sections, checking that they exist.
+
+    Args:
+        names (list, optional): Section names from the configuration.
+            Defaults to DEFAULT_SECTIONS.
+
+    Returns:
+        list: The enabled section names, in drawing order.
+
+    Raises:
+        ValueError: If a section name is unknown.
+    """
+    if names is None:
+        return list(DEFAULT_SECTIONS)
+    unknown = [name for name in names if name not in SECTIONS]
+    if unknown:
+        raise ValueError(
+            f"Unknown sections in configuration: {', '.join(map(str, unknown))} "
+            f"(available: {', '.join(SECTIONS)})"
+        )
+    return list(names)
+
+
+def load_section(name: str) -> type:
+    """Import the handler class of a section.
+
+    Args:
+        name (str): Section name.
+
+    Returns:
+        type: The BaseSection subclass drawing the section.
+    """
+    module_name, class_name, _ = SECTIONS[name]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def has_content(data) -> bool:
+    """Return whether section data has anything to draw besides a header.
+
+    Args:
+        data: The section's model, or its list of entries.
+
+    Returns:
+        bool: False for a list of entries none of which is included.
+    """
+    if isinstance(data, list):
+        return any(entry.include for entry in data)
+    return data is not None
+
+
+def drawn_sections(resume_data: tuple, names=None) -> list:
+    """Return the data of the enabled sections that have content.
+
+    Args:
+        resume_data (tuple): Validated resume data sections.
+        names (list, optional): Enabled section names, in drawing order.
+
+    Returns:
+        list: The data of each section `build_sections` draws, in drawing order.
+
+    Raises:
+        ValueError: If a section name is unknown.
+    """
+    sections = []
+    for name in section_names(names):
+        data = resume_data[SECTIONS[name][2]]
+        if has_content(data):
+            sections.append(data)
+    return sections
+
+
+def build_sections(pdf, template_config: dict, resume_data: tuple, styles: dict, names=None):
+    """Create the handlers of the enabled sections that have content.
+
+    Args:
+        pdf (ResumePDF): The PDF document object.
+        template_config (dict): Template configuration settings.
+        resume_data (tuple): Validated resume data sections.
+        styles (dict): Style definitions for the sections.
+        names (list, optional): Enabled section names, in drawing order.
+
+    Returns:
+        list: Section handlers, in drawing order.
+
+    Raises:
+        ValueError: If a section name is unknown.
+    """
+    sections = []
+    for name in section_names(names):
+        data = resume_data[SECTIONS[name][2]]
+        if has_content(data):
+            sections.append(load_section(name)(pdf, data, styles, template_config))
+    return sections
@@ -30,22 +30,30 @@ class VolunteeringSection(BaseSection):
         # Add each volunteer experience entry
         for experience in self.data:
             if experience.include:
-                # Add organization name
-                self.add_cell(experience.organization, "organization", height=5)
+                self.add_entry(experience)
 
-                # Add role
-                self.add_cell(experience.role, "role")
+    def draw_entry(self, experience: VolunteerExperience) -> None:
+        """Add a single volunteer experience entry to the PDF.
 
-                # Add cause and duration
-                self.add_multi_cell(experience.cause, "details")
-                self.add_multi_cell(
-                    f"{experience.duration[0]} - {experience.duration[1]}",
-                    "details"
-                )
+        Args:
+            experience (VolunteerExperience): The volunteer experience entry.
+        """
+        # Add organization name
+        self.add_cell(experience.organization, "organization", height=5)
+
+        # Add role
+        self.add_cell(experience.role, "role")
+
+        # Add cause and duration
+        self.add_multi_cell(experience.cause, "details")
+        self.add_multi_cell(
+            f"{experience.duration[0]} - {experience.duration[1]}",
+            "details"
+        )
 
-                # Add description if available
-                if experience.description:
-                    self.add_multi_cell(experience.description, "details")
+        # Add description if available
+        if experience.description:
+            self.add_rich_text(experience.description, "details")
 
-                # Add spacing between experiences
-                self.add_cell("", "details", height=5)
+        # Add spacing between experiences
+        self.add_cell("", "details", height=5)
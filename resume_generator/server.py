@@ -0,0 +1,470 @@
+"""Local HTTP service rendering resumes on demand with a pool of warm workers.
+
+Starting `python -m resume_generator.main` for every PDF spends most of its
+time importing modules and loading fonts. The service keeps a pool of worker
+processes that load the configuration, styles and fonts once, and renders
+each request in one of them.
+
+Endpoints:
+    POST /render    Body: the resume JSON, or `{"resume": ..., "config": ...}`
+                    with configuration overrides. Returns the PDF.
+    GET /health     Pool size and current load, as JSON.
+
+At most `workers` renders run at a time and `queue_size` more wait for a
+worker; further requests are rejected with 503 until the load drops. The
+timeout applies separately to waiting for a worker and to the render itself.
+A request that does not get a worker in time is answered with 504 and nothing
+else is affected. A render that takes longer than the timeout is answered
+with 504, and its worker is killed so that it does not keep its slot: the
+pool is replaced, and the renders running in its other workers are run again
+in the new pool.
+
+Usage:
+    python -m resume_generator.server [--port 8000] [--workers 0] [--queue-size 8]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from urllib.parse import quote
+
+from resume_generator.font_cache import DEFAULT_CACHE_DIR
+from resume_generator.font_cache import DEFAULT_FONTS_DIR
+from resume_generator.font_cache import FontCache
+from resume_generator.font_coverage import CoverageIndex
+from resume_generator.fragments import fragment_cache_from_config
+from resume_generator.main import get_fallback_fonts
+from resume_generator.main import get_output_path
+from resume_generator.main import load_config
+from resume_generator.main import render_resume
+from resume_generator.main import validate_resume_data
+from resume_generator.styles import modern_styles
+from resume_generator.validation import ValidationCache
+
+# Configuration keys a request may override; the others control files on disk,
+# including the font files of the templates
+OVERRIDABLE_KEYS = ("template", "file_name_template", "deterministic_output")
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class ServiceBusy(Exception):
+    """Raised when every worker is busy and the queue is full."""
+
+
+def merge_config(config: dict, overrides: dict) -> dict:
+    """Apply configuration overrides, merging nested dictionaries.
+
+    Args:
+        config (dict): Base configuration.
+        overrides (dict): Values replacing those of the base configuration.
+
+    Returns:
+        dict: A new configuration; the base one is left unchanged.
+    """
+    merged = dict(config)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            value = merge_config(merged[key], value)
+        merged[key] = value
+    return merged
+
+
+class ResumeService:
+    """Renders resumes from JSON data, keeping fonts and caches warm."""
+
+    def __init__(self, config: dict, styles: dict = modern_styles):
+        """Load everything shared by the requests.
+
+        Args:
+            config (dict): Base configuration.
+            styles (dict): Style definitions for the sections.
+        """
+        self.config = config
+        self.styles = styles
+        self.font_cache = FontCache(config.get("font_cache_directory", DEFAULT_CACHE_DIR))
+        self.fragment_cache = fragment_cache_from_config(config, default="memory")
+        # Requests mostly send the same sections again
+        self.validation_cache = ValidationCache()
+        self.coverage: CoverageIndex | None = None
+
+    def warm(self) -> None:
+        """Load the coverage index and the fonts of every template."""
+        self.coverage = CoverageIndex.load(DEFAULT_FONTS_DIR, self.font_cache)
+        for template_config in self.config["templates"].values():
+            for family in template_config["fonts"].values():
+                font_path = os.path.join(DEFAULT_FONTS_DIR, f"{family}.ttf")
+                if os.path.exists(font_path):
+                    self.font_cache.load(font_path)
+
+    def render(self, resume_json, overrides: dict | None = None) -> tuple:
+        """Render a resume to PDF bytes.
+
+        Args:
+            resume_json (dict): Resume data with the same layout as resume.json.
+            overrides (dict, optional): Configuration overrides.
+
+        Returns:
+            tuple: (file name, PDF bytes).
+
+        Raises:
+            ValueError: If the overrides or the resume data are invalid, e.g. an
+                unknown template or characters that no bundled font can draw.
+        """
+        overrides = overrides or {}
+        if not isinstance(overrides, dict):
+            raise ValueError("Configuration overrides must be an object")
+        unknown = sorted(set(overrides) - set(OVERRIDABLE_KEYS))
+        if unknown:
+            raise ValueError(f"Configuration keys cannot be overridden: {', '.join(unknown)}")
+        template = overrides.get("template", self.config["template"])
+        if not isinstance(template, str) or template not in self.config["templates"]:
+            raise ValueError(f"Unknown template: {template}")
+        config = merge_config(self.config, overrides)
+        resume_data = validate_resume_data(
+            resume_json, self.validation_cache, config.get("defer_excluded_validation", False)
+        )
+        # Selected here, so that characters no bundled font can draw are
+        # reported as invalid input rather than as a PDF setup failure
+        if self.coverage is None:
+            self.coverage = CoverageIndex.load(DEFAULT_FONTS_DIR, self.font_cache)
+        fallback_fonts = get_fallback_fonts(
+            config["templates"][template],
+            self.font_cache,
+            resume_data,
+            self.coverage,
+            config.get("sections"),
+        )
+        pdf = render_resume(
+            resume_data,
+            config,
+            styles=self.styles,
+            font_cache=self.font_cache,
+            fragment_cache=self.fragment_cache,
+            fallback_fonts=fallback_fonts,
+        )
+        application_info, general = resume_data[:2]
+        file_name = os.path.basename(get_output_path(config, "", general, application_info))
+        return file_name, pdf
+
+
+# Service of the current worker process, set up by `_init_worker`
+_worker_service: ResumeService | None = None
+
+
+def _init_worker(config: dict, styles: dict) -> None:
+    """Set up and warm the service of a worker process."""
+    global _worker_service
+    _worker_service = ResumeService(config, styles)
+    _worker_service.warm()
+
+
+def _render_in_worker(resume_json, overrides: dict | None) -> tuple:
+    """Render one request with the service of the worker process."""
+    if _worker_service is None:
+        raise RuntimeError("The worker process was not set up")
+    return _worker_service.render(resume_json, overrides)
+
+
+class WorkerPool:
+    """Pool of warm worker processes with a bounded number of pending renders."""
+
+    def __init__(
+        self, config: dict, styles: dict = modern_styles, workers: int = 0, queue_size: int = 8
+    ):
+        """Start the worker processes.
+
+        Args:
+            config (dict): Base configuration.
+            styles (dict): Style definitions for the sections.
+            workers (int): Number of worker processes; 0 uses one per CPU core.
+            queue_size (int): Renders allowed to wait for a busy worker.
+        """
+        self.config = config
+        self.styles = styles
+        self.workers = workers or os.cpu_count() or 1
+        self.capacity = self.workers + queue_size
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        # Renders wait for a free worker here rather than in the executor's
+        # queue, so that their timeout only starts when they do
+        self._idle_workers = threading.BoundedSemaphore(self.workers)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self._executor = self._start()
+
+    def _start(self) -> ProcessPoolExecutor:
+        # Workers are spawned rather than forked, since the server runs threads
+        executor = ProcessPoolExecutor(
+            self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.config, self.styles),
+        )
+        # Start every worker now, so that the first requests find them warm
+        for future in [executor.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+        return executor
+
+    def render(
+        self, resume_json, overrides: dict | None = None, timeout: float | None = None
+    ) -> tuple:
+        """Render a resume in a worker process.
+
+        Args:
+            resume_json (dict): Resume data with the same layout as resume.json.
+            overrides (dict, optional): Configuration overrides.
+            timeout (float, optional): Seconds to wait for the PDF.
+
+        Returns:
+            tuple: (file name, PDF bytes).
+
+        Raises:
+            ServiceBusy: If every worker is busy and the queue is full.
+            TimeoutError: If no worker becomes free within the timeout, or the
+                render takes longer than the timeout; in the latter case its
+                worker is killed and the pool replaced.
+            ValueError: If the overrides or the resume data are invalid.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise ServiceBusy("Every worker is busy and the queue is full")
+        with self._lock:
+            self.in_flight += 1
+        try:
+            return self._run(_render_in_worker, (resume_json, overrides), timeout)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+    def _run(self, task, args: tuple, timeout: float | None) -> tuple:
+        """Run a task in a free worker, again in a new pool if its pool was replaced meanwhile."""
+        if not self._idle_workers.acquire(timeout=timeout):
+            raise TimeoutError("No worker became free in time")
+        try:
+            for _ in range(2):
+                with self._lock:
+                    executor = self._executor
+                try:
+                    future = executor.submit(task, *args)
+                    return future.result(timeout)
+                except TimeoutError:
+                    # A task that did not start yet is dropped; a running one
+                    # can only be stopped by killing its worker
+                    if not future.cancel():
+                        self._restart(executor, kill=True)
+                    raise
+                except BrokenProcessPool:
+                    with self._lock:
+                        replaced = self._executor is not executor
+                    if not replaced:
+                        self._restart(executor)
+                        raise RuntimeError("Worker process died")
+            raise RuntimeError("Worker process died")
+        finally:
+            self._idle_workers.release()
+
+    def _restart(self, broken: ProcessPoolExecutor, kill: bool = False) -> None:
+        """Replace a pool, unless another request already did.
+
+        The new pool is started and warmed before it is swapped in, without
+        holding the lock, so that other renders are not blocked meanwhile.
+
+        Args:
+            broken (ProcessPoolExecutor): The pool to replace.
+            kill (bool): Kill its workers, e.g. one running a render that timed out.
+                Renders running in the other workers are then run again in the new pool.
+        """
+        with self._lock:
+            if self._executor is not broken:
+                return
+        executor = self._start()
+        with self._lock:
+            replaced = self._executor is not broken
+            if not replaced:
+                self._executor = executor
+        if replaced:
+            # Another request replaced it while this pool was starting
+            executor.shutdown(wait=False)
+            return
+        if kill:
+            # A process pool cannot stop a running task, and losing any of its
+            # workers breaks it anyway, so all of them are killed
+            for process in list(broken._processes.values()):
+                process.kill()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def health(self) -> dict:
+        """Return the size and load of the pool.
+
+        Returns:
+            dict: Worker count, renders in flight and capacity.
+        """
+        return {
+            "status": "ok",
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "capacity": self.capacity,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        self._executor.shutdown(cancel_futures=True)
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler of the render service; the server holds the pool and render timeout."""
+
+    def send_json(self, status: int, data: dict) -> None:
+        """Send a JSON response.
+
+        Args:
+            status (int): HTTP status code.
+            data (dict): Response body.
+        """
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        """Report the health of the worker pool on `/health`."""
+        if self.path == "/health":
+            self.send_json(200, self.server.pool.health())
+        else:
+            self.send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        """Render the resume posted to `/render` and send the PDF."""
+        if self.path != "/render":
+            self.send_json(404, {"error": "Not found"})
+            return
+        if self.headers.get("Content-Length") is None:
+            self.send_json(411, {"error": "Content-Length required"})
+            return
+        try:
+            length = int(self.headers["Content-Length"])
+            if length < 0:
+                raise ValueError(length)
+        except ValueError:
+            self.send_json(400, {"error": "Invalid Content-Length"})
+            return
+        if length > MAX_BODY_BYTES:
+            self.send_json(413, {"error": "Request body too large"})
+            return
+        try:
+            body = json.loads(self.rfile.read(length))
+        except ValueError as e:
+            self.send_json(400, {"error": f"Invalid JSON: {str(e)}"})
+            return
+        resume_json, overrides = body, None
+        if isinstance(body, dict) and "resume" in body:
+            resume_json, overrides = body["resume"], body.get("config")
+
+        try:
+            file_name, pdf = self.server.pool.render(
+                resume_json, overrides, self.server.render_timeout
+            )
+        except ServiceBusy as e:
+            self.send_json(503, {"error": str(e)})
+            return
+        except TimeoutError:
+            self.send_json(504, {"error": "Rendering timed out"})
+            return
+        except ValueError as e:
+            self.send_json(400, {"error": str(e)})
+            return
+        except Exception as e:
+            self.send_json(500, {"error": f"Error generating resume: {str(e)}"})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Disposition", f"inline; filename*=UTF-8''{quote(file_name)}")
+        self.send_header("Content-Length", str(len(pdf)))
+        self.end_headers()
+        self.wfile.write(pdf)
+
+
+class RenderServer(ThreadingHTTPServer):
+    """HTTP server handing the render requests to a worker pool."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple, pool: WorkerPool, render_timeout: float):
+        """Initialize the server.
+
+        Args:
+            address (tuple): (host, port) to listen on.
+            pool (WorkerPool): Pool rendering the requests.
+            render_timeout (float): Seconds a request waits for its PDF.
+        """
+        super().__init__(address, RenderRequestHandler)
+        self.pool = pool
+        self.render_timeout = render_timeout
+
+
+def make_server(pool: WorkerPool, host: str = "127.0.0.1", port: int = 8000, timeout: float = 30):
+    """Create the HTTP server of a worker pool.
+
+    Args:
+        pool (WorkerPool): Pool rendering the requests.
+        host (str): Interface to listen on.
+        port (int): Port to listen on; 0 picks a free one.
+        timeout (float): Seconds a request waits for its PDF.
+
+    Returns:
+        RenderServer: The server, not yet serving.
+    """
+    return RenderServer((host, port), pool, timeout)
+
+
+def main(argv=None) -> int:
+    """Run the render service from the command line.
+
+    Args:
+        argv (list, optional): Command-line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: Process exit code.
+    """
+    parser = argparse.ArgumentParser(description="Serve resume PDFs over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument(
+        "--workers", "-j", type=int, default=0, help="Worker processes; 0 uses one per CPU core"
+    )
+    parser.add_argument(
+        "--queue-size", type=int, default=8, help="Requests waiting for a worker before 503s"
+    )
+    parser.add_argument("--timeout", type=float, default=30, help="Seconds allowed per render")
+    args = parser.parse_args(argv)
+    if args.workers < 0:
+        parser.error("--workers must be 0 or more")
+    if args.queue_size < 0:
+        parser.error("--queue-size must be 0 or more")
+    if args.timeout <= 0:
+        parser.error("--timeout must be positive")
+
+    pool = WorkerPool(load_config(), workers=args.workers, queue_size=args.queue_size)
+    server = make_server(pool, args.host, args.port, args.timeout)
+    print(f"Serving resumes on http://{args.host}:{server.server_port} ({pool.workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
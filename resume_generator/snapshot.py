@@ -0,0 +1,218 @@
+"""Compiled snapshots of validated resume data and configuration.
+
+Every render parses `config.yaml` and `resume.json`, validates the resume and
+checks which fallback fonts its text needs, although these inputs rarely
+change between renders. `compile` does this once and writes a snapshot: the
+validated models, the configuration, the styles and the fallback fonts, with
+a digest of everything they were derived from. Renders load the snapshot
+instead, after checking its digest against the current inputs, which only
+reads and hashes the files. When the digest no longer matches, the snapshot
+is ignored and the inputs are loaded as usual.
+
+The digest covers the resume and configuration files, the schema and style
+modules, the font library, and the Python and pydantic versions.
+
+The body is a pickle, so a snapshot is trusted like code: only load
+snapshots that you compiled.
+
+Usage:
+    python -m resume_generator.snapshot [--input resume.json] [--config config.yaml]
+    python -m resume_generator.main compile
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import struct
+import sys
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+import pydantic
+
+from resume_generator.font_cache import DEFAULT_CACHE_DIR
+from resume_generator.font_cache import DEFAULT_FONTS_DIR
+from resume_generator.font_cache import FontCache
+from resume_generator.font_coverage import CoverageIndex
+from resume_generator.profiling import traced
+from resume_generator.styles import modern_styles
+
+SNAPSHOT_MAGIC = b"RGSN"
+SNAPSHOT_FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct("<4sHI")
+
+
+class Snapshot(NamedTuple):
+    """Inputs of a render, validated and resolved."""
+
+    config: dict
+    resume_data: tuple
+    styles: dict
+    # Fallback fonts of the configured template
+    fallback_fonts: list
+
+
+def snapshot_path(resume_path) -> str:
+    """Return the default location of the snapshot of a resume.
+
+    Args:
+        resume_path: Resume data file.
+
+    Returns:
+        str: The resume path with a `.snapshot` extension.
+    """
+    return f"{os.path.splitext(resume_path)[0]}.snapshot"
+
+
+@lru_cache(maxsize=None)
+def _code_version() -> str:
+    """Hash the schema and style modules the snapshot content depends on."""
+    package_dir = Path(__file__).parent
+    digest = hashlib.sha256()
+    for path in [package_dir / "schemas.py", *sorted((package_dir / "styles").glob("*.py"))]:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def input_digest(resume_path, config_path, fonts_dir=DEFAULT_FONTS_DIR) -> str:
+    """Hash everything a snapshot is derived from.
+
+    Args:
+        resume_path: Resume data file.
+        config_path: Configuration file.
+        fonts_dir: Directory of the font library.
+
+    Returns:
+        str: Hex digest of the inputs.
+
+    Raises:
+        OSError: If the resume data or configuration file cannot be read.
+    """
+    parts = [
+        SNAPSHOT_FORMAT_VERSION,
+        sys.version,
+        pydantic.VERSION,
+        _code_version(),
+        CoverageIndex.library_key(fonts_dir),
+        hashlib.sha256(Path(resume_path).read_bytes()).hexdigest(),
+        hashlib.sha256(Path(config_path).read_bytes()).hexdigest(),
+    ]
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+
+def compile_snapshot(
+    resume_path="resume.json", config_path="config.yaml", path=None, styles=modern_styles
+) -> str:
+    """Validate the inputs of a render and write their snapshot.
+
+    Args:
+        resume_path: Resume data file.
+        config_path: Configuration file.
+        path: Snapshot file. Defaults to `snapshot_path(resume_path)`.
+        styles (dict): Style definitions for the sections.
+
+    Returns:
+        str: Path of the snapshot.
+
+    Raises:
+        FileNotFoundError: If an input file is not found.
+        ValueError: If an input is invalid, or required configuration is missing.
+    """
+    # Imported here since main loads snapshots with this module
+    from resume_generator.main import get_fallback_fonts
+    from resume_generator.main import load_config
+    from resume_generator.main import load_resume_data
+
+    path = path or snapshot_path(resume_path)
+    # Hashed before loading: a file changing in between makes the snapshot stale, not wrong
+    digest = input_digest(resume_path, config_path)
+    config = load_config(config_path)
+    resume_data = load_resume_data(resume_path)
+    try:
+        template_config = config["templates"][config["template"]]
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Missing required configuration: {str(e)}")
+    font_cache = FontCache(config.get("font_cache_directory", DEFAULT_CACHE_DIR))
+    fallback_fonts = get_fallback_fonts(
+        template_config, font_cache, resume_data, sections=config.get("sections")
+    )
+
+    snapshot = Snapshot(config, resume_data, styles, fallback_fonts)
+    header = json.dumps({"digest": digest}).encode("utf-8")
+    body = zlib.compress(pickle.dumps(tuple(snapshot), pickle.HIGHEST_PROTOCOL))
+    preamble = _PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, len(header))
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as file:
+            file.write(preamble + header + body)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+    return path
+
+
+@traced
+def load_snapshot(
+    resume_path="resume.json", config_path="config.yaml", path=None
+) -> Snapshot | None:
+    """Load the snapshot of a resume if it matches the current inputs.
+
+    Args:
+        resume_path: Resume data file.
+        config_path: Configuration file.
+        path: Snapshot file. Defaults to `snapshot_path(resume_path)`.
+
+    Returns:
+        Snapshot | None: The snapshot, or None if there is none, it is unreadable,
+            or its inputs changed since it was compiled.
+    """
+    try:
+        with open(path or snapshot_path(resume_path), "rb") as file:
+            raw = file.read()
+        magic, version, header_len = _PREAMBLE.unpack_from(raw)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_FORMAT_VERSION:
+            return None
+        header = json.loads(raw[_PREAMBLE.size : _PREAMBLE.size + header_len])
+        if header["digest"] != input_digest(resume_path, config_path):
+            return None
+        body = pickle.loads(zlib.decompress(raw[_PREAMBLE.size + header_len :]))
+        return Snapshot(*body)
+    except (OSError, ValueError, KeyError, TypeError, EOFError, struct.error, zlib.error):
+        return None
+    except (pickle.PickleError, AttributeError, ImportError):
+        # Pickled by code that no longer exists
+        return None
+
+
+def main(argv=None) -> int:
+    """Compile the snapshot of a resume from the command line.
+
+    Args:
+        argv (list, optional): Command-line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: Process exit code.
+    """
+    parser = argparse.ArgumentParser(description="Validate a resume once and snapshot it.")
+    parser.add_argument("--input", "-i", default="resume.json", help="Resume JSON file")
+    parser.add_argument("--config", "-c", default="config.yaml", help="Configuration file")
+    parser.add_argument(
+        "--output", help="Snapshot file (default: the resume file with a .snapshot extension)"
+    )
+    args = parser.parse_args(argv)
+    try:
+        path = compile_snapshot(args.input, args.config, args.output)
+    except (OSError, ValueError) as e:
+        print(f"Error compiling snapshot: {str(e)}", file=sys.stderr)
+        return 1
+    print(f"Snapshot written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
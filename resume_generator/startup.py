@@ -0,0 +1,167 @@
+"""Import-time benchmark of the command-line entry point.
+
+Every run of `python -m resume_generator.main` pays for importing its modules
+before any work starts. The entry point only imports what parsing its arguments
+and configuration needs: pydantic and the resume models are imported when a
+resume is validated, and fpdf, fontTools and numpy when a PDF is actually laid
+out, so `--help` never loads them and up-to-date builds skip the PDF stack.
+
+This benchmark imports the entry point in fresh interpreters with
+`-X importtime`, keeps the fastest run, and reports the total import time and
+the packages it is spent in. It fails when the total exceeds the budget or a
+deferred package is imported.
+
+Usage:
+    python -m resume_generator.startup [--runs 5] [--top 10] [--budget 200]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import NamedTuple
+
+ENTRY_POINT = "resume_generator.main"
+# Budget for importing the entry point, in milliseconds: about 80 ms measured,
+# plus headroom for slower machines and CI runners
+IMPORT_BUDGET_MS = 200
+# Packages that only the code paths validating a resume or rendering a PDF may import
+DEFERRED_PACKAGES = ("pydantic", "email_validator", "fpdf", "fontTools", "numpy")
+
+_IMPORT_TIME_PREFIX = "import time:"
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ImportRecord(NamedTuple):
+    """One line of `-X importtime` output; times are in microseconds."""
+
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+class StartupProfile(NamedTuple):
+    """Imports of one interpreter run, in the order they completed."""
+
+    records: list
+
+    @property
+    def total_ms(self) -> float:
+        """Total import time of the run, in milliseconds."""
+        return sum(record.self_us for record in self.records) / 1000
+
+    def package_times(self) -> dict:
+        """Return the import time spent in each top-level package.
+
+        Returns:
+            dict: Milliseconds by package name, slowest first.
+        """
+        times: defaultdict[str, int] = defaultdict(int)
+        for record in self.records:
+            times[record.name.split(".")[0]] += record.self_us
+        ranked = sorted(times.items(), key=lambda item: item[1], reverse=True)
+        return {name: us / 1000 for name, us in ranked}
+
+    def loaded(self, packages=DEFERRED_PACKAGES) -> list:
+        """Return which of the given packages were imported.
+
+        Args:
+            packages (tuple): Top-level package names.
+
+        Returns:
+            list: The imported ones, in the order of `packages`.
+        """
+        imported = {record.name.split(".")[0] for record in self.records}
+        return [package for package in packages if package in imported]
+
+
+def parse_importtime(output: str) -> list:
+    """Parse the `-X importtime` report printed on stderr.
+
+    Args:
+        output (str): The interpreter's stderr; other lines are ignored.
+
+    Returns:
+        list: ImportRecord entries, in the order they appear.
+    """
+    records = []
+    for line in output.splitlines():
+        if not line.startswith(_IMPORT_TIME_PREFIX):
+            continue
+        fields = line[len(_IMPORT_TIME_PREFIX) :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # The header line
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        records.append(ImportRecord(stripped, int(fields[0]), int(fields[1]), depth))
+    return records
+
+
+def profile_imports(module: str = ENTRY_POINT, runs: int = 5) -> StartupProfile:
+    """Import a module in fresh interpreters and keep the fastest run.
+
+    Args:
+        module (str): Module to import.
+        runs (int): Number of interpreter runs.
+
+    Returns:
+        StartupProfile: Imports of the fastest run.
+
+    Raises:
+        RuntimeError: If the module cannot be imported.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [_PROJECT_ROOT, env.get("PYTHONPATH")]))
+    profiles = []
+    for _ in range(max(runs, 1)):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Cannot import {module}: {result.stderr.strip()}")
+        profiles.append(StartupProfile(parse_importtime(result.stderr)))
+    return min(profiles, key=lambda profile: profile.total_ms)
+
+
+def main(argv=None) -> int:
+    """Report the import time of the entry point from the command line.
+
+    Args:
+        argv (list, optional): Command-line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: 0 within the budget, 1 when over it or a deferred package is imported.
+    """
+    parser = argparse.ArgumentParser(description="Measure the import time of the CLI.")
+    parser.add_argument("--module", default=ENTRY_POINT, help="Module to import")
+    parser.add_argument("--runs", type=int, default=5, help="Interpreter runs; the fastest is kept")
+    parser.add_argument("--top", type=int, default=10, help="Packages to list")
+    parser.add_argument(
+        "--budget", type=float, default=IMPORT_BUDGET_MS, help="Import time budget in ms"
+    )
+    args = parser.parse_args(argv)
+
+    profile = profile_imports(args.module, args.runs)
+    print(f"Import time of {args.module}: {profile.total_ms:.1f} ms (budget {args.budget:g} ms)")
+    for name, ms in list(profile.package_times().items())[: args.top]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    failed = False
+    deferred = profile.loaded()
+    if deferred:
+        print(f"Deferred packages imported at startup: {', '.join(deferred)}")
+        failed = True
+    if profile.total_ms > args.budget:
+        print("Import time is over budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
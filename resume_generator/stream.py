@@ -0,0 +1,396 @@
+"""Render a large collection of resumes from a stream, one record at a time.
+
+An export of candidate documents is a JSONL file with one resume.json object
+per line (or `-` for stdin), or a directory of JSON files. Records are read,
+validated and rendered one at a time, and each PDF is written before the next
+record is read, so memory stays bounded by a record and the bounded caches
+(fonts, fragments) however large the export is.
+
+A record that is not valid JSON, fails validation or fails to render is
+written to the rejects file with its source and error, and the stream goes
+on. Progress and throughput are printed periodically, and a summary at the
+end.
+
+With `--workers`, records are rendered by a pool of warm processes. At most
+`IN_FLIGHT_PER_WORKER` records per worker are read ahead, and results are
+reported in input order.
+
+PDFs are written into the `ensure_output_directory` layout, with the
+plain-text and HTML versions listed in `output_formats` next to them. Put
+`{record}` (the line number, or the file name without extension) in the file
+name template to keep candidates with the same name apart.
+
+Usage:
+    python -m resume_generator.stream --input export.jsonl [--rejects rejects.jsonl]
+    python -m resume_generator.stream --input candidates/ --workers 0
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import NamedTuple
+
+from resume_generator.autofit import fit_to_pages
+from resume_generator.font_cache import DEFAULT_CACHE_DIR
+from resume_generator.font_cache import DEFAULT_FONTS_DIR
+from resume_generator.font_cache import FontCache
+from resume_generator.font_coverage import CoverageIndex
+from resume_generator.fragments import fragment_cache_from_config
+from resume_generator.main import add_sections
+from resume_generator.main import ensure_output_directory
+from resume_generator.main import get_fallback_fonts
+from resume_generator.main import get_output_path
+from resume_generator.main import load_config
+from resume_generator.main import setup_pdf
+from resume_generator.main import validate_resume_data
+from resume_generator.renderers import create_renderers
+from resume_generator.renderers import write_outputs
+from resume_generator.styles import modern_styles
+
+# Records read ahead of the results for each worker process
+IN_FLIGHT_PER_WORKER = 4
+PROGRESS_INTERVAL = 1.0
+
+
+class Record(NamedTuple):
+    """One resume of a stream, not parsed yet."""
+
+    source: str
+    name: str
+    data: bytes
+
+
+class RecordResult(NamedTuple):
+    """Outcome of rendering one record."""
+
+    source: str
+    output_path: str | None
+    seconds: float
+    error: str | None = None
+
+
+def read_records(path):
+    """Read the records of a JSONL file or a directory of JSON files lazily.
+
+    Args:
+        path: JSONL file with one resume per line, `-` for stdin, or a
+            directory whose `*.json` files are read in name order.
+
+    Yields:
+        Record: Each record, with its source (`file:line` or the file path)
+            and its name for `{record}` in file names. Blank lines are skipped.
+
+    Raises:
+        FileNotFoundError: If the path does not exist.
+    """
+    if path != "-" and os.path.isdir(path):
+        for file_path in sorted(Path(path).glob("*.json")):
+            yield Record(str(file_path), file_path.stem, file_path.read_bytes())
+        return
+    if path == "-":
+        file, source = sys.stdin.buffer, "<stdin>"
+    else:
+        file, source = open(path, "rb"), path
+    try:
+        for line_number, line in enumerate(file, start=1):
+            if line.strip():
+                yield Record(f"{source}:{line_number}", str(line_number), line)
+    finally:
+        if file is not sys.stdin.buffer:
+            file.close()
+
+
+class StreamRenderer:
+    """Renders resume records one at a time, keeping fonts and caches warm."""
+
+    def __init__(self, config: dict, styles: dict = modern_styles):
+        """Load everything shared by the records.
+
+        Args:
+            config (dict): Configuration dictionary.
+            styles (dict): Style definitions for the sections.
+
+        Raises:
+            ValueError: If required configuration is missing, or an output format
+                is unknown.
+        """
+        # Unknown formats fail here rather than rejecting every record
+        create_renderers(config.get("output_formats", []))
+        self.config = config
+        self.styles = styles
+        try:
+            self.template_config = config["templates"][config["template"]]
+        except KeyError as e:
+            raise ValueError(f"Missing required configuration: {str(e)}")
+        self.font_cache = FontCache(config.get("font_cache_directory", DEFAULT_CACHE_DIR))
+        self.fragment_cache = fragment_cache_from_config(config, default="memory")
+        self.coverage = CoverageIndex.load(DEFAULT_FONTS_DIR, self.font_cache)
+
+    def warm(self) -> None:
+        """Load the template fonts into the in-memory font cache."""
+        for family in self.template_config["fonts"].values():
+            font_path = os.path.join(DEFAULT_FONTS_DIR, f"{family}.ttf")
+            if os.path.exists(font_path):
+                self.font_cache.load(font_path)
+
+    def render(self, record: Record) -> str:
+        """Parse, validate, render and save one record.
+
+        Args:
+            record (Record): The record.
+
+        Returns:
+            str: Path of the generated PDF.
+
+        Raises:
+            ValueError: If the record is not valid JSON or not a valid resume.
+        """
+        try:
+            resume_json = json.loads(record.data)
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON: {str(e)}")
+        if not isinstance(resume_json, dict):
+            raise ValueError("Error validating resume data: a record must be a JSON object")
+        resume_data = validate_resume_data(
+            resume_json, defer_excluded=self.config.get("defer_excluded_validation", False)
+        )
+        config = self.config
+        if config.get("max_pages"):
+            config = fit_to_pages(
+                config,
+                resume_data,
+                config["max_pages"],
+                self.styles,
+                font_cache=self.font_cache,
+                fragment_cache=self.fragment_cache,
+            ).config
+        pdf, template_config = setup_pdf(
+            config,
+            font_cache=self.font_cache,
+            fallback_fonts=get_fallback_fonts(
+                self.template_config,
+                self.font_cache,
+                resume_data,
+                self.coverage,
+                config.get("sections"),
+            ),
+            fragment_cache=self.fragment_cache,
+        )
+        renderers = create_renderers(config.get("output_formats", []))
+        pdf.renderers.extend(renderers.values())
+        add_sections(pdf, template_config, resume_data, self.styles, config.get("sections"))
+        application_info, general = resume_data[:2]
+        output_dir = ensure_output_directory(config, application_info)
+        output_path = get_output_path(config, output_dir, general, application_info, record.name)
+        write_outputs(pdf, renderers, output_path)
+        return output_path
+
+    def render_record(self, record: Record) -> RecordResult:
+        """Render one record, timing it and recording any error.
+
+        Args:
+            record (Record): The record.
+
+        Returns:
+            RecordResult: The outcome of the render.
+        """
+        start = time.perf_counter()
+        try:
+            output_path, error = self.render(record), None
+        except Exception as e:
+            output_path, error = None, str(e)
+        return RecordResult(record.source, output_path, time.perf_counter() - start, error)
+
+
+def render_stream(renderer: StreamRenderer, records, workers: int = 1):
+    """Render records as they are read, in this process or in a pool of workers.
+
+    Args:
+        renderer (StreamRenderer): Renderer of this process; workers set up
+            their own with its configuration and styles.
+        records (iterable): Records to render, read lazily.
+        workers (int): Number of worker processes; 1 renders in this process,
+            and 0 uses one worker per CPU core.
+
+    Yields:
+        tuple: (Record, RecordResult) for each record, in input order.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        renderer.warm()
+        for record in records:
+            yield record, renderer.render_record(record)
+        return
+
+    pending: deque[tuple] = deque()
+    initargs = (renderer.config, renderer.styles)
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=initargs) as executor:
+        for record in records:
+            try:
+                pending.append((record, executor.submit(_render_in_worker, record)))
+            except BrokenProcessPool as e:
+                yield record, _worker_died(record, e)
+            if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                yield _wait(*pending.popleft())
+        while pending:
+            yield _wait(*pending.popleft())
+
+
+def _wait(record: Record, future) -> tuple:
+    """Wait for the result of a record rendered by a worker."""
+    try:
+        return record, future.result()
+    except BrokenProcessPool as e:
+        return record, _worker_died(record, e)
+
+
+def _worker_died(record: Record, error: Exception) -> RecordResult:
+    return RecordResult(record.source, None, 0.0, f"Worker process died: {str(error)}")
+
+
+# Renderer of the current worker process, set up by `_init_worker`
+_worker_renderer: StreamRenderer | None = None
+
+
+def _init_worker(config: dict, styles: dict) -> None:
+    """Set up and warm the renderer of a worker process."""
+    global _worker_renderer
+    _worker_renderer = StreamRenderer(config, styles)
+    _worker_renderer.warm()
+
+
+def _render_in_worker(record: Record) -> RecordResult:
+    """Render one record with the renderer of the worker process."""
+    if _worker_renderer is None:
+        raise RuntimeError("The worker process was not set up")
+    return _worker_renderer.render_record(record)
+
+
+class StreamProgress:
+    """Counts rendered and rejected records and reports the throughput."""
+
+    def __init__(self, interval: float = PROGRESS_INTERVAL, file=None):
+        """Start the clock.
+
+        Args:
+            interval (float): Seconds between two progress lines; 0 disables them.
+            file: Stream the progress lines are printed to. Defaults to stdout.
+        """
+        self.interval = interval
+        self.file = file
+        self.rendered = 0
+        self.rejected = 0
+        self.start = self._last = time.perf_counter()
+
+    @property
+    def processed(self) -> int:
+        """Number of records processed so far."""
+        return self.rendered + self.rejected
+
+    def update(self, result: RecordResult) -> None:
+        """Count a result, printing a progress line when the interval elapsed.
+
+        Args:
+            result (RecordResult): Outcome of a record.
+        """
+        if result.error is None:
+            self.rendered += 1
+        else:
+            self.rejected += 1
+        now = time.perf_counter()
+        if self.interval and now - self._last >= self.interval:
+            self._last = now
+            print(self.line(), file=self.file or sys.stdout, flush=True)
+
+    def line(self) -> str:
+        """Return the progress so far.
+
+        Returns:
+            str: Records processed, rendered and rejected, and the throughput.
+        """
+        seconds = time.perf_counter() - self.start
+        rate = self.processed / seconds if seconds else 0.0
+        return (
+            f"{self.processed} records ({self.rendered} rendered, {self.rejected} rejected) "
+            f"in {seconds:.1f} s, {rate:.1f} records/s"
+        )
+
+
+def write_reject(file, record: Record, error: str) -> None:
+    """Append a rejected record to the rejects file.
+
+    Args:
+        file: Text file the rejects are written to, one JSON object per line.
+        record (Record): The rejected record.
+        error (str): Why it was rejected.
+    """
+    data = record.data.decode("utf-8", errors="replace").rstrip("\r\n")
+    file.write(json.dumps({"source": record.source, "error": error, "record": data}) + "\n")
+
+
+def main(argv=None) -> int:
+    """Render every resume of a JSONL file or a directory from the command line.
+
+    Args:
+        argv (list, optional): Command-line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: Process exit code; 1 if some records were rejected.
+    """
+    parser = argparse.ArgumentParser(description="Render a stream of resumes one at a time.")
+    parser.add_argument(
+        "--input",
+        "-i",
+        required=True,
+        help="JSONL file with one resume per line, - for stdin, or a directory of JSON files",
+    )
+    parser.add_argument("--config", "-c", default="config.yaml", help="Configuration file")
+    parser.add_argument("--output-dir", "-o", help="Output directory for generated resumes")
+    parser.add_argument(
+        "--rejects", default="rejects.jsonl", help="JSONL file the rejected records are written to"
+    )
+    parser.add_argument(
+        "--workers",
+        "-j",
+        type=int,
+        default=1,
+        help="Worker processes; 1 renders in-process, 0 uses one per CPU core",
+    )
+    parser.add_argument(
+        "--progress-interval",
+        type=float,
+        default=PROGRESS_INTERVAL,
+        help="Seconds between progress lines; 0 only prints the summary",
+    )
+    args = parser.parse_args(argv)
+    if args.workers < 0:
+        parser.error("--workers must be 0 or more")
+    if args.progress_interval < 0:
+        parser.error("--progress-interval must be 0 or more")
+    if args.input != "-" and not os.path.exists(args.input):
+        parser.error(f"{args.input} not found")
+
+    config = load_config(args.config)
+    if args.output_dir:
+        config["output_directory"] = args.output_dir
+    renderer = StreamRenderer(config)
+    progress = StreamProgress(args.progress_interval)
+    with open(args.rejects, "w", encoding="utf-8") as rejects:
+        for record, result in render_stream(renderer, read_records(args.input), args.workers):
+            progress.update(result)
+            if result.error is not None:
+                write_reject(rejects, record, result.error)
+    print(f"Done: {progress.line()}")
+    if progress.rejected:
+        print(f"Rejected records written to {args.rejects}")
+    return 1 if progress.rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""Style definitions compiled into the draw operations that select them.
+
+A style definition is a dict with a `font`, a `size` in points, and optionally
+a `style` ("B", "I", "U" or a combination) and a text `color`: one gray level
+or three RGB components from 0 to 255. Sections compile their definitions once
+and select a style by playing its prebuilt font and colour operations, instead
+of looking the style up and building the operations for every cell.
+"""
+
+# fpdf's default text colour, black as a gray level
+DEFAULT_COLOR = (0,)
+
+
+class TextStyle:
+    """Font and text colour of a style, with the operations that select them."""
+
+    __slots__ = ("font", "style", "size", "color", "font_op", "color_op")
+
+    def __init__(self, font: str, size: float, style: str = "", color: tuple = DEFAULT_COLOR):
+        """Build the draw operations of a style.
+
+        Args:
+            font (str): Font family.
+            size (float): Font size in points, already scaled.
+            style (str): Font style, e.g. "B" for bold.
+            color (tuple): Gray level or RGB components of the text colour.
+
+        Raises:
+            ValueError: If the colour does not have one or three components.
+        """
+        color = tuple(color)
+        if len(color) not in (1, 3):
+            raise ValueError(f"A colour has one or three components, not {len(color)}: {color}")
+        self.font = font
+        self.style = style
+        self.size = size
+        self.color = color
+        self.font_op = ("font", font, style, size)
+        self.color_op = ("color", *color)
+
+    def __repr__(self) -> str:
+        """Show the font, size, style and color of the text style."""
+        return (
+            f"TextStyle(font={self.font!r}, size={self.size!r}, style={self.style!r}, "
+            f"color={self.color!r})"
+        )
+
+
+def compile_styles(styles: dict, scale: float = 1) -> dict:
+    """Compile the style definitions of a section.
+
+    Args:
+        styles (dict): Style definitions of the section, by style key.
+        scale (float): Factor applied to the font sizes.
+
+    Returns:
+        dict: TextStyle of each style key.
+
+    Raises:
+        ValueError: If a colour does not have one or three components.
+    """
+    return {
+        key: TextStyle(
+            style["font"],
+            style["size"] * scale,
+            style.get("style", ""),
+            style.get("color", DEFAULT_COLOR),
+        )
+        for key, style in styles.items()
+    }
@@ -0,0 +1,228 @@
+"""Incremental validation of resume data, keyed by content hashes of its parts.
+
+Watch mode and the render service validate the same `resume.json` sections
+and entries again and again, and they rarely change between two renders. A
+`ValidationCache` hashes each raw section and reuses the models validated for
+the same content before; when a section changed, its entries are looked up
+one by one, so editing one job only validates that job again. The hash of a
+section costs a fraction of validating it (the e-mail and URL checks of the
+general information dominate), and the cache is a bounded LRU.
+
+Entries marked `include: false` are never rendered. With `defer_excluded`,
+they are kept as `DeferredEntry` objects and validated only if something
+reads more than their `include` flag.
+
+Hashes are taken over the `marshal` serialization of the parsed JSON, which
+is several times cheaper than `json.dumps` and only valid within one Python
+version; the cache is never stored. Format 2 writes every value in full, so
+the serialization does not depend on which objects are shared. Two values
+with the same serialization are equal, so a hit always returns models
+validated from the same content.
+"""
+
+import hashlib
+import marshal
+from collections import OrderedDict
+
+from pydantic import BaseModel
+
+from resume_generator.schemas import RESUME_ADAPTER
+from resume_generator.schemas import RESUME_SECTIONS
+
+VALIDATION_CACHE_SIZE = 1024
+# Newer marshal formats refer back to objects seen before, depending on their identity
+MARSHAL_VERSION = 2
+
+
+def content_hash(raw) -> bytes | None:
+    """Hash a section or entry of parsed JSON.
+
+    Args:
+        raw: JSON value as parsed by `json.load`.
+
+    Returns:
+        bytes | None: Digest of the value, or None if it holds values other than
+            JSON ones, which are validated without caching.
+    """
+    try:
+        return hashlib.sha256(marshal.dumps(raw, MARSHAL_VERSION)).digest()
+    except ValueError:
+        return None
+
+
+class DeferredEntry:
+    """Entry marked `include: false`, validated the first time it is read.
+
+    Sections and the section registry only read `include` of excluded
+    entries. Reading any other attribute validates the entry and reads it
+    from the model, so an invalid excluded entry raises then.
+    """
+
+    __slots__ = ("model", "raw", "_validated")
+    include = False
+
+    def __init__(self, model: type[BaseModel], raw: dict):
+        """Keep an entry for later validation.
+
+        Args:
+            model (type): Model of the entry.
+            raw (dict): The entry as parsed from JSON.
+        """
+        self.model = model
+        self.raw = raw
+        self._validated: BaseModel | None = None
+
+    def validate(self) -> BaseModel:
+        """Return the validated entry.
+
+        Returns:
+            BaseModel: The entry validated by its model.
+
+        Raises:
+            ValidationError: If the entry is invalid.
+        """
+        if self._validated is None:
+            self._validated = self.model.model_validate(self.raw)
+        return self._validated
+
+    def __getattr__(self, name: str):
+        """Read an attribute of the validated entry, validating it first."""
+        # Private names are looked up by pickle and copy before slots are set
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.validate(), name)
+
+    def __repr__(self) -> str:
+        """Show the model of the entry, without validating it."""
+        return f"DeferredEntry({self.model.__name__})"
+
+
+def model_to_json(value):
+    """Convert validated models to JSON-compatible values for hashing.
+
+    Use as the `default` of `json.dumps` over validated resume data.
+
+    Args:
+        value: A model, or an entry whose validation is deferred.
+
+    Returns:
+        The model's JSON data; the raw JSON of a deferred entry, which
+            identifies it without validating it.
+
+    Raises:
+        TypeError: If the value is of another type.
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, DeferredEntry):
+        # Excluded entries are not drawn; their JSON identifies them without validating them
+        return value.raw
+    raise TypeError(f"Cannot hash {type(value).__name__}")
+
+
+class ValidationCache:
+    """Bounded LRU of validated sections and entries, keyed by content hash."""
+
+    def __init__(self, max_entries: int = VALIDATION_CACHE_SIZE):
+        """Initialize the cache.
+
+        Args:
+            max_entries (int): Maximum number of sections and entries kept.
+                With 0 nothing is hashed or cached.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._models: OrderedDict[tuple, object] = OrderedDict()
+
+    def validate(self, resume_data: dict, defer_excluded: bool = False) -> tuple:
+        """Validate resume data, reusing the models of unchanged sections and entries.
+
+        Sections of a hit are the same objects as on the previous validation,
+        which tells callers what changed.
+
+        Args:
+            resume_data (dict): Resume data with every section of resume.json.
+            defer_excluded (bool): Keep entries marked `include: false` as
+                `DeferredEntry` objects instead of validating them.
+
+        Returns:
+            tuple: Validated resume data sections (application_info, general, jobs, etc.).
+
+        Raises:
+            KeyError: If a section is missing.
+            ValidationError: If a section or entry is invalid; the error is
+                that of the first invalid one, validated by its own model.
+        """
+        return tuple(
+            self._section(key, model, is_list, resume_data, defer_excluded)
+            for key, model, is_list in RESUME_SECTIONS
+        )
+
+    def stats(self) -> dict:
+        """Return the hit and miss counters.
+
+        Returns:
+            dict: Hits, misses and hit rate.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _section(
+        self, key: str, model: type[BaseModel], is_list: bool, resume_data: dict, defer: bool
+    ):
+        """Return a validated section, from the cache if its content was seen."""
+        raw = resume_data[key]
+        if is_list and not isinstance(raw, dict):
+            # Let the document model report the section itself as invalid
+            RESUME_ADAPTER.validate_python(resume_data)
+        cache_key = self._key(raw, key, defer)
+        section = self._get(cache_key)
+        if section is None:
+            if is_list:
+                section = [self._entry(model, entry, defer) for entry in raw.values()]
+            else:
+                section = model.model_validate(raw)
+            self._put(cache_key, section)
+        return section
+
+    def _entry(self, model: type[BaseModel], raw, defer: bool):
+        """Return a validated entry, from the cache if its content was seen."""
+        if defer and isinstance(raw, dict) and raw.get("include") is False:
+            return DeferredEntry(model, raw)
+        cache_key = self._key(raw, model)
+        entry = self._get(cache_key)
+        if entry is None:
+            entry = model.model_validate(raw)
+            self._put(cache_key, entry)
+        return entry
+
+    def _key(self, raw, *scope) -> tuple | None:
+        """Return the cache key of a value, or None if it is not cached."""
+        if not self.max_entries:
+            return None
+        digest = content_hash(raw)
+        return None if digest is None else (*scope, digest)
+
+    def _get(self, cache_key):
+        if cache_key is None:
+            return None
+        value = self._models.get(cache_key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._models.move_to_end(cache_key)
+        return value
+
+    def _put(self, cache_key, value) -> None:
+        if cache_key is None:
+            return
+        self._models[cache_key] = value
+        self._models.move_to_end(cache_key)
+        while len(self._models) > self.max_entries:
+            self._models.popitem(last=False)
@@ -0,0 +1,295 @@
+"""Re-render the resume whenever its inputs change, keeping a warm renderer.
+
+A cold render spends most of its time before any layout happens: importing
+modules, loading the configuration, validating the resume data and parsing
+fonts. In watch mode the process stays alive with all of this loaded, and
+polls `resume.json`, `config.yaml` and the styles package for changes. On a
+change, only the resume sections whose JSON changed are validated again, the
+fonts and unchanged fragments are reused from memory, and the PDF is written
+again, with the other formats listed in `output_formats`. The time spent in
+each stage of every rebuild is printed.
+
+Usage:
+    python -m resume_generator.watch [--input resume.json] [--config config.yaml] [--interval 0.1]
+    python -m resume_generator.main --watch [--input resume.json] [--config config.yaml]
+"""
+
+import argparse
+import importlib
+import json
+import sys
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+import resume_generator.styles
+from resume_generator.font_cache import DEFAULT_CACHE_DIR
+from resume_generator.font_cache import FontCache
+from resume_generator.fragments import fragment_cache_from_config
+from resume_generator.main import build_resume
+from resume_generator.main import ensure_output_directory
+from resume_generator.main import get_fallback_fonts
+from resume_generator.main import get_output_path
+from resume_generator.main import load_config
+from resume_generator.main import validate_resume_data
+from resume_generator.renderers import create_renderers
+from resume_generator.renderers import write_outputs
+from resume_generator.schemas import RESUME_SECTIONS
+from resume_generator.validation import ValidationCache
+
+
+class Rebuild(NamedTuple):
+    """Outcome of one rebuild."""
+
+    output_path: str
+    timings: dict
+    validated: list
+
+
+class ResumeWatcher:
+    """Keeps the resume inputs loaded and re-renders the PDF when they change."""
+
+    def __init__(self, resume_path="resume.json", config_path="config.yaml", styles_dir=None):
+        """Initialize the watcher; nothing is loaded until the first rebuild.
+
+        Args:
+            resume_path: Resume data file.
+            config_path: Configuration file.
+            styles_dir: Directory of the style modules. Defaults to the
+                `resume_generator.styles` package.
+        """
+        self.resume_path = Path(resume_path)
+        self.config_path = Path(config_path)
+        self.styles_dir = Path(styles_dir or Path(resume_generator.styles.__file__).parent)
+        self.config = None
+        self.styles = resume_generator.styles.modern_styles
+        self.font_cache = None
+        self.fragment_cache = None
+        self.fallback_fonts = None
+        self.resume_data = None
+        # Validated sections and entries by content, to validate only what changed
+        self.validation_cache = ValidationCache()
+        self._stats = {}
+
+    def watched_files(self) -> list:
+        """Return the files whose changes trigger a rebuild.
+
+        Returns:
+            list: The resume data, the configuration and the style modules.
+        """
+        return [self.resume_path, self.config_path, *sorted(self.styles_dir.glob("*.py"))]
+
+    def poll(self) -> set:
+        """Return the watched files that changed since the last poll.
+
+        Files are compared by modification time and size, so a poll only
+        costs one `stat` per file.
+
+        Returns:
+            set: Paths of the changed, added or removed files.
+        """
+        stats: dict[Path, tuple | None] = {}
+        for path in self.watched_files():
+            try:
+                stat = path.stat()
+                stats[path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                stats[path] = None
+        changed = {
+            path
+            for path in stats.keys() | self._stats.keys()
+            if stats.get(path) != self._stats.get(path)
+        }
+        self._stats = stats
+        return changed
+
+    def _load_config(self) -> None:
+        """Reload the configuration, keeping caches it does not affect."""
+        config = load_config(str(self.config_path))
+        cache_dir = config.get("font_cache_directory", DEFAULT_CACHE_DIR)
+        if self.font_cache is None or self.config.get("font_cache_directory") != cache_dir:
+            self.font_cache = FontCache(cache_dir)
+        backend = (config.get("fragment_cache"), config.get("fragment_cache_directory"))
+        if self.config is None or backend != (
+            self.config.get("fragment_cache"),
+            self.config.get("fragment_cache_directory"),
+        ):
+            self.fragment_cache = fragment_cache_from_config(config, default="memory")
+        self.config = config
+
+    def _load_styles(self) -> None:
+        """Re-import the style modules."""
+        package = resume_generator.styles.__name__
+        for name in sorted(sys.modules):
+            if name.startswith(f"{package}."):
+                importlib.reload(sys.modules[name])
+        self.styles = importlib.reload(resume_generator.styles).modern_styles
+
+    def _load_resume_data(self) -> list:
+        """Reload the resume data, validating only the sections that changed.
+
+        Returns:
+            list: Names of the sections that were validated again.
+
+        Raises:
+            FileNotFoundError: If the resume data file is not found.
+            ValueError: If it contains invalid JSON or data validation fails.
+        """
+        try:
+            resume_json = json.loads(self.resume_path.read_text())
+        except FileNotFoundError:
+            raise FileNotFoundError(f"{self.resume_path} not found")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON in {self.resume_path}: {str(e)}")
+
+        resume_data = validate_resume_data(
+            resume_json,
+            self.validation_cache,
+            self.config.get("defer_excluded_validation", False),
+        )
+        # Sections whose content was validated before are the same objects
+        previous = self.resume_data or (None,) * len(resume_data)
+        validated = [
+            key
+            for (key, _, _), section, previous_section in zip(
+                RESUME_SECTIONS, resume_data, previous
+            )
+            if section is not previous_section
+        ]
+        # Only a fully valid resume replaces the loaded one
+        self.resume_data = resume_data
+        return validated
+
+    def rebuild(self, changed) -> Rebuild | None:
+        """Reload the changed inputs and render the resume again.
+
+        Args:
+            changed (set): Paths of the changed files; all inputs are loaded
+                on the first rebuild.
+
+        Returns:
+            Rebuild | None: The generated PDF and the seconds spent in each stage, or
+                None if the resume data did not actually change, or has never
+                loaded successfully.
+        """
+        timings = {}
+        clock = time.perf_counter()
+
+        def stage(name):
+            nonlocal clock
+            now = time.perf_counter()
+            timings[name] = now - clock
+            clock = now
+
+        first = self.config is None
+        config_changed = first or self.config_path in changed
+        if config_changed:
+            self._load_config()
+            stage("config")
+        styles_changed = not first and any(path.suffix == ".py" for path in changed)
+        if styles_changed:
+            self._load_styles()
+            stage("styles")
+        validated = []
+        if first or self.resume_path in changed:
+            validated = self._load_resume_data()
+            stage("validate")
+            if not (validated or config_changed or styles_changed):
+                return None
+        # Nothing can be rendered until the resume data has loaded once
+        if self.resume_data is None:
+            return None
+
+        template_config = self.config["templates"][self.config["template"]]
+        if config_changed or validated:
+            self.fallback_fonts = get_fallback_fonts(
+                template_config,
+                self.font_cache,
+                self.resume_data,
+                sections=self.config.get("sections"),
+            )
+            stage("fonts")
+        renderers = create_renderers(self.config.get("output_formats", []))
+        pdf = build_resume(
+            self.resume_data,
+            self.config,
+            self.styles,
+            self.font_cache,
+            self.fragment_cache,
+            self.fallback_fonts,
+            renderers.values(),
+        )
+        stage("layout")
+        application_info, general = self.resume_data[:2]
+        output_dir = ensure_output_directory(self.config, application_info)
+        output_path = get_output_path(self.config, output_dir, general, application_info)
+        write_outputs(pdf, renderers, output_path)
+        stage("write")
+        return Rebuild(output_path, timings, validated)
+
+    def run(self, interval: float = 0.1) -> None:
+        """Build the resume, then rebuild it on every change until interrupted.
+
+        A failing rebuild is reported and the previous inputs stay loaded, so
+        the next save is picked up normally.
+
+        Args:
+            interval (float): Seconds between two polls of the watched files.
+        """
+        changed = self.poll()
+        print(f"Watching {', '.join(str(path) for path in self.watched_files())}")
+        while True:
+            if changed:
+                start = time.perf_counter()
+                try:
+                    result = self.rebuild(changed)
+                except Exception as e:
+                    print(f"Error generating resume: {str(e)}")
+                else:
+                    report(result, time.perf_counter() - start)
+            time.sleep(interval)
+            changed = self.poll()
+
+
+def report(result: Rebuild | None, seconds: float) -> None:
+    """Print the outcome and stage timings of a rebuild.
+
+    Args:
+        result (Rebuild, optional): The rebuild, or None if nothing changed.
+        seconds (float): Total time of the rebuild.
+    """
+    if result is None:
+        print(f"{seconds * 1000:8.1f} ms  no changes")
+        return
+    stages = ", ".join(f"{name} {value * 1000:.1f}" for name, value in result.timings.items())
+    sections = f" [{', '.join(result.validated)}]" if result.validated else ""
+    print(f"{seconds * 1000:8.1f} ms  {result.output_path} ({stages} ms){sections}")
+
+
+def main(argv=None) -> int:
+    """Watch the resume inputs from the command line.
+
+    Args:
+        argv (list, optional): Command-line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: Process exit code.
+    """
+    parser = argparse.ArgumentParser(description="Re-render the resume when its inputs change.")
+    parser.add_argument("--input", "-i", default="resume.json", help="Resume JSON file")
+    parser.add_argument("--config", "-c", default="config.yaml", help="Configuration file")
+    parser.add_argument(
+        "--interval", type=float, default=0.1, help="Seconds between checks for changes"
+    )
+    args = parser.parse_args(argv)
+    if args.interval <= 0:
+        parser.error("--interval must be positive")
+    try:
+        ResumeWatcher(args.input, args.config).run(args.interval)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
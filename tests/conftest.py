@@ -0,0 +1,103 @@
+"""Fixtures shared by the test modules."""
+
+import pytest
+import yaml
+
+from resume_generator.schemas import ApplicationInfo
+from resume_generator.schemas import General
+
+
+@pytest.fixture
+def config(tmp_path):
+    """The shipped configuration, writing its outputs and font cache under tmp_path."""
+    with open("config.yaml", "r") as file:
+        config = yaml.safe_load(file)
+    config["output_directory"] = str(tmp_path / "output")
+    config["font_cache_directory"] = str(tmp_path / "cache")
+    return config
+
+
+@pytest.fixture
+def resume_data():
+    """Validated resume data with only the general section filled in."""
+    general = General(
+        name="John Doe",
+        title="Software Engineer",
+        location="San Francisco, CA",
+        email="john@example.com",
+        portfolio="https://portfolio.example.com",
+        linkedin="https://linkedin.com/in/johndoe",
+        github="https://github.com/johndoe",
+        description="Experienced software engineer with a passion for clean code.",
+    )
+    application_info = ApplicationInfo(company="Acme", job="Engineer")
+    return (application_info, general, [], [], [], [], [], [], [], [])
+
+
+@pytest.fixture
+def sample_resume_data():
+    """Raw resume JSON with the general section filled in and the other sections empty."""
+    return {
+        "ApplicationInfo": {"company": "Test Company", "job": "Test Position"},
+        "General": {
+            "name": "John Doe",
+            "title": "Software Engineer",
+            "location": "San Francisco, CA",
+            "email": "john@example.com",
+            "cell_number": "+1234567890",
+            "portfolio": "https://portfolio.example.com",
+            "linkedin": "https://linkedin.com/in/johndoe",
+            "github": "https://github.com/johndoe",
+            "description": "Experienced software engineer with a passion for clean code.",
+        },
+        "Jobs": {},
+        "Education": {},
+        "LicensesAndCertifications": {},
+        "VolunteerExperience": {},
+        "Projects": {},
+        "HonorsAndAwards": {},
+        "Languages": {},
+    }
+
+
+@pytest.fixture
+def sample_config():
+    """A minimal configuration for the modern template."""
+    return {
+        "output_directory": "generated_applications",
+        "file_name_template": "Resume - {name} - {company} - {job} - {date}.pdf",
+        "template": "modern",
+        "templates": {
+            "modern": {
+                "pdf_format": "letter",
+                "cell_width": 190,
+                "cell_height": 4,
+                "fonts": {
+                    "primary": "DejaVuSans",
+                    "bold": "DejaVuSans-Bold",
+                    "emoji": "TwitterEmojis",
+                },
+                "font_size": {
+                    "name": 24,
+                    "title": 16,
+                    "section_header": 14,
+                    "job_title": 12,
+                    "normal": 8,
+                },
+            }
+        },
+    }
+
+
+@pytest.fixture
+def complete_resume_data(sample_resume_data):
+    """Sample resume data with every section, as `main` renders it."""
+    return dict(sample_resume_data, Articles={})
+
+
+@pytest.fixture
+def tmp_config(tmp_path, sample_config):
+    """Sample configuration writing its outputs and font cache under tmp_path."""
+    config = dict(sample_config, output_directory=str(tmp_path / "output"))
+    config["font_cache_directory"] = str(tmp_path / "cache")
+    return config
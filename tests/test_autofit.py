@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from resume_generator.autofit import SCALE_PRECISION
+from resume_generator.autofit import count_pages
+from resume_generator.autofit import fit_to_pages
+from resume_generator.autofit import scaled_config
+from resume_generator.fragments import MemoryFragmentCache
+from resume_generator.main import build_resume
+from resume_generator.main import validate_resume_data
+from resume_generator.profiling import Tracer
+from resume_generator.profiling import start_tracing
+from resume_generator.profiling import stop_tracing
+
+
+@pytest.fixture
+def resume_data():
+    """Demo resume with its jobs repeated, so that it takes two pages."""
+    with open("demo.json", "r") as file:
+        resume = json.load(file)
+    resume.setdefault("Articles", {})
+    job = next(iter(resume["Jobs"].values()))
+    for index in range(6):
+        resume["Jobs"][f"copy{index}"] = dict(job)
+    return validate_resume_data(resume)
+
+
+def test_scaled_config_leaves_original_unchanged(config):
+    """Scaling copies the configuration instead of modifying it."""
+    scaled = scaled_config(config, 0.8)
+    assert scaled["templates"][config["template"]]["scale"] == 0.8
+    assert "scale" not in config["templates"][config["template"]]
+
+
+def test_resume_that_fits_is_not_scaled(config, resume_data):
+    """A resume within the page limit keeps its original sizes."""
+    pages = count_pages(config, resume_data)
+    assert pages == 2
+    result = fit_to_pages(config, resume_data, pages)
+    assert (result.scale, result.pages) == (1, pages)
+
+
+def test_resume_is_shrunk_to_fit(config, resume_data):
+    """The largest scale that fits is chosen, to the search precision."""
+    result = fit_to_pages(config, resume_data, 1)
+    assert result.pages == 1
+    assert result.scale < 1
+    assert count_pages(result.config, resume_data) == 1
+    larger = scaled_config(config, result.scale + 2 * SCALE_PRECISION)
+    assert count_pages(larger, resume_data) > 1
+
+
+def test_fitting_again_steps_over_cached_fragments(config, resume_data):
+    """A fit measured from cached fragment heights chooses the same scale."""
+    fragment_cache = MemoryFragmentCache()
+    first = fit_to_pages(config, resume_data, 1, fragment_cache=fragment_cache)
+    tracer = start_tracing(Tracer())
+    try:
+        again = fit_to_pages(config, resume_data, 1, fragment_cache=fragment_cache)
+    finally:
+        stop_tracing()
+    assert (again.scale, again.pages) == (first.scale, first.pages)
+    assert tracer.counters["fragments_skipped"] > 0
+
+
+def test_resumes_are_built_to_fit_the_page_limit(config, resume_data):
+    """Every entry point building through `build_resume` honours `max_pages`."""
+    config["max_pages"] = 1
+    pdf = build_resume(resume_data, config)
+    assert pdf.pages_count == pdf.fit.pages == 1
+    # The fitted config resolves the limit into its scale, so it is not fitted again
+    assert "max_pages" not in fit_to_pages(config, resume_data, 1).config
+
+
+def test_resume_too_long_to_fit(config, resume_data):
+    """A page limit that cannot be met even at the minimum scale is an error."""
+    with pytest.raises(ValueError, match="does not fit in 1 page"):
+        fit_to_pages(config, resume_data, 1, min_scale=0.95)
@@ -0,0 +1,93 @@
+import pytest
+
+from resume_generator.batch import BatchRenderer
+from resume_generator.batch import load_targets
+from resume_generator.schemas import ApplicationInfo
+
+
+@pytest.fixture
+def config(config):
+    config["file_name_template"] = "Resume - {name} - {company} - {job}.pdf"
+    return config
+
+
+def test_load_targets(tmp_path):
+    """Targets are read one per line, skipping blank lines."""
+    path = tmp_path / "targets.jsonl"
+    path.write_text(
+        '{"company": "Acme", "job": "Engineer"}\n\n{"company": "Globex", "job": "SRE"}\n'
+    )
+    assert load_targets(path) == [
+        ApplicationInfo(company="Acme", job="Engineer"),
+        ApplicationInfo(company="Globex", job="SRE"),
+    ]
+
+    path.write_text('{"company": "Acme", "job": "Engineer"}\n{"company": ""}\n')
+    with pytest.raises(ValueError, match="line 2"):
+        load_targets(path)
+
+
+def test_render_all_targets(tmp_path, config, resume_data):
+    """Each target gets its own PDF in the output directory layout."""
+    renderer = BatchRenderer(config, resume_data)
+    targets = [
+        ApplicationInfo(company="Acme", job="Engineer"),
+        ApplicationInfo(company="Globex", job="SRE"),
+    ]
+    results = renderer.render_all(targets)
+
+    assert [result.error for result in results] == [None, None]
+    for target, result in zip(targets, results):
+        expected = (
+            tmp_path
+            / "output"
+            / target.company
+            / target.job
+            / f"Resume - John Doe - {target.company} - {target.job}.pdf"
+        )
+        assert result.output_path == str(expected)
+        assert expected.read_bytes().startswith(b"%PDF")
+        assert result.seconds > 0
+
+
+def test_parallel_render_isolates_errors(tmp_path, config, resume_data):
+    """Worker processes report results in target order, failures included."""
+    renderer = BatchRenderer(config, resume_data)
+    targets = [
+        ApplicationInfo(company="Acme", job="Engineer"),
+        ApplicationInfo(company="Bad\0Company", job="Engineer"),
+        ApplicationInfo(company="Globex", job="SRE"),
+    ]
+    results = renderer.render_all(targets, workers=2, chunk_size=1)
+
+    assert [result.application_info for result in results] == targets
+    assert results[0].error is None and results[2].error is None
+    assert "Error creating output directory" in results[1].error
+    assert (tmp_path / "output" / "Globex" / "SRE").is_dir()
+
+
+def test_optimized_targets_report_their_size(config, resume_data):
+    """With optimize_size, each result carries the size before and after optimization."""
+    config["optimize_size"] = True
+    (result,) = BatchRenderer(config, resume_data).render_all(
+        [ApplicationInfo(company="Acme", job="Engineer")]
+    )
+    assert result.error is None
+    before, after = result.output_sizes
+    assert after < before
+    with open(result.output_path, "rb") as file:
+        assert len(file.read()) == after
+
+
+def test_targets_are_written_in_every_format(config, resume_data):
+    """The formats of output_formats are written next to each target's PDF."""
+    config["output_formats"] = ["txt", "html"]
+    (result,) = BatchRenderer(config, resume_data).render_all(
+        [ApplicationInfo(company="Acme", job="Engineer")]
+    )
+    assert result.error is None
+    stem = result.output_path.removesuffix(".pdf")
+    with open(f"{stem}.txt", encoding="utf-8") as file:
+        assert file.read().startswith("John Doe\n")
+    with open(f"{stem}.html", encoding="utf-8") as file:
+        assert "<h1>John Doe</h1>" in file.read()
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from resume_generator.benchmark import SCENARIOS
+from resume_generator.benchmark import WORDS
+from resume_generator.benchmark import compare
+from resume_generator.benchmark import main
+from resume_generator.benchmark import run_scenario
+from resume_generator.benchmark import synthetic_resume
+from resume_generator.main import validate_resume_data
+
+
+@pytest.mark.parametrize("name", list(SCENARIOS))
+def test_synthetic_resumes_validate(name):
+    parameters = dict(SCENARIOS[name], jobs=min(SCENARIOS[name]["jobs"], 3))
+    resume_data = validate_resume_data(synthetic_resume(**parameters))
+    assert len(resume_data[2]) == parameters["jobs"]
+    assert len(resume_data[6]) == max(parameters.get("links", 0), 2)
+
+
+def test_synthetic_resume_is_deterministic():
+    assert synthetic_resume(jobs=5, seed=1) == synthetic_resume(jobs=5, seed=1)
+    assert synthetic_resume(jobs=5, seed=1) != synthetic_resume(jobs=5, seed=2)
+
+
+def test_multi_script_resume_uses_every_script():
+    text = json.dumps(synthetic_resume(**SCENARIOS["multi-script"]), ensure_ascii=False)
+    for script in SCENARIOS["multi-script"]["scripts"]:
+        assert any(word in text for word in WORDS[script]), script
+
+
+def test_run_scenario_times_each_stage():
+    result = run_scenario("single", repeat=1)
+    stages = list(result["stages"])
+    assert stages[:4] == ["load_config", "load_resume_data", "setup_pdf", "build_sections"]
+    assert stages[-1] == "pdf.output"
+    assert "add_section:jobs" in stages
+    assert result["pages"] >= 1
+    assert result["pdf_bytes"] > 0
+    assert result["parameters"] == SCENARIOS["single"]
+
+
+def test_compare_reports_regressions():
+    def results(**medians):
+        stages = {stage: {"min_ms": ms, "median_ms": ms} for stage, ms in medians.items()}
+        return {"scenarios": {"single": {"stages": stages}}}
+
+    baseline = results(setup_pdf=10.0, output=100.0, load_config=0.2)
+    current = results(setup_pdf=10.5, output=130.0, load_config=0.9, new_stage=5.0)
+    regressions = compare(current, baseline, threshold=0.1)
+    assert [(r.stage, r.baseline_ms, r.current_ms) for r in regressions] == [
+        ("output", 100.0, 130.0)
+    ]
+    assert regressions[0].change == pytest.approx(0.3)
+    assert compare(current, {"scenarios": {}}) == []
+
+
+def test_main_writes_results_and_compares(tmp_path):
+    output = tmp_path / "results.json"
+    assert main(["--scenarios", "single", "--repeat", "1", "--output", str(output)]) == 0
+    results = json.loads(output.read_text())
+    assert list(results["scenarios"]) == ["single"]
+
+    # A much faster baseline makes every stage above the noise floor a regression
+    for stage in results["scenarios"]["single"]["stages"].values():
+        stage["median_ms"] /= 100
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(results))
+    args = ["--scenarios", "single", "--repeat", "1", "--output", str(output)]
+    assert main(args + ["--baseline", str(baseline)]) == 1
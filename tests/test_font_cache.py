@@ -0,0 +1,72 @@
+import os
+import shutil
+
+from fpdf import FPDF
+
+from resume_generator.font_cache import FontCache
+from resume_generator.font_cache import FontMetrics
+from resume_generator.font_cache import main as font_cache_main
+
+FONT_PATH = "fonts/DejaVuSans.ttf"
+
+
+def test_cached_font_matches_parsed_font(tmp_path):
+    """Fonts rebuilt from the cache are identical to fonts parsed by fpdf."""
+    cache = FontCache(tmp_path / "cache")
+    cache.build(FONT_PATH)
+
+    parsed_pdf = FPDF()
+    parsed_pdf.add_font("DejaVuSans", "", FONT_PATH)
+    cached_pdf = FPDF()
+    cache.add_font(cached_pdf, "DejaVuSans", FONT_PATH)
+
+    parsed = parsed_pdf.fonts["dejavusans"]
+    cached = cached_pdf.fonts["dejavusans"]
+    for attribute in ("i", "fontkey", "scale", "cw", "cmap", "glyph_ids", "name", "up", "ut"):
+        assert getattr(cached, attribute) == getattr(parsed, attribute)
+    assert vars(cached.desc) == vars(parsed.desc)
+    assert cached.cw[0x10FFFF] == parsed.cw[0x10FFFF]
+
+
+def test_metrics_roundtrip(tmp_path):
+    """The binary cache format preserves every table."""
+    metrics = FontCache(tmp_path).build(FONT_PATH)
+    restored = FontMetrics.from_bytes(metrics.to_bytes())
+    assert restored.header == metrics.header
+    assert restored.codepoints == metrics.codepoints
+    assert restored.widths == metrics.widths
+    assert restored.glyph_ids == metrics.glyph_ids
+    assert restored.glyph_names == metrics.glyph_names
+
+
+def test_stale_entry_is_rebuilt(tmp_path):
+    """Changing the font file invalidates its cache entry."""
+    font_path = tmp_path / "Font.ttf"
+    shutil.copy(FONT_PATH, font_path)
+    cache = FontCache(tmp_path / "cache")
+    mtime = cache.load(font_path).header["mtime_ns"]
+
+    # Touching the file keeps the entry since the content hash is unchanged
+    os.utime(font_path, ns=(mtime + 10**9, mtime + 10**9))
+    assert cache.load(font_path).header["mtime_ns"] == mtime + 10**9
+
+    shutil.copy("fonts/DejaVuSans-Bold.ttf", font_path)
+    assert cache.load(font_path).header["name"] == "DejaVuSansBold"
+
+
+def test_build_and_clear_commands(tmp_path, capsys):
+    """The CLI pre-builds the cache for a font directory and clears it."""
+    fonts_dir = tmp_path / "fonts"
+    fonts_dir.mkdir()
+    shutil.copy(FONT_PATH, fonts_dir)
+    cache_dir = tmp_path / "cache"
+
+    args = ["--fonts-dir", str(fonts_dir), "--cache-dir", str(cache_dir)]
+    assert font_cache_main(["build", *args]) == 0
+    assert len(list(cache_dir.glob("*.bin"))) == 1
+    assert (cache_dir / "coverage.idx").exists()
+
+    (cache_dir / "notes.txt").write_text("not a cache file")
+    assert font_cache_main(["clear", "--cache-dir", str(cache_dir)]) == 0
+    assert list(cache_dir.iterdir()) == [cache_dir / "notes.txt"]
+    assert "Removed 2 cache files" in capsys.readouterr().out
@@ -0,0 +1,75 @@
+import shutil
+
+import pytest
+
+from resume_generator.font_cache import FontCache
+from resume_generator.font_coverage import CoverageIndex
+from resume_generator.font_coverage import collect_codepoints
+from resume_generator.font_coverage import select_fallback_fonts
+from resume_generator.schemas import ApplicationInfo
+from resume_generator.schemas import Education
+from resume_generator.schemas import Languages
+from resume_generator.sections.registry import drawn_sections
+
+
+@pytest.fixture
+def index(tmp_path):
+    fonts_dir = tmp_path / "fonts"
+    fonts_dir.mkdir()
+    for font in ("DejaVuSans", "Loma", "Loma-Bold", "lohit_hi"):
+        shutil.copy(f"fonts/{font}.ttf", fonts_dir)
+    return CoverageIndex.load(fonts_dir, FontCache(tmp_path / "cache"))
+
+
+def test_index_roundtrip(index):
+    """The serialized index preserves every font bitset."""
+    restored = CoverageIndex.from_bytes(index.to_bytes())
+    assert restored.fonts == index.fonts
+    assert restored.coverage == index.coverage
+    assert restored.key == index.key
+
+
+def test_select_fonts_picks_smallest_cover(index):
+    """Each script is covered by one font, and regular faces are preferred."""
+    codepoints = {ord(char) for char in "ภาษาไทย हिन्दी"} - {ord(" ")}
+    assert index.missing("DejaVuSans", codepoints) == codepoints
+    assert sorted(index.select_fonts(codepoints)) == ["Loma", "lohit_hi"]
+
+
+def test_select_fonts_fails_on_uncovered_characters(index):
+    """Characters that no font can draw are reported before rendering."""
+    with pytest.raises(ValueError) as excinfo:
+        index.select_fonts({ord("ก"), 0x1F680})
+    assert "U+1F680" in str(excinfo.value)
+    assert "U+0E01" not in str(excinfo.value)
+
+
+def test_fallback_fonts_ignore_excluded_entries(index):
+    """Only the text of included entries needs to be covered."""
+    languages = [
+        Languages(language="ภาษาไทย", proficiency="Native or Bilingual"),
+        Languages(include=False, language="हिन्दी", proficiency="Elementary"),
+    ]
+    assert ord("ह") not in collect_codepoints(languages)
+    assert select_fallback_fonts((languages,), ["DejaVuSans"], [], index) == ["Loma"]
+
+
+def test_fallback_fonts_ignore_sections_not_drawn(index):
+    """Application info and disabled sections are never drawn, so need no font."""
+    application_info = ApplicationInfo(company="\U00013000 Ltd", job="Engineer")
+    education = [
+        Education(
+            school="University",
+            field="Egyptology",
+            duration=["2010-09", "2014-06"],
+            description="Reading \U00013000 hieroglyphs.",
+        )
+    ]
+    languages = [Languages(language="ภาษาไทย", proficiency="Native or Bilingual")]
+    resume_data = (application_info, None, [], education, [], [], [], [], languages, [])
+
+    drawn = drawn_sections(resume_data, ["languages"])
+    assert drawn == [languages]
+    assert select_fallback_fonts(drawn, ["DejaVuSans"], [], index) == ["Loma"]
+    with pytest.raises(ValueError, match="U\\+13000"):
+        select_fallback_fonts(drawn_sections(resume_data, ["education"]), ["DejaVuSans"], [], index)
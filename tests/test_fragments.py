@@ -0,0 +1,159 @@
+import os
+import shutil
+from datetime import datetime
+from datetime import timezone
+
+import pytest
+
+from resume_generator.font_cache import FontCache
+from resume_generator.fragments import DiskFragmentCache
+from resume_generator.fragments import DrawFragment
+from resume_generator.fragments import MemoryFragmentCache
+from resume_generator.fragments import fragment_cache_from_config
+from resume_generator.pdf import ResumePDF
+from resume_generator.profiling import Tracer
+from resume_generator.profiling import start_tracing
+from resume_generator.profiling import stop_tracing
+from resume_generator.schemas import Jobs
+from resume_generator.sections import JobsSection
+from resume_generator.styles import modern_styles
+
+FONT_FILES = {
+    "DejaVuSans": "fonts/DejaVuSans.ttf",
+    "DejaVuSans-Bold": "fonts/DejaVuSans-Bold.ttf",
+}
+CONFIG = {"cell_width": 190, "cell_height": 4}
+
+JOBS = [
+    Jobs(
+        title=f"Engineer {index}",
+        company="Acme",
+        employment_type="Full-time",
+        duration=["2020-01", "2022-01"],
+        description="Built and operated the **billing** [platform](https://example.com). " * 12,
+        skills=["Python", "PostgreSQL"],
+    )
+    for index in range(6)
+]
+
+
+@pytest.fixture
+def font_cache(tmp_path):
+    return FontCache(tmp_path / "fonts")
+
+
+def render(font_cache, fragment_cache, jobs=JOBS, styles=modern_styles):
+    pdf = ResumePDF(FONT_FILES, [], font_cache, fragment_cache=fragment_cache, inline_markup=True)
+    pdf.set_creation_date(datetime(2024, 1, 1, tzinfo=timezone.utc))
+    pdf.add_page()
+    JobsSection(pdf, jobs, styles, CONFIG).render()
+    return bytes(pdf.output())
+
+
+@pytest.mark.parametrize("backend", ["memory", "disk"])
+def test_replayed_fragments_match_uncached_render(tmp_path, font_cache, backend):
+    """Rendering from recorded and replayed fragments gives the same PDF."""
+    if backend == "memory":
+        cache = MemoryFragmentCache()
+    else:
+        cache = DiskFragmentCache(tmp_path / "fragments")
+    expected = render(font_cache, None)
+
+    assert render(font_cache, cache) == expected
+    assert cache.stats() == {"hits": 0, "misses": 7, "hit_rate": 0.0}
+    assert render(font_cache, cache) == expected
+    assert cache.hits == 1
+
+
+def test_changed_entry_reuses_the_others(font_cache):
+    """Only the entries that changed are laid out again."""
+    cache = MemoryFragmentCache()
+    render(font_cache, cache)
+    jobs = [JOBS[0].model_copy(update={"title": "Staff Engineer"}), *JOBS[1:]]
+    expected = render(font_cache, None, jobs)
+
+    assert render(font_cache, cache, jobs) == expected
+    assert (cache.hits, cache.misses) == (5, 9)
+
+
+def test_style_change_invalidates_fragments(font_cache):
+    """Fragments are keyed by the resolved styles."""
+    cache = MemoryFragmentCache()
+    render(font_cache, cache)
+    styles = {**modern_styles, "jobs": {**modern_styles["jobs"]}}
+    styles["jobs"]["details"] = {"font": "DejaVuSans", "size": 9}
+    render(font_cache, cache, styles=styles)
+    assert cache.hits == 0
+
+
+def lay_out(font_cache, fragment_cache, jobs=JOBS, layout_only=False):
+    pdf = ResumePDF(FONT_FILES, [], font_cache, fragment_cache=fragment_cache, inline_markup=True)
+    pdf.layout_only = layout_only
+    pdf.add_page()
+    JobsSection(pdf, jobs, modern_styles, CONFIG).render()
+    return pdf
+
+
+def test_fragment_height_matches_layout(font_cache):
+    """The measured height of a fragment is the vertical space it took."""
+    cache = MemoryFragmentCache()
+    pdf = ResumePDF(FONT_FILES, [], font_cache, fragment_cache=cache)
+    pdf.add_page()
+    start = pdf.y
+    JobsSection(pdf, JOBS[:1], modern_styles, CONFIG).render()
+    (fragment,) = [value for value in cache._fragments.values() if value.ops[4][3] == "Engineer 0"]
+    assert fragment.height == pytest.approx(pdf.y - start - 8)
+    assert fragment.page_breaks == 0
+
+
+def test_layout_only_pass_steps_over_cached_entries(font_cache):
+    """Entries that fit on the page are skipped by height, with the same layout."""
+    cache = MemoryFragmentCache()
+    lay_out(font_cache, cache)
+    jobs = [JOBS[0].model_copy(update={"title": "Staff Engineer"}), *JOBS[1:]]
+    expected = lay_out(font_cache, MemoryFragmentCache(), jobs)
+    tracer = start_tracing(Tracer())
+    try:
+        pdf = lay_out(font_cache, cache, jobs, layout_only=True)
+    finally:
+        stop_tracing()
+
+    assert (pdf.page, pdf.y) == (expected.page, pytest.approx(expected.y))
+    assert 0 < tracer.counters["fragments_skipped"] <= 5
+    # The section recorded around the skipped entries replays like a drawn one
+    assert render(font_cache, cache, jobs) == render(font_cache, None, jobs)
+
+
+def test_replaced_font_file_changes_the_key(tmp_path, font_cache):
+    """Fragments recorded with a font file are not replayed once it is replaced."""
+    font_path = tmp_path / "DejaVuSans.ttf"
+    shutil.copy(FONT_FILES["DejaVuSans"], font_path)
+
+    def key():
+        pdf = ResumePDF({"DejaVuSans": str(font_path)}, [], font_cache)
+        return JobsSection(pdf, JOBS[:1], modern_styles, CONFIG).fragment_key("entry", JOBS[0])
+
+    first = key()
+    assert key() == first
+    mtime = font_path.stat().st_mtime_ns
+    os.utime(font_path, ns=(mtime + 10**9, mtime + 10**9))
+    assert key() != first
+
+
+def test_cache_is_off_unless_configured_or_defaulted():
+    """One-shot renders default to no cache; long-running modes ask for memory."""
+    assert fragment_cache_from_config({}) is None
+    assert isinstance(fragment_cache_from_config({}, default="memory"), MemoryFragmentCache)
+    assert fragment_cache_from_config({"fragment_cache": "off"}, default="memory") is None
+
+
+def test_memory_cache_evicts_least_recently_used():
+    """The memory backend keeps at most max_entries fragments."""
+    cache = MemoryFragmentCache(max_entries=2)
+    for key in ("a", "b"):
+        cache.put(key, DrawFragment(()))
+    cache.get("a")
+    cache.put("c", DrawFragment(()))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert (cache.hits, cache.misses) == (2, 1)
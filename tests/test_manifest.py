@@ -0,0 +1,108 @@
+import os
+
+import pytest
+
+from resume_generator.batch import BatchRenderer
+from resume_generator.manifest import BuildManifest
+from resume_generator.manifest import InputDigest
+from resume_generator.manifest import manifest_path
+from resume_generator.schemas import ApplicationInfo
+from resume_generator.styles import modern_styles
+
+TARGETS = [
+    ApplicationInfo(company="Acme", job="Engineer"),
+    ApplicationInfo(company="Globex", job="SRE"),
+]
+
+
+@pytest.fixture
+def config(config, monkeypatch):
+    monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+    config["skip_unchanged"] = True
+    config["deterministic_output"] = True
+    return config
+
+
+@pytest.fixture
+def resume_data(resume_data):
+    return (TARGETS[0], *resume_data[1:])
+
+
+def test_manifest_is_stored_next_to_output_directory(tmp_path, config):
+    """The manifest is named after the output directory unless configured."""
+    assert manifest_path(config) == str(tmp_path / "output.manifest.json")
+    config["manifest_file"] = "builds.json"
+    assert manifest_path(config) == "builds.json"
+
+
+def test_digest_covers_inputs(config, resume_data):
+    """Any change to the data, config or target changes the digest."""
+    digest = InputDigest(config, resume_data, modern_styles).for_target(TARGETS[0])
+    assert digest == InputDigest(config, resume_data, modern_styles).for_target(TARGETS[0])
+    assert digest != InputDigest(config, resume_data, modern_styles).for_target(TARGETS[1])
+
+    general = resume_data[1].model_copy(update={"title": "Staff Engineer"})
+    changed_data = (resume_data[0], general, *resume_data[2:])
+    assert digest != InputDigest(config, changed_data, modern_styles).for_target(TARGETS[0])
+    changed_config = {**config, "template": "modern"}
+    assert digest != InputDigest(changed_config, resume_data, modern_styles).for_target(TARGETS[0])
+
+
+def test_unchanged_targets_are_skipped(config, resume_data):
+    """A second build only renders the targets whose inputs changed."""
+    results = BatchRenderer(config, resume_data).render_all(TARGETS)
+    assert [result.skipped for result in results] == [False, False]
+    outputs = [result.output_path for result in results]
+    first_build = [open(path, "rb").read() for path in outputs]
+
+    results = BatchRenderer(config, resume_data).render_all(TARGETS)
+    assert [result.skipped for result in results] == [True, True]
+    assert [result.output_path for result in results] == outputs
+
+    # Deterministic output is byte-reproducible
+    results = BatchRenderer(config, resume_data).render_all(TARGETS[1:], force=True)
+    assert not results[0].skipped
+    assert open(results[0].output_path, "rb").read() == first_build[1]
+
+    config["templates"][config["template"]]["cell_height"] = 5
+    results = BatchRenderer(config, resume_data).render_all(TARGETS)
+    assert [result.skipped for result in results] == [False, False]
+
+
+def test_missing_output_is_rebuilt(tmp_path, config, resume_data):
+    """A target whose PDF was deleted is rendered again."""
+    BatchRenderer(config, resume_data).render_all(TARGETS[:1])
+    manifest = BuildManifest.load(manifest_path(config))
+    ((digest, entry),) = manifest.entries.items()
+    assert manifest.lookup(digest) == entry["output"]
+
+    (tmp_path / entry["output"]).unlink()
+    assert manifest.lookup(digest) is None
+    results = BatchRenderer(config, resume_data).render_all(TARGETS[:1])
+    assert not results[0].skipped
+
+
+def test_modified_outputs_are_rebuilt(config, resume_data):
+    """A file of the build that was edited in place or deleted is rendered again."""
+    config["output_formats"] = ["txt"]
+    (result,) = BatchRenderer(config, resume_data).render_all(TARGETS[:1])
+    pdf_path, text_path = result.output_paths
+    assert text_path.endswith(".txt")
+    manifest = BuildManifest.load(manifest_path(config))
+    ((digest, entry),) = manifest.entries.items()
+    assert sorted(entry["files"]) == sorted(result.output_paths)
+
+    # Same size, different content
+    data = bytearray(open(pdf_path, "rb").read())
+    data[-2] ^= 1
+    open(pdf_path, "wb").write(data)
+    assert manifest.lookup(digest) is None
+    (result,) = BatchRenderer(config, resume_data).render_all(TARGETS[:1])
+    assert not result.skipped
+
+    os.remove(text_path)
+    (result,) = BatchRenderer(config, resume_data).render_all(TARGETS[:1])
+    assert not result.skipped
+    assert os.path.exists(text_path)
+    (result,) = BatchRenderer(config, resume_data).render_all(TARGETS[:1])
+    assert result.skipped
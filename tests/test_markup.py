@@ -0,0 +1,75 @@
+import pytest
+
+from resume_generator.markup import InlineRun
+from resume_generator.markup import has_markup
+from resume_generator.markup import parse_inline
+
+
+def test_bold_and_links_are_split_into_runs():
+    runs = parse_inline("Built **billing** with [Stripe](https://stripe.com), 2x faster")
+    assert runs == (
+        InlineRun("Built "),
+        InlineRun("billing", bold=True),
+        InlineRun(" with "),
+        InlineRun("Stripe", link="https://stripe.com"),
+        InlineRun(", 2x faster"),
+    )
+    assert has_markup(runs)
+
+
+def test_unclosed_markers_are_plain_text():
+    text = "Cut costs by 2** and [wrote] (docs)"
+    assert parse_inline(text) == (InlineRun(text),)
+    assert not has_markup(parse_inline(text))
+    assert parse_inline("") == ()
+
+
+def test_unterminated_bold_after_a_closed_one_is_plain_text():
+    assert parse_inline("**Led** the team, cut latency by **40%") == (
+        InlineRun("Led", bold=True),
+        InlineRun(" the team, cut latency by **40%"),
+    )
+
+
+def test_nested_brackets_are_plain_text():
+    text = "See [the [design] doc](https://example.com/doc) for details"
+    assert parse_inline(text) == (InlineRun(text),)
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "javascript:alert%281%29",
+        "JavaScript:alert%281%29",
+        "data:text/html;base64,PHNjcmlwdD4=",
+        "file:///etc/passwd",
+        "/relative/path",
+        "http://[invalid",
+    ],
+)
+def test_links_with_other_schemes_are_plain_text(url):
+    text = f"Read [this]({url}) and **more**"
+    assert parse_inline(text) == (
+        InlineRun(f"Read [this]({url}) and "),
+        InlineRun("more", bold=True),
+    )
+
+
+@pytest.mark.parametrize("url", ["http://example.com", "HTTPS://example.com", "mailto:a@b.com"])
+def test_http_and_mailto_links_are_drawn(url):
+    assert parse_inline(f"[contact]({url})") == (InlineRun("contact", link=url),)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Reduced costs by 2 * 3 = 6%",
+        "Used C++ and [optional] flags",
+        "Wrote the (internal) docs at example.com",
+        "Multi-line\ndescription with * and ] characters",
+    ],
+)
+def test_plain_text_is_unchanged(text):
+    runs = parse_inline(text)
+    assert runs == (InlineRun(text),)
+    assert not has_markup(runs)
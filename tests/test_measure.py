@@ -0,0 +1,98 @@
+import os
+import shutil
+from datetime import datetime
+from datetime import timezone
+
+import pytest
+from fpdf import XPos
+from fpdf import YPos
+
+from resume_generator.font_cache import FontCache
+from resume_generator.measure import TextMeasurer
+from resume_generator.pdf import ResumePDF
+
+FONT_FILES = {"DejaVuSans": "fonts/DejaVuSans.ttf"}
+
+TEXTS = [
+    "Short line",
+    "Led the migration of a monolith to services, cutting deploy times from hours "
+    "to minutes and on-call pages by half across four product teams. " * 4,
+    "First paragraph\nSecond paragraph\n\nAfter a blank line\n",
+    "Averyveryveryveryveryveryveryveryveryveryveryverylongwordwithoutanyspaces "
+    "followed by words",
+    "Trailing spaces   \n   and leading spaces",
+    # fpdf drops a last line whose characters have no width
+    "Zero-width last line\n\u0301",
+    "",
+]
+
+
+@pytest.fixture
+def font_cache(tmp_path):
+    return FontCache(tmp_path / "cache")
+
+
+def render(font_cache, measured, width):
+    pdf = ResumePDF(FONT_FILES, [], font_cache, measurer=TextMeasurer())
+    pdf.set_creation_date(datetime(2024, 1, 1, tzinfo=timezone.utc))
+    pdf.add_page()
+    pdf.set_font("DejaVuSans", size=9)
+    multi_cell = pdf.multi_cell_measured if measured else pdf.multi_cell
+    for text in TEXTS * 8:
+        multi_cell(width, 5, text=text, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    return bytes(pdf.output())
+
+
+@pytest.mark.parametrize("width", [0, 60, 120])
+def test_measured_output_matches_multi_cell(font_cache, width):
+    """Wrapping with the measurement engine produces the same PDF as fpdf."""
+    assert render(font_cache, True, width) == render(font_cache, False, width)
+
+
+def test_widths_match_fpdf(font_cache):
+    """String and word widths are those computed by fpdf."""
+    pdf = ResumePDF(FONT_FILES, [], font_cache)
+    pdf.set_font("DejaVuSans", size=9)
+    font = pdf.current_font
+    measurer = TextMeasurer()
+    words = ["Résumé", "", "naïve", "😀", "generator"]
+    expected = [font.get_text_width(word, 9, None)[1] for word in words]
+    assert measurer.text_widths(font, 9, words) == expected
+    assert measurer.text_width(font, 9, "Résumé") == expected[0]
+
+
+def test_wrap_is_memoized(font_cache):
+    """Wrapping the same text with the same font and size hits the cache."""
+    pdf = ResumePDF(FONT_FILES, [], font_cache)
+    pdf.set_font("DejaVuSans", size=9)
+    measurer = TextMeasurer(cache_size=2)
+    text = TEXTS[1]
+    first = measurer.wrap(pdf.current_font, 9, pdf.k, text, 100)
+    assert measurer.wrap(pdf.current_font, 9, pdf.k, text, 100) is first
+    assert measurer._wrap.cache_info().hits == 1
+    assert measurer.wrap(pdf.current_font, 9, pdf.k, "a­b", 100) is None
+
+
+def test_zero_width_last_line_is_left_to_fpdf(font_cache):
+    """A last line whose characters have no width goes through fpdf's line breaker."""
+    pdf = ResumePDF(FONT_FILES, [], font_cache)
+    pdf.set_font("DejaVuSans", size=9)
+    assert TextMeasurer().wrap(pdf.current_font, 9, pdf.k, "Accent\n\u0301", 100) is None
+
+
+def test_replaced_font_file_is_measured_again(tmp_path, font_cache):
+    """Memoized widths are keyed by the font file's size and modification time."""
+    font_path = tmp_path / "DejaVuSans.ttf"
+    shutil.copy(FONT_FILES["DejaVuSans"], font_path)
+    pdf = ResumePDF({"DejaVuSans": str(font_path)}, [], font_cache)
+    pdf.set_font("DejaVuSans", size=9)
+    measurer = TextMeasurer()
+    measurer.text_width(pdf.current_font, 9, "Résumé")
+    first = measurer.font_key(pdf.current_font)
+
+    mtime = font_path.stat().st_mtime_ns
+    os.utime(font_path, ns=(mtime + 10**9, mtime + 10**9))
+    measurer.text_width(pdf.current_font, 9, "Résumé")
+    assert measurer.font_key(pdf.current_font) != first
+    assert measurer.text_units.cache_info().misses == 2
+    assert list(measurer._fonts) == [measurer.font_key(pdf.current_font)]
@@ -0,0 +1,90 @@
+import json
+import tracemalloc
+
+import pytest
+
+from resume_generator.memory import MB
+from resume_generator.memory import MemoryBudgetExceeded
+from resume_generator.memory import MemoryTracer
+from resume_generator.memory import _package
+from resume_generator.profiling import span
+from resume_generator.profiling import start_tracing
+from resume_generator.profiling import stop_tracing
+
+
+@pytest.fixture
+def tracer():
+    tracer = start_tracing(MemoryTracer())
+    yield tracer
+    stop_tracing()
+    if tracer._started:
+        tracer.finish()
+
+
+def test_peak_and_retained_memory(tracer):
+    kept = []
+    with span("outer"):
+        with span("temporary"):
+            buffer = bytearray(2 * MB)
+            del buffer
+        with span("retained"):
+            kept.append(bytearray(MB))
+    stats = tracer.report()["spans"]
+    by_name = {span["name"]: span for span in stats}
+    assert [span["name"] for span in stats] == ["temporary", "retained", "outer"]
+    assert by_name["temporary"]["peak_bytes"] >= 2 * MB
+    assert by_name["temporary"]["retained_bytes"] < MB
+    assert by_name["retained"]["retained_bytes"] >= MB
+    # The enclosing span saw the peak of the first nested span
+    assert by_name["outer"]["peak_bytes"] >= 2 * MB
+    assert by_name["outer"]["retained_bytes"] >= MB
+    assert tracer.peak >= 2 * MB
+
+
+def test_calls_are_aggregated_by_name(tracer):
+    kept = []
+    for _ in range(3):
+        with span("cell"):
+            kept.append(bytearray(100_000))
+    (cell,) = tracer.report()["spans"]
+    assert cell["calls"] == 3
+    assert cell["retained_bytes"] >= 300_000
+
+
+def test_budget_aborts_render():
+    start_tracing(MemoryTracer(budget=MB))
+    try:
+        with pytest.raises(MemoryBudgetExceeded, match="memory budget of 1.0 MB in stage"):
+            with span("stage"):
+                buffer = bytearray(2 * MB)
+                del buffer
+    finally:
+        stop_tracing().finish()
+    assert not tracemalloc.is_tracing()
+
+
+def test_report_formats(tracer, tmp_path):
+    kept = []
+    with span("load_resume_data"):
+        kept.append(bytearray(MB))
+    tracer.finish()
+
+    table = tracer.format_report()
+    assert table.startswith("Heap peak:")
+    assert "load_resume_data" in table
+    assert "Retained by package:" in table
+
+    path = tmp_path / "memory.json"
+    tracer.save_report(path)
+    report = json.loads(path.read_text())
+    assert report["budget_bytes"] is None
+    assert report["spans"][0]["name"] == "load_resume_data"
+    assert report["retained_by_package"]
+
+
+def test_package_of_source_file():
+    assert _package("/venv/lib/python3.13/site-packages/fpdf/fpdf.py") == "fpdf"
+    assert _package("/venv/lib/python3.13/site-packages/six.py") == "six"
+    assert _package("/src/resume_generator/pdf.py") == "resume_generator"
+    assert _package("<frozen importlib._bootstrap_external>") == "module code"
+    assert _package("/usr/lib/python3.13/json/decoder.py") == "python"
@@ -0,0 +1,186 @@
+import re
+import zlib
+from io import BytesIO
+
+import pytest
+from fontTools import ttLib
+
+from resume_generator.font_cache import FontCache
+from resume_generator.optimize import OutputSizes
+from resume_generator.optimize import optimize_pdf
+from resume_generator.optimize import parse_pdf
+from resume_generator.pdf import ResumePDF
+
+FONT_FILES = {
+    "DejaVuSans": "fonts/DejaVuSans.ttf",
+    "DejaVuSans-Bold": "fonts/DejaVuSans-Bold.ttf",
+}
+
+
+def render(tmp_path, fallback_fonts=(), optimize_size=False):
+    pdf = ResumePDF(
+        FONT_FILES, list(fallback_fonts), FontCache(tmp_path / "cache"), optimize_size=optimize_size
+    )
+    pdf.creation_date = None
+    pdf.add_page()
+    pdf.set_font("DejaVuSans-Bold", size=12)
+    pdf.cell(text="Jane Doe", new_x="LMARGIN", new_y="NEXT")
+    pdf.set_font("DejaVuSans", size=8)
+    for index in range(3):
+        text = f"Engineer {index}: built reliable services (2019 - 2024)."
+        pdf.multi_cell(0, 4, text, new_x="LMARGIN", new_y="NEXT")
+    pdf.cell(text="Portfolio", link="https://example.com/(portfolio)")
+    return pdf
+
+
+def read_objects(data: bytes) -> dict:
+    """Read the objects of a PDF with a cross-reference stream."""
+    xref_offset = int(data[data.rindex(b"startxref") + 9 :].split()[0])
+    objects = {}
+
+    def parse(offset):
+        header = re.compile(rb"(\d+) 0 obj\n").match(data, offset)
+        assert header is not None
+        value_end = data.find(b"\nstream\n", header.end())
+        value = data[header.end() : value_end]
+        length = int(re.search(rb"/Length (\d+)", value).group(1))
+        stream = data[value_end + 8 : value_end + 8 + length]
+        return int(header.group(1)), value, zlib.decompress(stream)
+
+    _, xref, rows = parse(xref_offset)
+    widths_match = re.search(rb"/W \[(\d+) (\d+) (\d+)\]", xref)
+    assert widths_match is not None
+    widths = [int(width) for width in widths_match.groups()]
+    size = sum(widths)
+    entries = [
+        [int.from_bytes(row[sum(widths[:i]) : sum(widths[: i + 1])], "big") for i in range(3)]
+        for row in (rows[i : i + size] for i in range(0, len(rows), size))
+    ]
+    for number, (kind, field, _) in enumerate(entries):
+        if kind == 1:
+            parsed, value, stream = parse(field)
+            assert parsed == number
+            objects[number] = (value, stream)
+    for number, (kind, field, index) in enumerate(entries):
+        if kind == 2:
+            value, stream = objects[field]
+            first_match = re.search(rb"/First (\d+)", value)
+            assert first_match is not None
+            first = int(first_match.group(1))
+            pairs = [int(token) for token in stream[:first].split()]
+            assert pairs[2 * index] == number
+            start = first + pairs[2 * index + 1]
+            end = first + pairs[2 * index + 3] if 2 * index + 3 < len(pairs) else len(stream)
+            objects[number] = (stream[start:end].strip(), None)
+    return objects
+
+
+def streams(objects: dict) -> list:
+    return [stream for _, stream in objects.values() if stream is not None]
+
+
+def test_optimized_pdf_keeps_the_content(tmp_path):
+    """Page content and text maps are unchanged, in a smaller file with object streams."""
+    data = bytes(render(tmp_path).output())
+    optimized = optimize_pdf(data)
+    assert len(optimized) < len(data) * 0.6
+    assert optimized.startswith(b"%PDF-1.5\n")
+
+    objects = read_objects(optimized)
+    assert any(b"/Type /ObjStm" in value for value, _ in objects.values())
+    assert any(b"/URI (https://example.com/(portfolio))" in value for value, _ in objects.values())
+    # Everything but the font programs decompresses to the same streams
+    _, original, _ = parse_pdf(data)
+    original_streams = []
+    for number, obj in original.items():
+        if obj.stream is not None and b"/Length1" not in obj.value:
+            filtered = b"/FlateDecode" in obj.value
+            original_streams.append(zlib.decompress(obj.stream) if filtered else obj.stream)
+    assert set(original_streams) <= set(streams(objects))
+
+
+def test_fonts_are_subset_without_hinting(tmp_path):
+    """Embedded fonts lose their hinting and glyph names, not their glyphs."""
+    data = bytes(render(tmp_path).output())
+    _, original, _ = parse_pdf(data)
+    before = [
+        ttLib.TTFont(BytesIO(zlib.decompress(obj.stream)))
+        for obj in original.values()
+        if b"/Length1" in obj.value
+    ]
+    objects = read_objects(optimize_pdf(data))
+    after = [
+        ttLib.TTFont(BytesIO(stream)) for value, stream in objects.values() if b"/Length1" in value
+    ]
+    assert len(before) == len(after) == 2
+    for old, new in zip(before, after):
+        assert "fpgm" in old and "fpgm" not in new and "prep" not in new
+        assert len(new["name"].names) < len(old["name"].names)
+        assert len(old.getGlyphOrder()) == len(new.getGlyphOrder())
+        old_glyf, new_glyf = old["glyf"], new["glyf"]
+        for old_name, new_name in zip(old.getGlyphOrder(), new.getGlyphOrder()):
+            old_coordinates = old_glyf[old_name].getCoordinates(old_glyf)[0]
+            assert list(new_glyf[new_name].getCoordinates(new_glyf)[0]) == list(old_coordinates)
+
+
+def test_unused_fonts_are_dropped(tmp_path):
+    """A fallback font registered but never drawn is not embedded."""
+    pdf = render(tmp_path, fallback_fonts=["Loma", "gargi"])
+    pdf.cell(text="ภาษาไทย")
+    assert {"loma", "gargi"} <= set(pdf.fonts)
+    data = bytes(pdf.output())
+    assert data.count(b"/FontFile2") == 4
+
+    objects = read_objects(optimize_pdf(data))
+    base_fonts = [re.search(rb"/BaseFont /(\S+)", value) for value, _ in objects.values()]
+    names = {match.group(1) for match in base_fonts if match}
+    assert names == {b"MPDFAA+DejaVuSansBook", b"MPDFAA+DejaVuSansBold", b"MPDFAA+LomaBook"}
+
+
+def test_identical_objects_are_merged(tmp_path):
+    """Fonts share one copy of their identical CIDSystemInfo dictionaries."""
+    data = bytes(render(tmp_path).output())
+    assert data.count(b"<<\n/Ordering (UCS)") == 2
+    objects = read_objects(optimize_pdf(data))
+    assert sum(value.startswith(b"<<\n/Ordering (UCS)") for value, _ in objects.values()) == 1
+
+
+def test_identical_pages_are_not_merged(tmp_path):
+    """Pages drawing the same content share it, but stay distinct pages."""
+    pdf = ResumePDF(FONT_FILES, [], FontCache(tmp_path / "cache"))
+    pdf.creation_date = None
+    pdf.set_font("DejaVuSans", size=8)
+    for _ in range(2):
+        pdf.add_page()
+        pdf.cell(text="Same page")
+    objects = read_objects(optimize_pdf(bytes(pdf.output())))
+    kids = next(
+        re.search(rb"/Kids \[([^\]]*)\]", value)
+        for value, _ in objects.values()
+        if b"/Kids" in value
+    )
+    pages = re.findall(rb"(\d+) 0 R", kids.group(1))
+    assert len(pages) == len(set(pages)) == 2
+    contents = {
+        re.search(rb"/Contents (\d+) 0 R", objects[int(page)][0]).group(1) for page in pages
+    }
+    assert len(contents) == 1
+
+
+def test_document_reports_output_sizes(tmp_path):
+    """With optimize_size, the document outputs the optimized PDF once."""
+    plain = bytes(render(tmp_path).output())
+    pdf = render(tmp_path, optimize_size=True)
+    path = tmp_path / "resume.pdf"
+    assert pdf.output(str(path)) is None
+    assert pdf.output_sizes == OutputSizes(len(plain), path.stat().st_size)
+    assert bytes(pdf.output()) == path.read_bytes()
+    assert OutputSizes(24000, 10800).describe() == "24,000 -> 10,800 bytes (-55.0%)"
+
+
+def test_unsupported_pdfs_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Not a PDF"):
+        optimize_pdf(b"hello")
+    optimized = optimize_pdf(bytes(render(tmp_path).output()))
+    with pytest.raises(ValueError, match="cross-reference table"):
+        optimize_pdf(optimized)
@@ -0,0 +1,163 @@
+import pytest
+from fpdf.output import OutputProducer
+
+from resume_generator.font_cache import FontCache
+from resume_generator.pdf import ResumePDF
+from resume_generator.styles.compiled import TextStyle
+from resume_generator.styles.compiled import compile_styles
+
+FONT_FILES = {
+    "DejaVuSans": "fonts/DejaVuSans.ttf",
+    "DejaVuSans-Bold": "fonts/DejaVuSans-Bold.ttf",
+    "Loma": "fonts/Loma.ttf",
+}
+
+
+@pytest.fixture
+def pdf(tmp_path):
+    pdf = ResumePDF(FONT_FILES, ["Loma"], FontCache(tmp_path / "cache"))
+    pdf.add_page()
+    return pdf
+
+
+def test_fonts_are_registered_on_first_use(pdf):
+    """Only the font families passed to set_font are registered."""
+    assert pdf.fonts == {}
+    pdf.set_font("DejaVuSans", size=8)
+    assert list(pdf.fonts) == ["dejavusans"]
+    pdf.set_font("DejaVuSans-Bold", size=8)
+    assert list(pdf.fonts) == ["dejavusans", "dejavusans-bold"]
+
+
+def test_fallback_fonts_are_registered_when_needed(pdf):
+    """Fallback fonts are only registered for text the current font cannot draw."""
+    pdf.set_font("DejaVuSans", size=8)
+    pdf.cell(text="Plain text\nwith a line break")
+    assert "loma" not in pdf.fonts
+    assert pdf.pending_fallback_fonts == ["Loma"]
+
+    pdf.cell(text="ภาษาไทย")
+    assert "loma" in pdf.fonts
+    assert pdf.pending_fallback_fonts == []
+
+
+def test_unused_fonts_are_not_embedded(pdf):
+    """The output only embeds the fonts that were used."""
+    pdf.set_font("DejaVuSans", size=8)
+    pdf.cell(text="Hello")
+    assert bytes(pdf.output()).count(b"/FontFile2") == 1
+
+
+@pytest.mark.parametrize(
+    "font, text",
+    # lohit_bn glyph names are not derived from the cmap, so a subset must keep them
+    [("DejaVuSans", "Hello, world"), ("lohit_bn", "উন্নয়ন ব্যবস্থা দল")],
+)
+def test_cached_font_subsets_give_identical_output(tmp_path, font, text):
+    """Documents embedding a cached font subset match plain fpdf output."""
+    font_cache = FontCache(tmp_path / "cache")
+
+    def render(**kwargs):
+        pdf = ResumePDF({font: f"fonts/{font}.ttf"}, [], font_cache)
+        pdf.creation_date = None
+        pdf.add_page()
+        pdf.set_font(font, size=8)
+        pdf.cell(text=text)
+        return bytes(pdf.output(**kwargs))
+
+    expected = render(output_producer_class=OutputProducer)
+    assert render() == expected
+    assert render() == expected
+    assert len(font_cache._subsets) == 1
+
+
+def test_styles_are_compiled_with_the_scale():
+    """Compiled styles hold their scaled font and colour operations."""
+    styles = {
+        "header": {"font": "DejaVuSans-Bold", "size": 12, "color": [0, 51, 102]},
+        "details": {"font": "DejaVuSans", "size": 8, "style": "I"},
+    }
+    compiled = compile_styles(styles, scale=0.5)
+    assert compiled["header"].font_op == ("font", "DejaVuSans-Bold", "", 6.0)
+    assert compiled["header"].color_op == ("color", 0, 51, 102)
+    assert compiled["details"].font_op == ("font", "DejaVuSans", "I", 4.0)
+    assert compiled["details"].color_op == ("color", 0)
+    with pytest.raises(ValueError, match="one or three components"):
+        TextStyle("DejaVuSans", 8, color=(0, 51))
+
+
+def test_unchanged_font_and_colour_are_not_set_again(pdf, monkeypatch):
+    """Font and colour operations already in effect are skipped, but recorded."""
+    calls = []
+    monkeypatch.setattr(pdf, "set_font", lambda *args: calls.append(args))
+    monkeypatch.setattr(pdf, "set_text_color", lambda *args: calls.append(args))
+    style = TextStyle("DejaVuSans", 8, color=(0, 102, 204))
+    with pdf.record_fragment() as recorder:
+        for _ in range(3):
+            pdf.play(style.font_op)
+            pdf.play(style.color_op)
+    assert calls == [("DejaVuSans", "", 8), (0, 102, 204)]
+    assert len(recorder.ops) == 6
+
+
+def test_font_changed_outside_play_is_set_again(pdf):
+    """Setting the font directly invalidates the tracked font operation."""
+    op = ("font", "DejaVuSans", "", 8)
+    pdf.play(op)
+    pdf.set_font("DejaVuSans-Bold", size=12)
+    pdf.play(op)
+    assert (pdf.font_family, pdf.font_size_pt) == ("dejavusans", 8)
+
+
+def test_links_are_drawn_in_the_text_colour(pdf):
+    """A link takes the colour selected by its style."""
+    pdf.set_compression(False)
+    pdf.play(("font", "DejaVuSans", "", 8))
+    pdf.play(("color", 0, 102, 204))
+    pdf.play(("link", "https://example.com"))
+    assert b"0 0.4 0.8 rg" in bytes(pdf.output())
+
+
+def test_long_links_wrap_onto_several_lines(pdf):
+    """A URL wider than the page wraps, with a link annotation on every line."""
+    pdf.set_compression(False)
+    pdf.play(("font", "DejaVuSans", "", 8))
+    y = pdf.y
+    url = "https://example.com/" + "path/" * 60
+    pdf.play(("link", url))
+    assert (pdf.x, pdf.y) == (pdf.l_margin, pytest.approx(y + 3 * pdf.font_size))
+    assert not pdf.underline
+    output = bytes(pdf.output())
+    assert output.count(f"/URI ({url})".encode()) == 3
+    # Each line is underlined
+    assert output.count(b" re f") == 3
+
+
+def test_inline_runs_mix_fonts_and_links(pdf):
+    """Bold runs are drawn in the bold family, and the previous font is kept."""
+    pdf.set_compression(False)
+    pdf.play(("font", "DejaVuSans", "", 8))
+    runs = (
+        ("Built ", False, None),
+        ("billing", True, None),
+        (" and the ", False, None),
+        ("docs", False, "https://example.com/docs"),
+    )
+    pdf.play(("inline", 0, 4, runs, "DejaVuSans-Bold"))
+    assert (pdf.font_family, pdf.font_style, pdf.font_op) == (
+        "dejavusans",
+        "",
+        ("font", "DejaVuSans", "", 8),
+    )
+    assert not pdf.underline
+    output = bytes(pdf.output())
+    assert output.count(b"/URI (https://example.com/docs)") == 1
+    assert b"/F2 8.00 Tf" in output
+    assert output.count(b" re f") == 1
+
+
+def test_bold_family(pdf):
+    assert pdf.bold_family("DejaVuSans") == "DejaVuSans-Bold"
+    assert pdf.bold_family("DejaVuSans-Bold") == "DejaVuSans-Bold"
+    assert pdf.bold_family("Loma") == "Loma-Bold"
+    assert pdf.bold_family("Bandal") == "Bandal"
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from resume_generator import profiling
+from resume_generator.profiling import count
+from resume_generator.profiling import span
+from resume_generator.profiling import start_tracing
+from resume_generator.profiling import stop_tracing
+from resume_generator.profiling import traced
+
+
+@pytest.fixture(autouse=True)
+def no_tracer():
+    yield
+    stop_tracing()
+
+
+@traced
+def add(a, b):
+    count("additions")
+    return a + b
+
+
+def test_tracing_off_records_nothing():
+    assert profiling._tracer is None
+    with span("idle"):
+        count("cells")
+    assert add(1, 2) == 3
+    assert stop_tracing() is None
+
+
+def test_nested_spans_and_counters():
+    tracer = start_tracing()
+    with span("outer", document="resume"):
+        count("cells", 2)
+        with span("inner"):
+            assert add(1, 2) == 3
+    assert stop_tracing() is tracer
+
+    spans = {event["name"]: event for event in tracer.events if event["ph"] == "X"}
+    assert list(spans) == ["add", "inner", "outer"]
+    outer, inner = spans["outer"], spans["inner"]
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    assert outer["args"] == {"document": "resume", "cells": 2, "additions": 1}
+    assert inner["args"] == {"additions": 1}
+    assert tracer.counters == {"cells": 2, "additions": 1}
+
+    samples = [event["args"] for event in tracer.events if event["ph"] == "C"]
+    assert samples[-1] == {"cells": 2, "additions": 1}
+
+
+def test_span_recorded_when_block_raises():
+    tracer = start_tracing()
+    with pytest.raises(ValueError):
+        with span("failing"):
+            raise ValueError("boom")
+    assert [event["name"] for event in tracer.events] == ["failing"]
+
+
+def test_save_chrome_trace(tmp_path):
+    tracer = start_tracing()
+    with span("render"):
+        count("pages")
+    stop_tracing()
+    path = tmp_path / "trace.json"
+    tracer.save(path)
+
+    trace = json.loads(path.read_text())
+    assert trace["displayTimeUnit"] == "ms"
+    assert trace["otherData"] == {"counters": {"pages": 1}}
+    event = trace["traceEvents"][0]
+    assert event["ph"] == "X"
+    assert {"name", "ts", "dur", "pid", "tid", "args"} <= set(event)
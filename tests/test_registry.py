@@ -0,0 +1,73 @@
+import subprocess
+import sys
+
+import pytest
+
+from resume_generator.font_cache import FontCache
+from resume_generator.pdf import ResumePDF
+from resume_generator.schemas import Languages
+from resume_generator.sections import GeneralSection
+from resume_generator.sections import LanguagesSection
+from resume_generator.sections.registry import DEFAULT_SECTIONS
+from resume_generator.sections.registry import build_sections
+from resume_generator.sections.registry import section_names
+from resume_generator.styles import modern_styles
+
+TEMPLATE_CONFIG = {"cell_width": 190, "cell_height": 4}
+
+
+@pytest.fixture
+def pdf(tmp_path):
+    return ResumePDF({}, [], FontCache(tmp_path / "cache"))
+
+
+def test_section_names():
+    """Sections default to the registry's list, and unknown names are rejected."""
+    assert section_names() == DEFAULT_SECTIONS
+    assert section_names(["jobs", "general"]) == ["jobs", "general"]
+    with pytest.raises(ValueError, match="Unknown sections in configuration: hobbies"):
+        section_names(["general", "hobbies"])
+
+
+def test_sections_follow_configured_order(pdf, resume_data):
+    """Only enabled sections are built, in the configured order."""
+    languages = [
+        Languages(language="French", proficiency="Full Professional", include=True),
+    ]
+    resume_data = resume_data[:8] + (languages,) + resume_data[9:]
+    sections = build_sections(
+        pdf, TEMPLATE_CONFIG, resume_data, modern_styles, ["languages", "general"]
+    )
+    assert [type(section) for section in sections] == [LanguagesSection, GeneralSection]
+
+
+def test_sections_without_included_entries_are_skipped(pdf, resume_data):
+    """Empty sections, or sections whose entries are all excluded, are skipped."""
+    languages = [Languages(language="French", proficiency="Elementary", include=False)]
+    resume_data = resume_data[:8] + (languages,) + resume_data[9:]
+    sections = build_sections(
+        pdf, TEMPLATE_CONFIG, resume_data, modern_styles, ["general", "jobs", "languages"]
+    )
+    assert [type(section) for section in sections] == [GeneralSection]
+
+
+def test_disabled_section_modules_are_not_imported():
+    """Only the handler modules of enabled sections are imported."""
+    code = """
+import sys
+from resume_generator.schemas import General
+from resume_generator.sections.registry import build_sections
+from resume_generator.styles import modern_styles
+
+resume_data = (None, General.model_construct(), [], [], [], [], [], [], [], [])
+template_config = {"cell_width": 190, "cell_height": 4}
+build_sections(None, template_config, resume_data, modern_styles, ["general", "jobs"])
+print(" ".join(sorted(m for m in sys.modules if m.startswith("resume_generator.sections."))))
+"""
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == [
+        "resume_generator.sections.base",
+        "resume_generator.sections.general",
+        "resume_generator.sections.registry",
+    ]
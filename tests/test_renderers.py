@@ -0,0 +1,149 @@
+import pytest
+
+from resume_generator.font_cache import FontCache
+from resume_generator.fragments import MemoryFragmentCache
+from resume_generator.pdf import ResumePDF
+from resume_generator.renderers import HtmlRenderer
+from resume_generator.renderers import TextRenderer
+from resume_generator.renderers import create_renderers
+from resume_generator.renderers import write_outputs
+from resume_generator.schemas import General
+from resume_generator.schemas import Jobs
+from resume_generator.sections import GeneralSection
+from resume_generator.sections import JobsSection
+from resume_generator.styles import modern_styles
+
+FONT_FILES = {
+    "DejaVuSans": "fonts/DejaVuSans.ttf",
+    "DejaVuSans-Bold": "fonts/DejaVuSans-Bold.ttf",
+}
+CONFIG = {"cell_width": 190, "cell_height": 4}
+
+GENERAL = General.model_validate(
+    {
+        "name": "Jane Doe",
+        "title": "Software Engineer",
+        "location": "Berlin",
+        "email": "jane@example.com",
+        "portfolio": "https://jane.example.com",
+        "linkedin": "https://linkedin.com/in/janedoe",
+        "github": "https://github.com/janedoe",
+        "description": "Engineer <building> reliable services.",
+    }
+)
+JOBS = [
+    Jobs(
+        title=f"Engineer {index}",
+        company="Acme",
+        employment_type="Full-time",
+        duration=["2020-01", "2022-01"],
+        description="Built the **billing** [platform](https://example.com/billing).",
+        skills=["Python"],
+    )
+    for index in range(2)
+]
+
+EXPECTED_TEXT = """Jane Doe
+Software Engineer
+Berlin
+jane@example.com
+https://jane.example.com/
+https://linkedin.com/in/janedoe
+https://github.com/janedoe
+
+DESCRIPTION
+Engineer <building> reliable services.
+
+JOBS
+
+Engineer 0
+Acme
+Full-time
+2020-01 - 2022-01
+Built the billing platform (https://example.com/billing).
+Skills: Python
+
+Engineer 1
+Acme
+Full-time
+2020-01 - 2022-01
+Built the billing platform (https://example.com/billing).
+Skills: Python
+"""
+
+
+@pytest.fixture
+def font_cache(tmp_path):
+    return FontCache(tmp_path / "fonts")
+
+
+def render(font_cache, fragment_cache=None, inline_markup=True):
+    pdf = ResumePDF(
+        FONT_FILES, [], font_cache, fragment_cache=fragment_cache, inline_markup=inline_markup
+    )
+    pdf.renderers.extend([TextRenderer(), HtmlRenderer()])
+    pdf.add_page()
+    GeneralSection(pdf, GENERAL, modern_styles, CONFIG).render()
+    JobsSection(pdf, JOBS, modern_styles, CONFIG).render()
+    return pdf
+
+
+def test_text_follows_the_sections(font_cache):
+    """Plain text keeps every line, with headings and blank lines between entries."""
+    text, _ = render(font_cache).renderers
+    assert text.render() == EXPECTED_TEXT
+
+
+def test_html_is_semantic(font_cache):
+    """Sections, entries and headings map to HTML elements, with escaped text."""
+    _, page = render(font_cache).renderers
+    document = page.render()
+    assert "<title>Jane Doe</title>" in document
+    assert '<section class="general">\n<h1>Jane Doe</h1>' in document
+    assert '<p class="contact">Berlin</p>' in document
+    assert '<p class="link"><a href="https://github.com/janedoe">' in document
+    assert "<h2>Description</h2>" in document
+    assert "Engineer &lt;building&gt; reliable services." in document
+    assert '<section class="jobs">\n<h2>Jobs</h2>\n<article>\n<h3>Engineer 0</h3>' in document
+    assert (
+        '<p class="details">Built the <strong>billing</strong> '
+        '<a href="https://example.com/billing">platform</a>.</p>'
+    ) in document
+    assert document.count("<article>") == document.count("</article>") == 2
+
+
+def test_markup_is_kept_as_written_when_off(font_cache):
+    """Without `inline_markup`, descriptions are drawn and exported verbatim."""
+    text, page = render(font_cache, inline_markup=False).renderers
+    description = "Built the **billing** [platform](https://example.com/billing)."
+    assert f"\n{description}\n" in text.render()
+    assert "<strong>" not in page.render()
+
+
+def test_replayed_fragments_feed_the_renderers(font_cache):
+    """Sections and entries replayed from the fragment cache give the same documents."""
+    expected = [renderer.render() for renderer in render(font_cache).renderers]
+    cache = MemoryFragmentCache()
+    render(font_cache, cache)
+    replayed = render(font_cache, cache)
+    assert cache.hits == 2
+    assert [renderer.render() for renderer in replayed.renderers] == expected
+
+
+def test_formats_are_written_next_to_the_pdf(tmp_path, font_cache):
+    renderers = create_renderers(["txt", "html"])
+    pdf = ResumePDF(FONT_FILES, [], font_cache)
+    pdf.renderers.extend(renderers.values())
+    pdf.add_page()
+    GeneralSection(pdf, GENERAL, modern_styles, CONFIG).render()
+
+    paths = write_outputs(pdf, renderers, str(tmp_path / "resume.pdf"))
+    assert paths == [str(tmp_path / name) for name in ("resume.pdf", "resume.txt", "resume.html")]
+    assert (tmp_path / "resume.pdf").read_bytes().startswith(b"%PDF")
+    assert (tmp_path / "resume.txt").read_text(encoding="utf-8").startswith("Jane Doe\n")
+    assert (tmp_path / "resume.html").read_text(encoding="utf-8").startswith("<!DOCTYPE html>")
+
+
+def test_unknown_formats_are_rejected():
+    with pytest.raises(ValueError, match="Unknown output formats: docx"):
+        create_renderers(["txt", "docx"])
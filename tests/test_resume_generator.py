@@ -1,5 +1,7 @@
+import io
 import json
 import os
+import sys
 
 import pytest
 import yaml
@@ -7,62 +9,11 @@ import yaml
 from resume_generator.main import ensure_output_directory
 from resume_generator.main import load_config
 from resume_generator.main import load_resume_data
+from resume_generator.main import main
+from resume_generator.main import render_resume
 from resume_generator.main import setup_pdf
 
 
-@pytest.fixture
-def sample_resume_data():
-    return {
-        "ApplicationInfo": {"company": "Test Company", "job": "Test Position"},
-        "General": {
-            "name": "John Doe",
-            "title": "Software Engineer",
-            "location": "San Francisco, CA",
-            "email": "john@example.com",
-            "cell_number": "+1234567890",
-            "portfolio": "https://portfolio.example.com",
-            "linkedin": "https://linkedin.com/in/johndoe",
-            "github": "https://github.com/johndoe",
-            "description": "Experienced software engineer with a passion for clean code.",
-        },
-        "Jobs": {},
-        "Education": {},
-        "LicensesAndCertifications": {},
-        "VolunteerExperience": {},
-        "Projects": {},
-        "HonorsAndAwards": {},
-        "Languages": {},
-    }
-
-
-@pytest.fixture
-def sample_config():
-    return {
-        "output_directory": "generated_applications",
-        "file_name_template": "Resume - {name} - {company} - {job} - {date}.pdf",
-        "template": "modern",
-        "templates": {
-            "modern": {
-                "pdf_format": "letter",
-                "cell_width": 190,
-                "cell_height": 4,
-                "fonts": {
-                    "primary": "DejaVuSans",
-                    "bold": "DejaVuSans-Bold",
-                    "emoji": "TwitterEmojis",
-                },
-                "font_size": {
-                    "name": 24,
-                    "title": 16,
-                    "section_header": 14,
-                    "job_title": 12,
-                    "normal": 8,
-                },
-            }
-        },
-    }
-
-
 def test_load_config(tmp_path, sample_config, monkeypatch):
     """Test loading configuration from YAML file."""
     # Change working directory to temp path for testing
@@ -126,3 +77,103 @@ def test_setup_pdf(tmp_path, sample_config, monkeypatch):
         # Should fail when font files don't exist
         setup_pdf(sample_config)
     assert "Font file not found" in str(excinfo.value)
+
+
+def write_inputs(tmp_path, config, resume_data=None) -> tuple:
+    """Write the configuration and the resume data, returning their paths."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(config))
+    resume_path = tmp_path / "resume.json"
+    if resume_data is not None:
+        resume_path.write_text(json.dumps(resume_data))
+    return str(config_path), str(resume_path)
+
+
+def test_render_resume_in_memory(tmp_config, complete_resume_data):
+    """Parsed data is rendered to bytes or a file object without writing files."""
+    config = dict(tmp_config, deterministic_output=True)
+
+    pdf = render_resume(complete_resume_data, config)
+    assert pdf.startswith(b"%PDF")
+
+    output = io.BytesIO()
+    assert render_resume(complete_resume_data, config, output) is None
+    assert output.getvalue() == pdf
+    assert not os.path.exists(config["output_directory"])
+
+
+def test_main_streams_stdin_to_stdout(tmp_path, tmp_config, complete_resume_data, monkeypatch):
+    """With `--input -` and `--output -`, JSON is read from stdin and the PDF written to stdout."""
+    config_path, _ = write_inputs(tmp_path, tmp_config)
+
+    stdout = io.TextIOWrapper(io.BytesIO())
+    monkeypatch.setattr(sys, "stdin", io.StringIO(json.dumps(complete_resume_data)))
+    monkeypatch.setattr(sys, "stdout", stdout)
+    main(["--config", config_path, "--input", "-", "--output", "-"])
+    assert stdout.buffer.getvalue().startswith(b"%PDF")
+    assert not os.path.exists(tmp_config["output_directory"])
+
+
+def test_main_writes_other_formats(tmp_path, tmp_config, complete_resume_data, capsys):
+    """With `--formats`, text and HTML versions are written next to the PDF."""
+    config = dict(tmp_config, file_name_template="Resume - {name}.pdf")
+    config_path, resume_path = write_inputs(tmp_path, config, complete_resume_data)
+
+    main(["--config", config_path, "--input", resume_path, "--formats", "txt", "html"])
+    output_dir = tmp_path / "output" / "Test Company" / "Test Position"
+    assert sorted(path.name for path in output_dir.iterdir()) == [
+        "Resume - John Doe.html",
+        "Resume - John Doe.pdf",
+        "Resume - John Doe.txt",
+    ]
+    text = (output_dir / "Resume - John Doe.txt").read_text(encoding="utf-8")
+    assert text.startswith("John Doe\nSoftware Engineer\n")
+    assert f"Also written: {output_dir / 'Resume - John Doe.html'}" in capsys.readouterr().out
+
+    with pytest.raises(SystemExit):
+        main(["--config", config_path, "--output", "-", "--formats", "txt"])
+
+
+def test_main_writes_profile(tmp_path, tmp_config, complete_resume_data):
+    """With `--profile`, the run is traced and saved in Chrome trace-event format."""
+    config_path, resume_path = write_inputs(tmp_path, tmp_config, complete_resume_data)
+    profile_path = tmp_path / "profile.json"
+
+    main(
+        [
+            "--config",
+            config_path,
+            "--input",
+            resume_path,
+            "--output",
+            str(tmp_path / "resume.pdf"),
+            "--profile",
+            str(profile_path),
+        ]
+    )
+    trace = json.loads(profile_path.read_text())
+    spans = {event["name"] for event in trace["traceEvents"] if event["ph"] == "X"}
+    assert {"main", "load_config", "validate_resume_data", "setup_pdf", "pdf.output"} <= spans
+    assert "GeneralSection.add_section" in spans
+    counters = trace["otherData"]["counters"]
+    assert counters["pages"] == 1
+    assert counters["cells"] > 0
+    assert counters["bytes_written"] == (tmp_path / "resume.pdf").stat().st_size
+
+
+def test_main_writes_memory_report(tmp_path, tmp_config, complete_resume_data, capsys):
+    """With `--memory-report`, the memory of each stage is printed and saved as JSON."""
+    config_path, resume_path = write_inputs(tmp_path, tmp_config, complete_resume_data)
+    report_path = tmp_path / "memory.json"
+    args = ["--config", config_path, "--input", resume_path]
+    args += ["--output", str(tmp_path / "resume.pdf")]
+
+    main(args + ["--memory-report", str(report_path)])
+    report = json.loads(report_path.read_text())
+    spans = {span["name"]: span for span in report["spans"]}
+    assert {"main", "validate_resume_data", "setup_pdf", "pdf.output"} <= set(spans)
+    assert 0 < spans["main"]["peak_bytes"] <= report["peak_bytes"]
+    assert "Heap peak:" in capsys.readouterr().out
+
+    with pytest.raises(Exception, match="memory budget of 0.0 MB"):
+        main(args + ["--memory-budget", "0.001"])
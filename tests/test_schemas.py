@@ -0,0 +1,71 @@
+import copy
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from resume_generator.main import validate_resume_data
+from resume_generator.schemas import RESUME_ADAPTER
+from resume_generator.schemas import HonorsAndAwards
+from resume_generator.schemas import Jobs
+from resume_generator.schemas import document_sections
+from resume_generator.schemas import first_entry_error
+
+
+@pytest.fixture
+def resume_data():
+    with open("demo.json", "r") as f:
+        data = json.load(f)
+    data.setdefault("Articles", {})
+    return data
+
+
+def test_document_sections_keep_entry_order(resume_data):
+    sections = document_sections(RESUME_ADAPTER.validate_python(resume_data))
+    assert [job.title for job in sections[2]] == [
+        job["title"] for job in resume_data["Jobs"].values()
+    ]
+    assert sections[9] == []
+
+
+@pytest.mark.parametrize(
+    "duration, message",
+    [
+        (["2020-13", "Present"], 'Invalid date format. Use YYYY-MM or "Present"'),
+        (["0000-01", "Present"], 'Invalid date format. Use YYYY-MM or "Present"'),
+        (["2020-01"], "Duration must have exactly 2 elements [start, end]"),
+    ],
+)
+def test_duration_errors(duration, message):
+    with pytest.raises(ValidationError, match=message.replace("[", r"\[")):
+        Jobs(title="t", company="c", employment_type="Full-time", duration=duration)
+
+
+@pytest.mark.parametrize("issued_on", ["2020/01", "2020-01\n", "0000-01"])
+def test_year_month_errors(issued_on):
+    with pytest.raises(ValidationError, match="Invalid date format. Use YYYY-MM"):
+        HonorsAndAwards(title="t", issuer="i", issued_on=issued_on)
+
+
+def test_first_entry_error_matches_entry_model(resume_data):
+    jobs = list(resume_data["Jobs"])
+    resume_data["Jobs"][jobs[0]]["duration"] = ["2020-13", "Present"]
+    resume_data["Jobs"][jobs[-1]]["employment_type"] = "Sometimes"
+    with pytest.raises(ValidationError) as document_error:
+        RESUME_ADAPTER.validate_python(resume_data)
+    assert document_error.value.error_count() == 2
+
+    with pytest.raises(ValidationError) as entry_error:
+        Jobs.model_validate(resume_data["Jobs"][jobs[0]])
+    assert str(first_entry_error(document_error.value, resume_data)) == str(entry_error.value)
+
+
+def test_validate_resume_data_errors(resume_data):
+    invalid = copy.deepcopy(resume_data)
+    invalid["General"]["cell_number"] = "12"
+    with pytest.raises(ValueError, match="1 validation error for General\ncell_number\n"):
+        validate_resume_data(invalid)
+
+    del resume_data["Education"]
+    with pytest.raises(ValueError, match="Missing required section in resume.json: 'Education'"):
+        validate_resume_data(resume_data)
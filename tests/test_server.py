@@ -0,0 +1,171 @@
+import http.client
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+import yaml
+
+from resume_generator.server import WorkerPool
+from resume_generator.server import make_server
+from resume_generator.server import merge_config
+
+
+@pytest.fixture(scope="module")
+def server(tmp_path_factory):
+    with open("config.yaml", "r") as file:
+        config = yaml.safe_load(file)
+    config["font_cache_directory"] = str(tmp_path_factory.mktemp("cache"))
+    pool = WorkerPool(config, workers=1, queue_size=0)
+    server = make_server(pool, port=0, timeout=30)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    pool.shutdown()
+
+
+@pytest.fixture
+def resume():
+    with open("demo.json", "r") as file:
+        resume = json.load(file)
+    resume.setdefault("Articles", {})
+    return resume
+
+
+def request(server, path, body=None):
+    """Send a request and return the status, headers and body of the response."""
+    data = None if body is None else json.dumps(body).encode("utf-8")
+    url = f"http://127.0.0.1:{server.server_port}{path}"
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data)) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_merge_config():
+    """Nested overrides replace single values without dropping their siblings."""
+    config = {"template": "modern", "templates": {"modern": {"cell_width": 190, "cell_height": 4}}}
+    merged = merge_config(config, {"templates": {"modern": {"cell_height": 5}}})
+    assert merged["templates"]["modern"] == {"cell_width": 190, "cell_height": 5}
+    assert config["templates"]["modern"]["cell_height"] == 4
+
+
+def test_render_returns_pdf(server, resume):
+    """Posting resume JSON, bare or with overrides, returns the PDF."""
+    status, headers, body = request(server, "/render", resume)
+    assert status == 200
+    assert headers["Content-Type"] == "application/pdf"
+    assert body.startswith(b"%PDF")
+
+    overrides = {"template": "modern", "file_name_template": "{company}.pdf"}
+    status, headers, body = request(server, "/render", {"resume": resume, "config": overrides})
+    assert status == 200
+    assert "filename*=UTF-8''demo%20company.pdf" in headers["Content-Disposition"]
+
+
+def test_invalid_requests_are_rejected(server, resume):
+    """Invalid data and forbidden overrides are answered with 400."""
+    del resume["General"]
+    status, _, body = request(server, "/render", resume)
+    assert status == 400
+    assert "Missing required section" in json.loads(body)["error"]
+
+    overrides = {"output_directory": "/tmp"}
+    status, _, body = request(server, "/render", {"resume": resume, "config": overrides})
+    assert status == 400
+    assert "output_directory" in json.loads(body)["error"]
+
+
+@pytest.mark.parametrize(
+    "overrides, error",
+    [
+        ({"templates": {"modern": {"fonts": {"primary": "../config"}}}}, "templates"),
+        ({"template": "../../etc/passwd"}, "Unknown template"),
+        ({"template": ["modern"]}, "Unknown template"),
+    ],
+)
+def test_template_overrides_are_restricted(server, resume, overrides, error):
+    """Requests can only pick one of the configured templates, not define fonts."""
+    status, _, body = request(server, "/render", {"resume": resume, "config": overrides})
+    assert status == 400
+    assert error in json.loads(body)["error"]
+
+
+def test_undrawable_characters_are_rejected(server, resume):
+    """Text that no bundled font can draw is invalid input, not a server error."""
+    resume["General"]["description"] = "Private use \U000f0000"
+    status, _, body = request(server, "/render", resume)
+    assert status == 400
+    assert "No bundled font can draw" in json.loads(body)["error"]
+
+
+@pytest.mark.parametrize(
+    "content_length, status",
+    [(None, 411), ("abc", 400), ("-1", 400), (str(2 * 1024 * 1024), 413)],
+)
+def test_bad_content_length_is_rejected(server, content_length, status):
+    """A missing, invalid, negative or oversized body length gets an error response."""
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=10)
+    try:
+        connection.putrequest("POST", "/render")
+        if content_length is not None:
+            connection.putheader("Content-Length", content_length)
+        connection.endheaders()
+        response = connection.getresponse()
+        assert response.status == status
+        assert "error" in json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def test_full_queue_is_rejected(server, resume):
+    """Requests beyond the pool capacity get a 503 instead of waiting."""
+    server.pool._slots.acquire()
+    try:
+        status, _, _ = request(server, "/render", resume)
+    finally:
+        server.pool._slots.release()
+    assert status == 503
+
+
+def test_waiting_for_a_worker_times_out(server, resume):
+    """A request that gets no free worker in time gets a 504 without killing the pool."""
+    executor = server.pool._executor
+    processes = list(executor._processes.values())
+    server.pool._idle_workers.acquire()
+    server.render_timeout = 0.1
+    try:
+        status, _, _ = request(server, "/render", resume)
+    finally:
+        server.render_timeout = 30
+        server.pool._idle_workers.release()
+    assert status == 504
+    assert server.pool.in_flight == 0
+    assert server.pool._executor is executor
+    assert all(process.is_alive() for process in processes)
+
+
+def test_slow_render_times_out(server, resume):
+    """A task running longer than the timeout has its worker killed and replaced."""
+    executor = server.pool._executor
+    processes = list(executor._processes.values())
+    with pytest.raises(TimeoutError):
+        server.pool._run(time.sleep, (30,), 1)
+    assert server.pool._executor is not executor
+    for process in processes:
+        process.join(10)
+        assert not process.is_alive()
+    status, _, _ = request(server, "/render", resume)
+    assert status == 200
+
+
+def test_health(server):
+    """The health endpoint reports the pool size and load."""
+    status, _, body = request(server, "/health")
+    assert status == 200
+    assert json.loads(body) == {"status": "ok", "workers": 1, "in_flight": 0, "capacity": 1}
@@ -0,0 +1,96 @@
+import json
+
+import pytest
+import yaml
+
+import resume_generator.main
+from resume_generator.main import load_resume_data
+from resume_generator.main import main as generate_main
+from resume_generator.snapshot import compile_snapshot
+from resume_generator.snapshot import load_snapshot
+from resume_generator.snapshot import main
+from resume_generator.snapshot import snapshot_path
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    with open("config.yaml", "r") as file:
+        config = yaml.safe_load(file)
+    config["output_directory"] = str(tmp_path / "output")
+    config["font_cache_directory"] = str(tmp_path / "cache")
+    # Renders from JSON and from the snapshot are compared byte for byte
+    config["deterministic_output"] = True
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(config))
+
+    with open("demo.json", "r") as file:
+        resume = json.load(file)
+    resume.setdefault("Articles", {})
+    resume_path = tmp_path / "resume.json"
+    resume_path.write_text(json.dumps(resume))
+    return str(resume_path), str(config_path)
+
+
+def test_snapshot_round_trip(inputs):
+    resume_path, config_path = inputs
+    path = compile_snapshot(resume_path, config_path)
+    assert path == snapshot_path(resume_path) == resume_path.replace(".json", ".snapshot")
+
+    snapshot = load_snapshot(resume_path, config_path)
+    assert snapshot.resume_data == load_resume_data(resume_path)
+    assert snapshot.config == yaml.safe_load(open(config_path))
+    # demo.json only has characters the template fonts can draw
+    assert snapshot.fallback_fonts == []
+
+
+@pytest.mark.parametrize("changed", [0, 1])
+def test_changed_inputs_invalidate_the_snapshot(inputs, changed):
+    compile_snapshot(*inputs)
+    with open(inputs[changed], "a") as file:
+        file.write("\n")
+    assert load_snapshot(*inputs) is None
+
+
+def test_unreadable_snapshots_are_ignored(inputs, tmp_path):
+    assert load_snapshot(*inputs) is None
+    path = compile_snapshot(*inputs)
+    raw = open(path, "rb").read()
+    open(path, "wb").write(raw[:-10])
+    assert load_snapshot(*inputs) is None
+    open(path, "wb").write(b"RGSN")
+    assert load_snapshot(*inputs) is None
+
+
+def test_main_renders_from_the_snapshot(inputs, tmp_path, monkeypatch):
+    resume_path, config_path = inputs
+    output = tmp_path / "resume.pdf"
+    args = ["--input", resume_path, "--config", config_path, "--output", str(output)]
+    generate_main(args)
+    expected = output.read_bytes()
+
+    compile_snapshot(resume_path, config_path)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the resume data was loaded from JSON")
+
+    monkeypatch.setattr(resume_generator.main, "load_resume_data", fail)
+    generate_main(args)
+    assert output.read_bytes() == expected
+
+    # A stale snapshot falls back to the JSON path
+    with open(resume_path, "a") as file:
+        file.write("\n")
+    with pytest.raises(AssertionError, match="loaded from JSON"):
+        generate_main(args)
+
+
+def test_compile_command(inputs, capsys):
+    resume_path, config_path = inputs
+    assert main(["--input", resume_path, "--config", config_path]) == 0
+    assert "Snapshot written to" in capsys.readouterr().out
+
+    resume = json.loads(open(resume_path).read())
+    resume["General"]["email"] = "not an email"
+    open(resume_path, "w").write(json.dumps(resume))
+    assert main(["--input", resume_path, "--config", config_path]) == 1
+    assert "Error compiling snapshot" in capsys.readouterr().err
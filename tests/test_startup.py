@@ -0,0 +1,57 @@
+import fpdf
+
+from resume_generator.font_cache import fpdf_version
+from resume_generator.startup import IMPORT_BUDGET_MS
+from resume_generator.startup import StartupProfile
+from resume_generator.startup import parse_importtime
+from resume_generator.startup import profile_imports
+
+SAMPLE_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      1500 |       2000 | yaml
+import time:       300 |        300 |     pydantic.errors
+import time:       700 |       1000 |   pydantic.main
+import time:       400 |       1400 | pydantic
+some other line
+"""
+
+
+def test_parse_importtime():
+    """Each `import time:` line becomes a record with its times and nesting depth."""
+    records = parse_importtime(SAMPLE_OUTPUT)
+    assert [record.name for record in records] == [
+        "_io",
+        "yaml",
+        "pydantic.errors",
+        "pydantic.main",
+        "pydantic",
+    ]
+    assert [record.depth for record in records] == [1, 0, 2, 1, 0]
+    assert records[1].self_us == 1500
+    assert records[1].cumulative_us == 2000
+
+
+def test_startup_profile_totals():
+    """Self times add up to the total and are grouped by top-level package."""
+    profile = StartupProfile(parse_importtime(SAMPLE_OUTPUT))
+    assert profile.total_ms == 3.02
+    assert profile.package_times() == {"yaml": 1.5, "pydantic": 1.4, "_io": 0.12}
+    assert profile.loaded(("numpy", "yaml")) == ["yaml"]
+
+
+def test_fpdf_version_matches_package():
+    """The version read from the package metadata is the one fpdf reports."""
+    assert fpdf_version() == fpdf.__version__
+
+
+def test_entry_point_defers_render_packages():
+    """Importing the entry point does not load pydantic or the PDF stack."""
+    profile = profile_imports(runs=1)
+    assert profile.loaded() == []
+
+
+def test_entry_point_import_budget():
+    """Importing the entry point stays within the startup budget."""
+    profile = profile_imports(runs=3)
+    assert profile.total_ms < IMPORT_BUDGET_MS, profile.package_times()
@@ -0,0 +1,136 @@
+import json
+
+import pytest
+import yaml
+
+from resume_generator.stream import IN_FLIGHT_PER_WORKER
+from resume_generator.stream import Record
+from resume_generator.stream import RecordResult
+from resume_generator.stream import StreamProgress
+from resume_generator.stream import StreamRenderer
+from resume_generator.stream import main
+from resume_generator.stream import read_records
+from resume_generator.stream import render_stream
+
+
+@pytest.fixture
+def config(config):
+    config["file_name_template"] = "Resume - {name} - {record}.pdf"
+    return config
+
+
+@pytest.fixture
+def resume_json():
+    with open("demo.json", "r") as file:
+        resume = json.load(file)
+    resume.setdefault("Articles", {})
+    return resume
+
+
+def candidate(resume_json, name):
+    return dict(resume_json, General=dict(resume_json["General"], name=name))
+
+
+def test_read_records_from_jsonl(tmp_path):
+    path = tmp_path / "export.jsonl"
+    path.write_text('{"a": 1}\n\n{"b": 2}\n')
+    records = list(read_records(str(path)))
+    assert [record.source for record in records] == [f"{path}:1", f"{path}:3"]
+    assert [record.name for record in records] == ["1", "3"]
+    assert json.loads(records[1].data) == {"b": 2}
+
+
+def test_read_records_from_directory(tmp_path):
+    (tmp_path / "bob.json").write_text('{"b": 2}')
+    (tmp_path / "alice.json").write_text('{"a": 1}')
+    (tmp_path / "notes.txt").write_text("ignored")
+    records = list(read_records(str(tmp_path)))
+    assert [record.name for record in records] == ["alice", "bob"]
+    assert records[0].source == str(tmp_path / "alice.json")
+
+
+def test_records_are_rendered_as_they_are_read(config, resume_json):
+    read = []
+
+    def records():
+        for index in range(3):
+            read.append(index)
+            yield Record(f"export:{index}", str(index), json.dumps(resume_json).encode())
+
+    stream = render_stream(StreamRenderer(config), records())
+    record, result = next(stream)
+    assert read == [0]
+    assert result.error is None
+    assert result.output_path.endswith(" - 0.pdf")
+    assert len(list(stream)) == 2
+
+
+def test_output_formats_are_written_next_to_the_pdf(config, resume_json):
+    config["output_formats"] = ["txt", "html"]
+    record = Record("export:1", "1", json.dumps(resume_json).encode())
+    output_path = StreamRenderer(config).render(record)
+    stem = output_path.removesuffix(".pdf")
+    assert open(stem + ".txt", encoding="utf-8").read().startswith("John Smith\n")
+    assert open(stem + ".html", encoding="utf-8").read().startswith("<!DOCTYPE html>")
+
+
+def test_unknown_output_formats_fail_before_rendering(config):
+    config["output_formats"] = ["docx"]
+    with pytest.raises(ValueError, match="Unknown output formats: docx"):
+        StreamRenderer(config)
+
+
+def test_workers_read_a_bounded_window_ahead(config, resume_json):
+    read = []
+
+    def records():
+        for index in range(20):
+            read.append(index)
+            data = json.dumps(candidate(resume_json, f"Candidate {index}")).encode()
+            yield Record(f"export:{index}", str(index), data)
+
+    stream = render_stream(StreamRenderer(config), records(), workers=2)
+    next(stream)
+    assert len(read) <= 2 * IN_FLIGHT_PER_WORKER + 1
+    results = [result for _, result in stream]
+    assert [result.source for result in results] == [f"export:{i}" for i in range(1, 20)]
+    assert all(result.error is None for result in results)
+
+
+def test_main_renders_and_rejects(tmp_path, config, resume_json, capsys):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(config))
+    invalid = candidate(resume_json, "Invalid")
+    invalid["General"]["email"] = "not an email"
+    lines = [
+        json.dumps(candidate(resume_json, "Alice")),
+        "{not json",
+        json.dumps(invalid),
+        json.dumps(candidate(resume_json, "Alice")),
+    ]
+    export = tmp_path / "export.jsonl"
+    export.write_text("\n".join(lines) + "\n")
+    rejects = tmp_path / "rejects.jsonl"
+
+    args = ["--input", str(export), "--config", str(config_path), "--rejects", str(rejects)]
+    assert main(args) == 1
+    output = tmp_path / "output" / "demo company" / "demo job name"
+    assert sorted(path.name for path in output.iterdir()) == [
+        "Resume - Alice - 1.pdf",
+        "Resume - Alice - 4.pdf",
+    ]
+
+    rejected = [json.loads(line) for line in rejects.read_text().splitlines()]
+    assert [reject["source"] for reject in rejected] == [f"{export}:2", f"{export}:3"]
+    assert rejected[0]["error"].startswith("Invalid JSON")
+    assert rejected[0]["record"] == "{not json"
+    assert "value is not a valid email address" in rejected[1]["error"]
+    assert "4 records (2 rendered, 2 rejected)" in capsys.readouterr().out
+
+
+def test_progress_counts_results():
+    progress = StreamProgress(interval=0)
+    progress.update(RecordResult("export:1", "out.pdf", 0.01))
+    progress.update(RecordResult("export:2", None, 0.01, "boom"))
+    assert (progress.processed, progress.rendered, progress.rejected) == (2, 1, 1)
+    assert progress.line().startswith("2 records (1 rendered, 1 rejected) in ")
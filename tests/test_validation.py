@@ -0,0 +1,113 @@
+import copy
+import json
+import pickle
+
+import pytest
+
+from resume_generator.font_coverage import collect_codepoints
+from resume_generator.fragments import fingerprint
+from resume_generator.main import validate_resume_data
+from resume_generator.schemas import ApplicationInfo
+from resume_generator.sections.registry import has_content
+from resume_generator.validation import DeferredEntry
+from resume_generator.validation import ValidationCache
+from resume_generator.validation import content_hash
+
+
+@pytest.fixture
+def resume_data():
+    with open("demo.json", "r") as f:
+        data = json.load(f)
+    data.setdefault("Articles", {})
+    return data
+
+
+def test_content_hash():
+    assert content_hash({"a": [1, "b"]}) == content_hash({"a": [1, "b"]})
+    assert content_hash({"a": [1, "b"]}) != content_hash({"a": [1.0, "b"]})
+    assert content_hash({"a": True}) != content_hash({"a": 1})
+    assert content_hash(ApplicationInfo(company="c", job="j")) is None
+
+
+def test_unchanged_sections_are_reused(resume_data):
+    cache = ValidationCache()
+    first = validate_resume_data(resume_data, cache)
+    assert first == validate_resume_data(resume_data)
+
+    second = validate_resume_data(copy.deepcopy(resume_data), cache)
+    assert all(new is old for new, old in zip(second, first))
+    assert cache.stats()["hits"] == len(first)
+
+
+def test_changed_entry_is_validated_alone(resume_data):
+    cache = ValidationCache()
+    first = validate_resume_data(resume_data, cache)
+    first_job = next(iter(resume_data["Jobs"]))
+    resume_data["Jobs"][first_job]["title"] = "Staff Engineer"
+
+    second = validate_resume_data(resume_data, cache)
+    assert second[2] is not first[2]
+    assert second[2][0].title == "Staff Engineer"
+    assert all(new is old for new, old in zip(second[2][1:], first[2][1:]))
+    assert second[3] is first[3]
+
+
+def test_cache_is_bounded(resume_data):
+    cache = ValidationCache(max_entries=4)
+    validate_resume_data(resume_data, cache)
+    assert len(cache._models) == 4
+    uncached = ValidationCache(max_entries=0)
+    validate_resume_data(resume_data, uncached)
+    assert uncached.stats() == {"hits": 0, "misses": 0, "hit_rate": 0.0}
+
+
+def test_cached_errors_match_document_errors(resume_data):
+    cache = ValidationCache()
+    validate_resume_data(resume_data, cache)
+    first_job = next(iter(resume_data["Jobs"]))
+    resume_data["Jobs"][first_job]["duration"] = ["2020-13", "Present"]
+    resume_data["General"]["email"] = "not an email"
+    with pytest.raises(ValueError) as document_error:
+        validate_resume_data(resume_data)
+    with pytest.raises(ValueError) as cached_error:
+        validate_resume_data(resume_data, cache)
+    assert str(cached_error.value) == str(document_error.value)
+
+    resume_data["General"]["email"] = "jane@example.com"
+    resume_data["Jobs"] = []
+    with pytest.raises(ValueError) as document_error:
+        validate_resume_data(resume_data)
+    with pytest.raises(ValueError) as cached_error:
+        validate_resume_data(resume_data, cache)
+    assert str(cached_error.value) == str(document_error.value)
+
+
+def test_excluded_entries_are_deferred(resume_data):
+    name, excluded = next(
+        (name, entry)
+        for name, entry in resume_data["LicensesAndCertifications"].items()
+        if entry.get("include") is False
+    )
+    excluded["issued_on"] = "not a date"
+    with pytest.raises(ValueError, match="Invalid date format"):
+        validate_resume_data(resume_data)
+
+    certifications = validate_resume_data(resume_data, defer_excluded=True)[4]
+    deferred = [entry for entry in certifications if isinstance(entry, DeferredEntry)]
+    assert len(deferred) == 1
+    assert deferred[0].include is False
+    assert has_content([deferred[0]]) is False
+    assert collect_codepoints(deferred) == set()
+    assert fingerprint(deferred) == fingerprint([excluded])
+    with pytest.raises(ValueError, match="Invalid date format"):
+        deferred[0].issued_on
+
+
+def test_deferred_entry_is_validated_once(resume_data):
+    certifications = validate_resume_data(resume_data, defer_excluded=True)[4]
+    deferred = next(entry for entry in certifications if isinstance(entry, DeferredEntry))
+    assert deferred.name == deferred.validate().name
+    assert deferred.validate() is deferred.validate()
+
+    restored = pickle.loads(pickle.dumps(deferred))
+    assert restored.validate() == deferred.validate()
@@ -0,0 +1,136 @@
+import json
+import os
+
+import pytest
+import yaml
+
+from resume_generator.watch import ResumeWatcher
+from resume_generator.watch import main
+
+
+@pytest.fixture
+def watcher(tmp_path):
+    with open("config.yaml", "r") as file:
+        config = yaml.safe_load(file)
+    config["output_directory"] = str(tmp_path / "output")
+    config["font_cache_directory"] = str(tmp_path / "cache")
+    config["file_name_template"] = "Resume - {name}.pdf"
+    (tmp_path / "config.yaml").write_text(yaml.safe_dump(config))
+
+    with open("demo.json", "r") as file:
+        resume = json.load(file)
+    resume.setdefault("Articles", {})
+    (tmp_path / "resume.json").write_text(json.dumps(resume))
+    return ResumeWatcher(tmp_path / "resume.json", tmp_path / "config.yaml")
+
+
+def edit(path, update):
+    """Rewrite a JSON file with an update applied, bumping its modification time."""
+    data = json.loads(path.read_text())
+    update(data)
+    stat = path.stat()
+    path.write_text(json.dumps(data))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_first_rebuild_loads_everything(watcher):
+    """The first rebuild validates every section and writes the PDF."""
+    result = watcher.rebuild(watcher.poll())
+    assert os.path.exists(result.output_path)
+    assert result.validated[:2] == ["ApplicationInfo", "General"]
+    assert list(result.timings) == ["config", "validate", "fonts", "layout", "write"]
+    assert watcher.poll() == set()
+
+
+def test_only_changed_sections_are_validated(watcher):
+    """Unchanged sections and entries keep their validated models."""
+    watcher.rebuild(watcher.poll())
+    general, jobs, projects = watcher.resume_data[1], watcher.resume_data[2], watcher.resume_data[6]
+
+    first_job = next(iter(json.loads(watcher.resume_path.read_text())["Jobs"]))
+    edit(watcher.resume_path, lambda data: data["Jobs"][first_job].update(title="Staff Engineer"))
+    changed = watcher.poll()
+    assert changed == {watcher.resume_path}
+    result = watcher.rebuild(changed)
+
+    assert result.validated == ["Jobs"]
+    assert "config" not in result.timings
+    assert watcher.resume_data[1] is general
+    assert watcher.resume_data[6] is projects
+    assert watcher.resume_data[2][0].title == "Staff Engineer"
+    assert watcher.resume_data[2][1:] == jobs[1:]
+    assert all(new is old for new, old in zip(watcher.resume_data[2][1:], jobs[1:]))
+
+
+def test_unchanged_content_is_not_rendered(watcher):
+    """Saving the resume without changing its content renders nothing."""
+    watcher.rebuild(watcher.poll())
+    edit(watcher.resume_path, lambda data: None)
+    assert watcher.rebuild(watcher.poll()) is None
+
+
+def test_invalid_edit_keeps_previous_data(watcher):
+    """A failing rebuild leaves the last valid resume data loaded."""
+    watcher.rebuild(watcher.poll())
+    resume_data = watcher.resume_data
+
+    edit(watcher.resume_path, lambda data: data["General"].update(email="not an email"))
+    with pytest.raises(ValueError, match="Error validating resume data"):
+        watcher.rebuild(watcher.poll())
+    assert watcher.resume_data is resume_data
+
+    edit(watcher.resume_path, lambda data: data["General"].update(email="jane@example.com"))
+    result = watcher.rebuild(watcher.poll())
+    assert result.validated == ["General"]
+    assert watcher.resume_data[1].email == "jane@example.com"
+
+
+def test_config_change_is_reloaded(watcher):
+    """Editing the configuration reloads it and renders again."""
+    watcher.rebuild(watcher.poll())
+    config = yaml.safe_load(watcher.config_path.read_text())
+    config["file_name_template"] = "Renamed - {name}.pdf"
+    watcher.config_path.write_text(yaml.safe_dump(config))
+    os.utime(watcher.config_path, ns=(0, 1))
+
+    result = watcher.rebuild(watcher.poll())
+    assert os.path.basename(result.output_path) == "Renamed - John Smith.pdf"
+    assert result.validated == []
+
+
+def test_output_formats_are_rebuilt(watcher):
+    """The formats listed in the configuration are written with every PDF."""
+    watcher.rebuild(watcher.poll())
+    config = yaml.safe_load(watcher.config_path.read_text())
+    config["output_formats"] = ["txt"]
+    watcher.config_path.write_text(yaml.safe_dump(config))
+    os.utime(watcher.config_path, ns=(0, 1))
+
+    result = watcher.rebuild(watcher.poll())
+    text_path = result.output_path.removesuffix(".pdf") + ".txt"
+    assert open(text_path, encoding="utf-8").read().startswith("John Smith\n")
+
+
+def test_config_change_before_valid_data_renders_nothing(watcher):
+    """Without valid resume data, a configuration change does not render."""
+    edit(watcher.resume_path, lambda data: data["General"].update(email="not an email"))
+    with pytest.raises(ValueError, match="Error validating resume data"):
+        watcher.rebuild(watcher.poll())
+    os.utime(watcher.config_path, ns=(0, 1))
+    assert watcher.rebuild(watcher.poll()) is None
+
+
+def test_command_line_watches_the_given_files(watcher, monkeypatch):
+    """--input and --config select the files to watch."""
+    watchers = []
+    monkeypatch.setattr(ResumeWatcher, "run", lambda self, interval: watchers.append(self))
+    args = ["--input", str(watcher.resume_path), "--config", str(watcher.config_path)]
+    assert main(args) == 0
+    assert watchers[0].resume_path == watcher.resume_path
+    assert watchers[0].config_path == watcher.config_path
+
+
+def test_interval_must_be_positive():
+    """The command line rejects a non-positive polling interval."""
+    with pytest.raises(SystemExit):
+        main(["--interval", "0"])